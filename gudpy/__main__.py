@@ -1,5 +1,19 @@
-from gui.gudpy import main
+import os
+import sys
+
+# Modules are imported relative to this directory,
+# also when run as "python -m gudpy" from the directory above.
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Arguments routed to the headless command line interface, core.cli.
+# Everything else, including options of Qt such as -style, is left to
+# the GUI, so neither needs importing to decide which to start.
+COMMANDS = ("run", "purge", "iterate", "export", "-h", "--help", "--version")
 
 if __name__ == '__main__':
-    import sys
+    if len(sys.argv) > 1 and sys.argv[1] in COMMANDS:
+        # Headless commands are built on core alone, so never import Qt.
+        from core.cli import main
+        sys.exit(main(sys.argv[1:]))
+    from gui.gudpy import main
     main(sys.argv)
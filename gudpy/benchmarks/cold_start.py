@@ -0,0 +1,55 @@
+"""
+Compares the cold start of the headless command line interface,
+which only imports core, against importing core alongside Qt,
+as core.gudrun_file and core.purge_file once did.
+
+Run from the gudpy directory:
+    python -m benchmarks.cold_start [number of repeats]
+"""
+import os
+import subprocess
+import sys
+import time
+
+STARTS = {
+    "core, with Qt": "import PySide6.QtCore; import core.cli",
+    "core": "import core.cli",
+    "python -m gudpy --version": None
+}
+
+
+def start(code):
+    if code is None:
+        args = [sys.executable, "-m", "gudpy", "--version"]
+        cwd = os.path.dirname(os.getcwd())
+    else:
+        args = [sys.executable, "-c", code]
+        cwd = os.getcwd()
+    begin = time.perf_counter()
+    subprocess.run(args, cwd=cwd, check=True, capture_output=True)
+    return time.perf_counter() - begin
+
+
+def main(repeats=10):
+    # Warm the filesystem and bytecode caches, so that only
+    # the cost of importing is measured.
+    for code in STARTS.values():
+        start(code)
+    for name, code in STARTS.items():
+        times = sorted(start(code) for _ in range(repeats))
+        print(
+            f"{name:>26}: best {times[0] * 1000:7.1f} ms, "
+            f"median {times[len(times) // 2] * 1000:7.1f} ms"
+        )
+    qt = subprocess.run(
+        [
+            sys.executable, "-c",
+            "import sys, core.cli; print('PySide6' in sys.modules)"
+        ],
+        capture_output=True, text=True, check=True
+    ).stdout.strip()
+    print(f"Qt imported by the command line interface: {qt}")
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
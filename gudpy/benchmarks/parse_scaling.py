@@ -0,0 +1,48 @@
+"""
+Times parsing input files of increasing size, to show that the
+TokenStream keeps the load time linear in the number of samples,
+where popping from the front of a list of lines was quadratic.
+The time per sample should stay roughly constant as the size doubles.
+
+Run from the gudpy directory:
+    python -m benchmarks.parse_scaling [largest number of samples]
+"""
+import os
+import sys
+import tempfile
+
+from core import config
+from core.gudrun_file import GudrunFile
+from benchmarks.yaml_io import makeProject, timeit
+
+
+def main(n=3200):
+    config.USE_PROJECT_CACHE = False
+    config.LAZY_PARSING = False
+    sizes = []
+    size = n
+    while size >= 100:
+        sizes.insert(0, size)
+        size //= 2
+
+    with tempfile.TemporaryDirectory() as tmp:
+        previous = None
+        for size in sizes:
+            path = os.path.join(tmp, f"{size}.txt")
+            gudrunFile = makeProject(size)
+            gudrunFile.instrument.GudrunInputFileDir = tmp
+            gudrunFile.write_out(path=path, writeParameters=False)
+            with open(path, encoding="utf-8") as fp:
+                lines = sum(1 for _ in fp)
+            load = timeit(lambda: GudrunFile(path))
+            growth = f", x{load / previous:4.2f}" if previous else ""
+            print(
+                f"{size:>6} samples, {lines:>7} lines: "
+                f"load {load * 1000:8.1f} ms, "
+                f"{load / size * 1e6:6.1f} us per sample{growth}"
+            )
+            previous = load
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,68 @@
+"""
+Compares the round-trip and fast YAML readers and writers,
+and the binary project format, on a project with many samples.
+
+Run from the gudpy directory:
+    python -m benchmarks.yaml_io [number of samples]
+"""
+import os
+import sys
+import tempfile
+import time
+from copy import deepcopy
+
+from core import config
+from core.gudrun_file import GudrunFile
+from core.gudpy_yaml import YAML, FastYAML
+from core.gudpy_binary import GudPyBinary
+
+WATER = "test/TestData/NIMROD-water/water.txt"
+
+
+def makeProject(n):
+    gudrunFile = GudrunFile(WATER)
+    sampleBackground = gudrunFile.sampleBackgrounds[0]
+    samples = sampleBackground.samples
+    sampleBackground.samples = [
+        deepcopy(samples[i % len(samples)]) for i in range(n)
+    ]
+    return gudrunFile
+
+
+def timeit(f, repeats=3):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        f()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(n=1000):
+    config.USE_PROJECT_CACHE = False
+    gudrunFile = makeProject(n)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "project.yaml")
+        print(f"{n} samples")
+        for yaml in (YAML(), FastYAML()):
+            yaml.path = path
+            dump = timeit(lambda: yaml.writeYAML(gudrunFile, path))
+            load = timeit(lambda: yaml.parseYaml(path))
+            print(
+                f"{type(yaml).__name__:>8}: "
+                f"dump {dump * 1000:8.1f} ms, load {load * 1000:8.1f} ms"
+            )
+        path = os.path.join(tmp, "project.gudpyb")
+        binary = GudPyBinary()
+        dump = timeit(lambda: binary.writeBinary(gudrunFile, path))
+        load = timeit(lambda: binary.parseBinary(path))
+        print(
+            f"{'Binary':>8}: "
+            f"dump {dump * 1000:8.1f} ms, load {load * 1000:8.1f} ms, "
+            f"{os.path.getsize(path)} bytes"
+        )
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -1,9 +1,10 @@
 from core.utils import spacify
 from core.enums import Geometry
 from core import config
+from core.renderable import Renderable
 
 
-class Beam:
+class Beam(Renderable):
     """
     Class to represent a Beam.
 
@@ -49,6 +50,8 @@ class Beam:
         Absorption coefficient for the shielding.
     Methods
     -------
+    render()
+        Renders the string representation of the Beam object.
     """
     def __init__(self):
         """
@@ -81,7 +84,7 @@ class Beam:
             "yamlignore"
         }
 
-    def __str__(self):
+    def render(self):
         """
         Returns the string representation of the Beam object.
 
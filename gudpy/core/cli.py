@@ -0,0 +1,266 @@
+"""
+Headless command line interface to GudPy, for batch processing.
+Only core is used, so Qt is never imported.
+
+Usage, from the directory containing gudpy:
+    python -m gudpy run project.txt
+    python -m gudpy purge project.txt
+    python -m gudpy iterate tweak project.txt -n 5
+    python -m gudpy export project.txt --to mint.zip
+"""
+import argparse
+import sys
+
+from core.composition_iterator import CompositionIterator
+from core.density_iterator import DensityIterator
+from core.exception import GudrunException, ParserException
+from core.file_library import GudPyFileLibrary
+from core.gudrun_file import GudrunFile, formatOf
+from core.output_file_handler import organiser
+from core.radius_iterator import RadiusIterator
+from core.thickness_iterator import ThicknessIterator
+from core.tweak_factor_iterator import TweakFactorIterator
+from core.wavelength_subtraction_iterator import (
+    WavelengthSubtractionIterator
+)
+from core import config
+
+ITERATORS = {
+    "tweak": TweakFactorIterator,
+    "density": DensityIterator,
+    "thickness": ThicknessIterator,
+    "radius": RadiusIterator,
+    "composition": CompositionIterator,
+    "wavelength": WavelengthSubtractionIterator
+}
+
+
+def report(result, binary):
+    """
+    Prints the output of an external tool,
+    and decides the exit status from its result.
+
+    Parameters
+    ----------
+    result : subprocess.CompletedProcess | bool
+        Result of running the tool, or False if it couldn't be found.
+    binary : str
+        Name of the tool.
+    Returns
+    -------
+    int
+        Exit status.
+    """
+    if not result:
+        print(f"{binary} couldn't be found.", file=sys.stderr)
+        return 1
+    sys.stdout.write(result.stdout)
+    sys.stderr.write(result.stderr)
+    return result.returncode
+
+
+def save(gudrunFile, path):
+    if path:
+        gudrunFile.save(path, formatOf(path))
+
+
+def run(args):
+    gudrunFile = GudrunFile(args.file)
+    if args.purge:
+        status = report(gudrunFile.purge(), "purge_det")
+        if status:
+            return status
+    result = gudrunFile.process(
+        parallel=args.parallel, useCache=args.cache
+    )
+    organiser.wait()
+    return report(result, "gudrun_dcs")
+
+
+def purge(args):
+    gudrunFile = GudrunFile(args.file)
+    return report(
+        gudrunFile.purge(
+            standardDeviation=tuple(args.standard_deviation),
+            ignoreBad=not args.keep_bad,
+            excludeSampleAndCan=not args.include_sample_and_can
+        ),
+        "purge_det"
+    )
+
+
+def iterate(args):
+    gudrunFile = GudrunFile(args.file)
+    if args.purge:
+        status = report(gudrunFile.purge(), "purge_det")
+        if status:
+            return status
+    iterator = ITERATORS[args.mode](gudrunFile)
+    if args.mode == "radius":
+        iterator.setTargetRadius(args.target)
+    if args.mode == "composition":
+        components = {
+            c.name: c for c in gudrunFile.components.components
+        }
+        missing = [c for c in args.component if c not in components]
+        if missing or not 1 <= len(args.component) <= 2:
+            print(
+                "Please provide one or two components, from: "
+                f"{', '.join(components) or 'none defined'}.",
+                file=sys.stderr
+            )
+            return 2
+        iterator.setComponents(
+            [components[c] for c in args.component], args.ratio
+        )
+        iterator.iterate(args.n, args.rtol)
+    else:
+        iterator.iterate(args.n)
+    organiser.wait()
+    save(gudrunFile, args.output)
+    return 0
+
+
+def export(args):
+    gudrunFile = GudrunFile(args.file)
+    archive = GudPyFileLibrary(gudrunFile).exportMintData(
+        [
+            s
+            for sb in gudrunFile.sampleBackgrounds
+            for s in sb.samples
+        ],
+        renameDataFiles=args.rename,
+        exportTo=args.to,
+        includeParams=args.include_params
+    )
+    print(f"Archived to {archive}!")
+    return 0
+
+
+def parser():
+    """
+    Builds the parser of the command line arguments.
+
+    Returns
+    -------
+    argparse.ArgumentParser
+    """
+    parser = argparse.ArgumentParser(
+        prog="gudpy",
+        description="Batch processing for Gudrun. "
+        "Run without a command to open the GUI."
+    )
+    parser.add_argument(
+        "--version", action="version", version=config.__version__
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    runParser = commands.add_parser(
+        "run", help="Run gudrun_dcs on an input file, or project."
+    )
+    runParser.add_argument("file")
+    runParser.add_argument(
+        "--purge", action="store_true", help="Purge detectors first."
+    )
+    runParser.add_argument(
+        "--parallel", action="store_true",
+        help="Run gudrun_dcs on each sample in parallel."
+    )
+    runParser.add_argument(
+        "--cache", action="store_true",
+        help="Restore the outputs of a previous run with identical inputs, "
+        "rather than running gudrun_dcs again."
+    )
+    runParser.set_defaults(func=run)
+
+    purgeParser = commands.add_parser(
+        "purge", help="Run purge_det on an input file, or project."
+    )
+    purgeParser.add_argument("file")
+    purgeParser.add_argument(
+        "--standard-deviation", type=int, nargs=2, default=[10, 10],
+        metavar=("RATIO", "DEVIATION"),
+        help="Standard deviations allowed around the mean ratio, "
+        "and the mean standard deviation."
+    )
+    purgeParser.add_argument(
+        "--keep-bad", action="store_true",
+        help="Keep existing bad spectrum files."
+    )
+    purgeParser.add_argument(
+        "--include-sample-and-can", action="store_true",
+        help="Include sample and container data files."
+    )
+    purgeParser.set_defaults(func=purge)
+
+    iterateParser = commands.add_parser(
+        "iterate", help="Iterate gudrun_dcs, tweaking a parameter."
+    )
+    iterateParser.add_argument("mode", choices=ITERATORS)
+    iterateParser.add_argument("file")
+    iterateParser.add_argument(
+        "--purge", action="store_true", help="Purge detectors first."
+    )
+    iterateParser.add_argument(
+        "-n", type=int, default=5, help="Number of iterations."
+    )
+    iterateParser.add_argument(
+        "-o", "--output",
+        help="Save the project, as iterated, to this path. "
+        "The format is decided by the extension."
+    )
+    iterateParser.add_argument(
+        "--target", choices=("inner", "outer"), default="inner",
+        help="Radius to iterate, when iterating by radius."
+    )
+    iterateParser.add_argument(
+        "--component", action="append", default=[],
+        help="Component to iterate, when iterating by composition. "
+        "May be given twice."
+    )
+    iterateParser.add_argument(
+        "--ratio", type=float, default=1,
+        help="Initial ratio, when iterating by composition."
+    )
+    iterateParser.add_argument(
+        "--rtol", type=float, default=10.,
+        help="Relative tolerance, when iterating by composition."
+    )
+    iterateParser.set_defaults(func=iterate)
+
+    exportParser = commands.add_parser(
+        "export", help="Archive the .mint01 outputs of each sample."
+    )
+    exportParser.add_argument("file")
+    exportParser.add_argument("--to", help="Path of the archive.")
+    exportParser.add_argument(
+        "--rename", action="store_true",
+        help="Name outputs after their samples."
+    )
+    exportParser.add_argument(
+        "--include-params", action="store_true",
+        help="Include the parameters of each sample."
+    )
+    exportParser.set_defaults(func=export)
+    return parser
+
+
+def main(argv):
+    """
+    Runs a command.
+
+    Parameters
+    ----------
+    argv : str[]
+        Command line arguments, excluding the program name.
+    Returns
+    -------
+    int
+        Exit status.
+    """
+    args = parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except (ParserException, GudrunException, OSError) as e:
+        print(str(e), file=sys.stderr)
+        return 1
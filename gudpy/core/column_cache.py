@@ -0,0 +1,195 @@
+import hashlib
+import os
+
+import numpy as np
+
+from core import config
+from core.utils import atomicOpen
+
+
+class ColumnCache:
+    """
+    Class to represent an on-disk cache of parsed column output files,
+    such as .mint01 and .mdcs01 files.
+    Each entry stores the columns of one file as a .npy array file,
+    which is memory mapped when loaded, rather than read and copied.
+    Entries are keyed by the path, size and modification time of the
+    file, so rewriting the file invalidates its entry.
+    The least recently used entries are evicted, once the entries
+    exceed a total size.
+
+    ...
+
+    Attributes
+    ----------
+    cacheDir : str
+        Directory in which cache entries are stored.
+    maxSize : int
+        Maximum total size of the entries, in bytes.
+    Methods
+    -------
+    key(path)
+        Computes the key of a column file.
+    load(key)
+        Returns the memory mapped columns for a key, or None.
+    save(key, columns)
+        Stores the columns against a key.
+    prune()
+        Evicts the least recently used entries,
+        until the entries fit within maxSize.
+    clear()
+        Removes all entries.
+    """
+
+    SUFFIX = ".npy"
+
+    def __init__(self, cacheDir=None, maxSize=None):
+        """
+        Constructs all the necessary attributes for the ColumnCache object.
+
+        Parameters
+        ----------
+        cacheDir : str, optional
+            Directory in which cache entries are stored.
+            Defaults to config.columnCacheDir.
+        maxSize : int, optional
+            Maximum total size of the entries, in bytes.
+            Defaults to config.COLUMN_CACHE_SIZE.
+        """
+        self.cacheDir = cacheDir if cacheDir else config.columnCacheDir
+        self.maxSize = (
+            maxSize if maxSize is not None
+            else config.COLUMN_CACHE_SIZE
+        )
+
+    def key(self, path):
+        """
+        Computes the key of a column file, from its path,
+        size and modification time.
+
+        Parameters
+        ----------
+        path : str
+            Path to the column file.
+        Returns
+        -------
+        str | None
+            Key of the file, or None if it cannot be read.
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        # Entries are named by the path, and then its version,
+        # so that older versions of a file can be found and removed.
+        name = hashlib.sha256(
+            os.path.abspath(path).encode("utf-8")
+        ).hexdigest()[:32]
+        version = hashlib.sha256(
+            f"{stat.st_size}\0{stat.st_mtime_ns}".encode("utf-8")
+        ).hexdigest()[:16]
+        return f"{name}-{version}"
+
+    def entryPath(self, key):
+        return os.path.join(self.cacheDir, key + self.SUFFIX)
+
+    def load(self, key):
+        """
+        Returns the memory mapped columns for a key.
+        Unreadable entries are treated as misses.
+
+        Parameters
+        ----------
+        key : str
+            Key of the entry.
+        Returns
+        -------
+        numpy.ndarray | None
+            The read-only columns, or None if there is no usable entry.
+        """
+        path = self.entryPath(key)
+        try:
+            columns = np.load(path, mmap_mode="r", allow_pickle=False)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            self.remove(path)
+            return None
+        if columns.ndim != 2 or columns.dtype != np.float64:
+            self.remove(path)
+            return None
+        # Mark the entry as recently used.
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return columns
+
+    def save(self, key, columns):
+        """
+        Stores the columns against a key, removing the entries of
+        older versions of the same file.
+        Failure to write is not an error, the cache is best-effort.
+
+        Parameters
+        ----------
+        key : str
+            Key of the entry.
+        columns : numpy.ndarray
+            Columns to store.
+        """
+        try:
+            os.makedirs(self.cacheDir, exist_ok=True)
+            name = key.split("-")[0]
+            for path in self.entries():
+                if os.path.basename(path).startswith(name + "-"):
+                    self.remove(path)
+            with atomicOpen(self.entryPath(key), "wb", None) as fp:
+                np.save(fp, columns, allow_pickle=False)
+            self.prune()
+        except Exception:
+            return
+
+    def entries(self):
+        try:
+            return [
+                os.path.join(self.cacheDir, f)
+                for f in os.listdir(self.cacheDir)
+                if f.endswith(self.SUFFIX)
+            ]
+        except OSError:
+            return []
+
+    def prune(self):
+        """
+        Evicts the least recently used entries,
+        until the entries fit within maxSize.
+        """
+        entries = []
+        for path in self.entries():
+            try:
+                entries.append((path, os.stat(path)))
+            except OSError:
+                continue
+        size = sum(stat.st_size for _, stat in entries)
+        if size <= self.maxSize:
+            return
+        entries.sort(key=lambda e: e[1].st_mtime)
+        for path, stat in entries:
+            if size <= self.maxSize:
+                break
+            self.remove(path)
+            size -= stat.st_size
+
+    def clear(self):
+        """
+        Removes all entries.
+        """
+        for path in self.entries():
+            self.remove(path)
+
+    def remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,164 @@
+import warnings
+from os.path import isfile
+
+import numpy as np
+
+from core.exception import ParserException
+from core.column_cache import ColumnCache
+from core import config
+
+
+class ColumnFile:
+    """
+    Class to represent a column output file of gudrun_dcs,
+    such as .mint01, .mdcs01, .mdor01 and .mgor01 files.
+    Each row of such a file holds x, y and the error on y,
+    possibly followed by further columns.
+    Lines beginning with a '#' are comments, and are skipped.
+    The columns are parsed straight into a single NumPy array,
+    each column of which is contiguous in memory.
+    Parsed columns are stored in the ColumnCache, so later loads
+    of an unchanged file memory map them, rather than parse them.
+
+    ...
+
+    Attributes
+    ----------
+    path : str
+        Path to the file.
+    columns : numpy.ndarray
+        Array of shape (number of columns, number of rows).
+    Methods
+    -------
+    parse():
+        Parses the columns of the file.
+    column(i):
+        Returns the i-th column of the file.
+    """
+    def __init__(self, path):
+        """
+        Constructs all the necessary attributes for the ColumnFile object.
+        Calls the parse method, to parse the columns from its path.
+
+        Parameters
+        ----------
+        path : str
+            Path to the file.
+        """
+        self.path = path
+        self.columns = np.empty((0, 0))
+
+        if not isfile(self.path):
+            raise ParserException("Please provide a valid path.")
+
+        self.parse()
+
+    def parse(self):
+        """
+        Parses the columns of the file.
+        Rows with more columns than the shortest row have their
+        surplus columns discarded.
+
+        Parameters
+        ----------
+        None
+        Returns
+        -------
+        None
+        """
+        # Reuse the columns from a previous parse, if there is one.
+        cache = ColumnCache() if config.USE_COLUMN_CACHE else None
+        key = cache.key(self.path) if cache else None
+        if key:
+            columns = cache.load(key)
+            if columns is not None:
+                self.columns = columns
+                return
+
+        try:
+            with warnings.catch_warnings():
+                # Files without any rows are valid, if empty.
+                warnings.simplefilter("ignore", UserWarning)
+                data = np.loadtxt(
+                    self.path, comments="#", ndmin=2,
+                    dtype=np.float64, encoding="utf-8"
+                )
+        except ValueError:
+            data = self.parseRagged()
+        # Transposing, and copying, makes each column contiguous.
+        self.columns = np.ascontiguousarray(data.T)
+
+        # Only cache the columns if the file didn't change whilst
+        # being parsed, e.g. by gudrun_dcs still writing it.
+        if key and cache.key(self.path) == key:
+            cache.save(key, self.columns)
+
+    def parseRagged(self):
+        """
+        Parses the columns of a file whose rows differ in length.
+
+        Parameters
+        ----------
+        None
+        Returns
+        -------
+        numpy.ndarray
+            Array of shape (number of rows, number of columns).
+        """
+        rows = []
+        with open(self.path, "r", encoding="utf-8") as fp:
+            for line in fp:
+                if line.startswith("#") or not line.strip():
+                    continue
+                rows.append(line.split())
+        if not rows:
+            return np.empty((0, 0))
+        width = min(len(row) for row in rows)
+        try:
+            return np.array(
+                [row[:width] for row in rows], dtype=np.float64
+            )
+        except ValueError as e:
+            raise ParserException(
+                f"{self.path} is not a column data file. {str(e)}"
+            ) from e
+
+    def column(self, i):
+        """
+        Returns the i-th column of the file,
+        or an empty array if the file has no such column.
+
+        Parameters
+        ----------
+        i : int
+            Index of the column.
+        Returns
+        -------
+        numpy.ndarray
+        """
+        if i < len(self.columns):
+            return self.columns[i]
+        return np.empty(0)
+
+    @property
+    def x(self):
+        return self.column(0)
+
+    @property
+    def y(self):
+        return self.column(1)
+
+    @property
+    def err(self):
+        return self.column(2)
+
+    @property
+    def extra(self):
+        return self.columns[3:]
+
+    @property
+    def nbytes(self):
+        return self.columns.nbytes
+
+    def __len__(self):
+        return self.columns.shape[1]
@@ -1,9 +1,8 @@
 from copy import deepcopy
 import math
 import os
-import time
 
-from core.gud_file import GudFile
+from core.gud_file import loadGudFile
 
 
 def gss(
@@ -161,14 +160,12 @@ class CompositionIterator():
             component.ratio = x
 
         sampleBackground.samples[0].composition.translate()
-        self.gudrunFile.process()
-
-        time.sleep(1)
+        self.gudrunFile.processAndWait()
         gudPath = sampleBackground.samples[0].dataFiles[0].replace(
                     self.gudrunFile.instrument.dataFileType,
                     "gud"
                 )
-        gudFile = GudFile(
+        gudFile = loadGudFile(
             os.path.join(
                 self.gudrunFile.instrument.GudrunInputFileDir, gudPath
             )
@@ -208,14 +205,12 @@ class CompositionIterator():
             wcB.ratio = abs(totalMolecules - x)
 
         sampleBackground.samples[0].composition.translate()
-        self.gudrunFile.process()
-
-        time.sleep(1)
+        self.gudrunFile.processAndWait()
         gudPath = sampleBackground.samples[0].dataFiles[0].replace(
                     self.gudrunFile.instrument.dataFileType,
                     "gud"
                 )
-        gudFile = GudFile(
+        gudFile = loadGudFile(
             os.path.join(
                 self.gudrunFile.instrument.GudrunInputFileDir, gudPath
             )
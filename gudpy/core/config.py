@@ -4,6 +4,8 @@ import sys
 from core.enums import Geometry
 from core.gui_config import GUIConfig
 
+__version__ = "0.2.8"
+
 spc2 = "  "
 spc5 = "          "
 
@@ -11,6 +13,45 @@ geometry = Geometry.FLATPLATE
 NUM_GUDPY_CORE_OBJECTS = 4
 USE_USER_DEFINED_COMPONENTS = False
 NORMALISE_COMPOSITIONS = False
+# Whether parsed input files are pickled into, and loaded from,
+# the project cache. Off unless opted into.
+USE_PROJECT_CACHE = False
+PROJECT_CACHE_SIZE = 32
+LAZY_PARSING = False
+FAST_YAML = False
+# Whether parsed output files are stored in the column cache.
+# Off unless opted into.
+USE_COLUMN_CACHE = False
+# Maximum total size of the column cache, in bytes.
+COLUMN_CACHE_SIZE = 256 * 1024 * 1024
+# Maximum total size of the datasets held in memory, in bytes.
+DATASET_CACHE_SIZE = 512 * 1024 * 1024
+# Points drawn per pixel of plot width, when downsampling large series.
+LOD_POINTS_PER_PIXEL = 2
+# Whether the GUI watches for outputs written by other runs,
+# and how long it waits for them to settle, in milliseconds.
+WATCH_OUTPUTS = False
+WATCH_OUTPUTS_DELAY = 500
+# Number of threads the GUI loads results with.
+RESULT_LOADER_THREADS = min(4, os.cpu_count() or 1)
+# Number of threads that organise outputs in the background.
+ORGANISE_THREADS = 2
+# Number of gudrun_dcs processes run at once, when running in parallel.
+PARALLEL_RUN_WORKERS = os.cpu_count() or 1
+# Longest time to wait for the outputs of gudrun_dcs to be completely
+# written after it exits, and how often to check them, in seconds.
+OUTPUT_WAIT_TIMEOUT = 10
+OUTPUT_POLL_INTERVAL = 0.05
+# Whether runs of gudrun_dcs whose inputs haven't changed are skipped,
+# restoring the outputs of the previous run from the run cache.
+# Off unless opted into, as with "gudpy run --cache".
+USE_RUN_CACHE = False
+# Maximum total size of the run cache, in bytes, and number of runs kept.
+RUN_CACHE_SIZE = 1024 * 1024 * 1024
+RUN_CACHE_ENTRIES = 16
+# Whether the contents of raw data and calibration files are hashed,
+# rather than only their sizes and modification times.
+RUN_CACHE_HASH_CONTENTS = False
 
 __rootdir__ = os.path.dirname(os.path.abspath(sys.argv[0]))
 
@@ -31,4 +72,16 @@ containerConfigurations = {
     ]
 }
 
+# Directory holding each of the caches, which GUDPY_CACHE_DIR overrides.
+cacheDir = os.environ.get(
+    "GUDPY_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "gudpy")
+)
+
+projectCacheDir = os.path.join(cacheDir, "projects")
+
+columnCacheDir = os.path.join(cacheDir, "columns")
+
+runCacheDir = os.path.join(cacheDir, "runs")
+
 GUI = GUIConfig()
@@ -9,10 +9,12 @@ from core import config
 from core.enums import CrossSectionSource
 from core.sample import Sample
 from core.exception import ParserException
+from core.token_stream import TokenStream
+from core.renderable import Renderable, freeze
 from core.utils import firstword, nthfloat, nthint
 
 
-class Container:
+class Container(Renderable):
     """
     Class to represent a Container.
 
@@ -59,6 +61,8 @@ class Container:
         per Angstrom
     Methods
     -------
+    render()
+        Renders the string representation of the Container object.
     """
     def __init__(self, config=None):
         """
@@ -113,7 +117,16 @@ class Container:
         if config:
             self.parseFromConfig(config)
 
-    def __str__(self):
+    def renderKey(self):
+        # The rendered geometry depends upon the geometry of the beam.
+        return (
+            self.dataFiles.name,
+            tuple(self.dataFiles.dataFiles),
+            freeze(self.composition),
+            config.geometry
+        )
+
+    def render(self):
         """
         Returns the string representation of the Container object.
 
@@ -248,14 +261,8 @@ class Container:
                  Cannot parse from an invalid path"
             )
 
-        # Decide the encoding
-        import chardet
-        with open(path, 'rb') as fp:
-            encoding = chardet.detect(fp.read())['encoding']
-
-        # Read the input stream into our attribute.
-        with open(path, encoding=encoding) as fp:
-            self.stream = fp.readlines()
+        # Read the input stream.
+        stream = TokenStream.fromFile(path)
 
         try:
             # Create a new instance of Container.
@@ -263,23 +270,23 @@ class Container:
             # Extract the name from the lines,
             # and then discard the unnecessary lines.
             self.name = (
-                str(self.getNextToken()[:-2]).strip()
+                str(stream.getNextToken()[:-2]).strip()
                 .replace("CONTAINER", "").strip()
             )
             if not self.name:
                 self.name = "CONTAINER"
-            self.consumeWhitespace()
+            stream.consumeWhitespace()
 
             # The number of files and period number are both stored
             # on the same line.
             # So we extract the 0th integer for the number of files,
             # and the 1st integer for the period number.
-            dataFileInfo = self.getNextToken()
+            dataFileInfo = stream.getNextToken()
             self.periodNumber = nthint(dataFileInfo, 1)
 
             # Construct composition
             composition = []
-            line = self.getNextToken()
+            line = stream.getNextToken()
             # Extract the composition.
             # Each element in the composition consists of the first 'word',
             # integer at the second position, and float t the first position,
@@ -294,7 +301,7 @@ class Container:
 
                 # Create an Element object and append to the composition list.
                 composition.append(Element(atomicSymbol, massNo, abundance))
-                line = self.getNextToken()
+                line = stream.getNextToken()
             # Create a Composition object from the dataFiles list constructed.
             self.composition = Composition(
                 "Container",
@@ -305,7 +312,7 @@ class Container:
             # where the member name of the attribute is
             # the first 'word' in the line, and we must get the member,
             # we do this: Enum[memberName].
-            self.geometry = Geometry[firstword(self.getNextToken())]
+            self.geometry = Geometry[firstword(stream.getNextToken())]
 
             # Is the geometry FLATPLATE?
             if (
@@ -316,11 +323,11 @@ class Container:
                     or self.geometry == Geometry.FLATPLATE):
                 # If is is FLATPLATE, then extract the upstream and downstream
                 # thickness, the angle of rotation and sample width.
-                thickness = self.getNextToken()
+                thickness = stream.getNextToken()
                 self.upstreamThickness = nthfloat(thickness, 0)
                 self.downstreamThickness = nthfloat(thickness, 1)
 
-                geometryValues = self.getNextToken()
+                geometryValues = stream.getNextToken()
                 self.angleOfRotation = nthfloat(geometryValues, 0)
                 self.sampleWidth = nthfloat(geometryValues, 1)
             else:
@@ -328,13 +335,13 @@ class Container:
                 # Otherwise, it is CYLINDRICAL,
                 # then extract the inner and outer
                 # radii and the sample height.
-                radii = self.getNextToken()
+                radii = stream.getNextToken()
                 self.innerRadius = nthfloat(radii, 0)
                 self.outerRadius = nthfloat(radii, 1)
-                self.sampleHeight = nthfloat(self.getNextToken(), 0)
+                self.sampleHeight = nthfloat(stream.getNextToken(), 0)
 
             # Extract the density.
-            density = nthfloat(self.getNextToken(), 0)
+            density = nthfloat(stream.getNextToken(), 0)
 
             # Take the absolute value of the density - since it could be -ve.
             self.density = abs(density)
@@ -347,7 +354,7 @@ class Container:
                 density < 0
                 else UnitsOfDensity.CHEMICAL
             )
-            crossSectionSource = firstword(self.getNextToken())
+            crossSectionSource = firstword(stream.getNextToken())
             if (
                 crossSectionSource == "TABLES"
                 or crossSectionSource == "TRANSMISSION"
@@ -358,10 +365,10 @@ class Container:
             else:
                 self.totalCrossSectionSource = CrossSectionSource.FILE
                 self.crossSectionFilename = crossSectionSource
-            self.tweakFactor = nthfloat(self.getNextToken(), 0)
+            self.tweakFactor = nthfloat(stream.getNextToken(), 0)
 
             # Consume whitespace and the closing brace.
-            self.consumeUpToDelim("}")
+            stream.consumeUpToDelim("}")
 
         except Exception as e:
             raise ParserException(
@@ -0,0 +1,230 @@
+from collections import OrderedDict
+import os
+import threading
+
+from core.column_file import ColumnFile
+from core import config
+
+
+class DatasetEntry:
+    """
+    Class to represent an entry of the DatasetCache.
+
+    ...
+
+    Attributes
+    ----------
+    version : tuple
+        Size and modification time of the file, when it was loaded.
+    dataset : any
+        The loaded dataset.
+    size : int
+        Memory accounted to the dataset, in bytes.
+    refs : int
+        Number of holders of the dataset.
+    """
+    __slots__ = ("version", "dataset", "size", "refs")
+
+    def __init__(self, version, dataset, size):
+        self.version = version
+        self.dataset = dataset
+        self.size = size
+        self.refs = 0
+
+
+class DatasetCache:
+    """
+    Class to represent a process-wide, in-memory cache of datasets
+    loaded from output files, such as ColumnFiles and GudFiles.
+    Datasets are keyed by the path of the file and how they were
+    loaded, and are reloaded once the size or modification time of the
+    file changes.
+    Holders of a dataset acquire and release it, and datasets that
+    are held are never evicted. Otherwise, the least recently used
+    datasets are evicted, once their total size exceeds maxSize.
+
+    ...
+
+    Attributes
+    ----------
+    maxSize : int
+        Maximum total size of the datasets, in bytes.
+        Defaults to config.DATASET_CACHE_SIZE.
+    entries : OrderedDict
+        Maps keys to DatasetEntries, least recently used first.
+    held : dict
+        Maps the ids of held datasets to their DatasetEntries,
+        including those of files that have since changed.
+    hits : int
+        Number of loads served from the cache.
+    misses : int
+        Number of loads that read the file.
+    Methods
+    -------
+    acquire(path, loader=ColumnFile)
+        Returns the dataset of a file, and holds it.
+    release(dataset)
+        Releases a dataset previously acquired.
+    load(path, loader=ColumnFile)
+        Returns the dataset of a file, without holding it.
+    size()
+        Returns the total size of the datasets.
+    prune()
+        Evicts the least recently used datasets, that aren't held,
+        until the datasets fit within maxSize.
+    clear()
+        Removes all datasets that aren't held.
+    """
+
+    def __init__(self, maxSize=None):
+        """
+        Constructs all the necessary attributes for the DatasetCache object.
+
+        Parameters
+        ----------
+        maxSize : int, optional
+            Maximum total size of the datasets, in bytes.
+        """
+        self.maxSize = maxSize
+        self.entries = OrderedDict()
+        self.held = {}
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.RLock()
+
+    def version(self, path):
+        stat = os.stat(path)
+        return (stat.st_size, stat.st_mtime_ns)
+
+    def entry(self, path, loader):
+        key = (os.path.abspath(path), loader)
+        version = self.version(path)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry and entry.version == version:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry
+        # Load outside of the lock, so that loads of
+        # different files may proceed at the same time.
+        dataset = loader(path)
+        size = getattr(dataset, "nbytes", version[0])
+        with self.lock:
+            self.misses += 1
+            entry = DatasetEntry(version, dataset, size)
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            return entry
+
+    def acquire(self, path, loader=ColumnFile):
+        """
+        Returns the dataset of a file, loading it if it isn't cached,
+        or the file changed since it was, and holds it until released.
+
+        Parameters
+        ----------
+        path : str
+            Path to the file.
+        loader : callable, optional
+            Called with the path to load the dataset.
+        Returns
+        -------
+        any
+            The dataset.
+        """
+        entry = self.entry(path, loader)
+        with self.lock:
+            entry.refs += 1
+            self.held[id(entry.dataset)] = entry
+            self.prune()
+            return entry.dataset
+
+    def release(self, dataset):
+        """
+        Releases a dataset previously acquired,
+        allowing it to be evicted once it has no other holders.
+
+        Parameters
+        ----------
+        dataset : any
+            The dataset to release.
+        """
+        with self.lock:
+            entry = self.held.get(id(dataset))
+            if entry is None:
+                return
+            entry.refs -= 1
+            if entry.refs <= 0:
+                del self.held[id(dataset)]
+                self.prune()
+
+    def load(self, path, loader=ColumnFile):
+        """
+        Returns the dataset of a file, loading it if it isn't cached,
+        or the file changed since it was, without holding it.
+
+        Parameters
+        ----------
+        path : str
+            Path to the file.
+        loader : callable, optional
+            Called with the path to load the dataset.
+        Returns
+        -------
+        any
+            The dataset.
+        """
+        dataset = self.entry(path, loader).dataset
+        self.prune()
+        return dataset
+
+    def size(self):
+        """
+        Returns the total size of the datasets, including those held
+        whose files have since changed.
+
+        Returns
+        -------
+        int
+        """
+        with self.lock:
+            current = {id(e) for e in self.entries.values()}
+            return (
+                sum(e.size for e in self.entries.values())
+                + sum(
+                    e.size for e in self.held.values()
+                    if id(e) not in current
+                )
+            )
+
+    def prune(self):
+        """
+        Evicts the least recently used datasets, that aren't held,
+        until the datasets fit within maxSize.
+        """
+        maxSize = (
+            self.maxSize if self.maxSize is not None
+            else config.DATASET_CACHE_SIZE
+        )
+        with self.lock:
+            size = self.size()
+            for key, entry in list(self.entries.items()):
+                if size <= maxSize:
+                    break
+                if entry.refs:
+                    continue
+                del self.entries[key]
+                size -= entry.size
+
+    def clear(self):
+        """
+        Removes all datasets that aren't held.
+        """
+        with self.lock:
+            for key, entry in list(self.entries.items()):
+                if not entry.refs:
+                    del self.entries[key]
+
+
+# Cache shared by everything that loads output files.
+datasetCache = DatasetCache()
@@ -34,4 +34,4 @@ class DensityIterator(SingleParamIterator):
         object.density *= coefficient
 
     def organiseOutput(self, n):
-        self.gudrunFile.iterativeOrganise(f"IterateByDensity_{n}")
+        self.gudrunFile.iterativeOrganise(f"IterateByDensity_{n}", wait=False)
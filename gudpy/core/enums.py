@@ -86,3 +86,4 @@ FTModes = enumFromDict("FTModes", FT_MODES)
 class Format(Enum):
     TXT = 0
     YAML = 1
+    BINARY = 2
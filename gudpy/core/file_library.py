@@ -21,8 +21,17 @@ class GudPyFileLibrary():
     -------
     checkFilesExist()
         Checks if the files and directories exist, in the current file system.
+    references()
+        Resolves the paths of every file that gudrun_dcs reads.
     """
 
+    # Files that gudrun_dcs reads from the input file directory,
+    # without them being referenced by the input file.
+    IMPLICIT = ("spec.bad", "spec.dat", "spike.dat")
+    # Corrections that gudrun_dcs reads back from previous runs,
+    # unless they are forced to be recalculated.
+    CORRECTIONS = ("abs01", "mul01", "mut01")
+
     def __init__(self, gudrunFile):
         """
         Constructs the lists of directories and files which
@@ -91,6 +100,81 @@ class GudPyFileLibrary():
                     ):
                         self.files.append(container.crossSectionFilename)
 
+    def resolve(self, file):
+        """
+        Resolves the path of a file referenced by the input file,
+        as gudrun_dcs would, from the input file directory,
+        and then the start folder.
+
+        Parameters
+        ----------
+        file : str
+            Path to the file, as referenced.
+        Returns
+        -------
+        str
+            Absolute path to the file.
+        """
+        dir = self.gudrunFile.instrument.GudrunInputFileDir
+        for candidate in (
+            os.path.join(dir, file), os.path.join(self.fileDir, file)
+        ):
+            if os.path.isfile(candidate):
+                return os.path.abspath(candidate)
+        return os.path.abspath(os.path.join(dir, file))
+
+    def references(self):
+        """
+        Resolves the paths of every file that gudrun_dcs reads,
+        when run on the input file, besides the input file itself.
+        As well as the files and data files, this includes every other
+        file-valued attribute, such as the detector calibration and
+        self scattering files, the bad spectrum files written by
+        purge_det, and the corrections of previous runs,
+        where they aren't forced to be recalculated.
+
+        Returns
+        -------
+        str[]
+            Sorted, absolute, paths.
+        """
+        gudrunFile = self.gudrunFile
+        dir = gudrunFile.instrument.GudrunInputFileDir
+        samples = [
+            sample
+            for sampleBackground in gudrunFile.sampleBackgrounds
+            for sample in sampleBackground.samples
+        ]
+        objects = [
+            gudrunFile.instrument, gudrunFile.beam, gudrunFile.normalisation,
+            *gudrunFile.sampleBackgrounds, *samples,
+            *[c for sample in samples for c in sample.containers]
+        ]
+        files = set(self.files)
+        for obj in objects:
+            files.update(
+                v for k, v in vars(obj).items()
+                if isinstance(v, str) and "file" in k.lower()
+                and not k.endswith(("Dir", "Type", "Folder"))
+            )
+        paths = {self.resolve(f) for f in files if f and f != "*"}
+        paths.update(
+            os.path.abspath(os.path.join(dir, self.dataFileDir, f))
+            for f in self.dataFiles
+        )
+        paths.update(
+            os.path.abspath(os.path.join(dir, f)) for f in self.IMPLICIT
+        )
+        for obj in [gudrunFile.normalisation, *samples]:
+            if obj.forceCalculationOfCorrections or not len(obj.dataFiles):
+                continue
+            run = os.path.splitext(obj.dataFiles[0])[0]
+            paths.update(
+                os.path.abspath(os.path.join(dir, f"{run}.{suffix}"))
+                for suffix in self.CORRECTIONS
+            )
+        return sorted(paths)
+
     def checkFilesExist(self):
         """
         Checks that the files and directories in the file system exist.
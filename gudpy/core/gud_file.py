@@ -1,4 +1,6 @@
 from core.exception import ParserException
+from core.token_stream import TokenStream
+from core.dataset_cache import datasetCache
 
 import os
 from os.path import isfile
@@ -116,7 +118,7 @@ class GudFile:
         self.err = ""
         self.result = ""
         self.suggestedTweakFactor = 0.0
-        self.stream = []
+        self.stream = TokenStream()
         self.output = ""
 
         # Handle edge cases - invalid extensions and paths.
@@ -131,8 +133,7 @@ class GudFile:
 
     def getNextLine(self, ignoreEmpty=False):
         """
-        Pops the next 'line' from the stream and returns it.
-        Essentially removes the first line in the stream and returns it.
+        Returns the next 'line' from the stream and advances past it.
 
         Parameters
         ----------
@@ -142,13 +143,9 @@ class GudFile:
         -------
         str | None
         """
-        if ignoreEmpty and self.stream:
-            line = self.stream.pop(0)
-            while line.isspace():
-                line = self.stream.pop(0)
-            return line
-        else:
-            return self.stream.pop(0) if self.stream else None
+        if ignoreEmpty:
+            self.stream.consumeWhitespace()
+        return self.stream.getNextToken()
 
     def peekNextLine(self):
         """
@@ -161,7 +158,7 @@ class GudFile:
         -------
         str | None
         """
-        return self.stream[0] if self.stream else None
+        return self.stream.peekNextToken()
 
     def consumeLines(self, n):
         """
@@ -175,8 +172,7 @@ class GudFile:
         -------
         None
         """
-        for _ in range(n):
-            self.getNextLine()
+        self.stream.consumeTokens(n)
 
     def parse(self):
         """
@@ -191,10 +187,8 @@ class GudFile:
         None
         """
 
-        # Read the contents into an auxilliary variable.
-        with open(self.path) as f:
-            self.stream = f.readlines()
-            f.close()
+        # Read the contents into a token stream.
+        self.stream = TokenStream.fromFile(self.path)
 
         # Simple cases, we can just extract the stripped lines.
 
@@ -370,3 +364,25 @@ class GudFile:
             f = open(self.path, "w", encoding="utf-8")
         f.write(str(self))
         f.close()
+
+
+def loadGudFile(path):
+    """
+    Returns the GudFile of a path, parsing it only if it hasn't been
+    parsed since the size or modification time of the file last changed.
+    GudFiles are shared through the datasetCache, so must not be modified.
+
+    Parameters
+    ----------
+    path : str
+        Path to the file.
+    Returns
+    -------
+    GudFile
+    """
+    if not path.endswith(".gud"):
+        raise ParserException("Only .gud files can be parsed.")
+    try:
+        return datasetCache.load(path, GudFile)
+    except OSError as e:
+        raise ParserException("Please provide a valid path.") from e
@@ -0,0 +1,399 @@
+from array import array
+import os
+import struct
+import sys
+import zlib
+
+from ruamel.yaml.scalarbool import ScalarBoolean
+
+from core.gudpy_yaml import FastYAML
+from core.exception import ParserException
+from core.utils import atomicOpen
+from core import config
+
+# Leading bytes of every binary project file.
+MAGIC = b"GUDPYBIN"
+# Version of the layout of binary project files,
+# bumped whenever the layout changes incompatibly.
+VERSION = 1
+
+_HEADER = struct.Struct("<8sH")
+_LENGTH = struct.Struct("<I")
+_INT = struct.Struct("<q")
+_FLOAT = struct.Struct("<d")
+
+# Tags identifying the type of each encoded value.
+NONE, TRUE, FALSE, INT, FLOAT, STR, LIST, DICT = b"NTFifsld"
+# Homogeneous lists are stored as arrays of machine values,
+# lists of equal length numeric lists as flattened matrices,
+# and lists of dicts with the same keys, such as the elements of
+# a composition, as tables of columns.
+NUMBERS, STRINGS, MATRIX, TABLE = b"aSmt"
+
+_TYPECODES = {int: "q", float: "d"}
+_KINDS = (bool, int, float, str, list, dict)
+
+
+def kindOf(value):
+    """
+    Returns the basic type of a value, such that values loaded
+    from round-trip YAML, such as ScalarFloats, encode as plain values.
+
+    Parameters
+    ----------
+    value : any
+        Value to find the type of.
+    Returns
+    -------
+    type
+    """
+    if isinstance(value, ScalarBoolean):
+        return bool
+    for kind in _KINDS:
+        if isinstance(value, kind):
+            return kind
+    return type(value)
+
+
+class GudPyBinary:
+    """
+    Class to represent a reader and writer of GudPy binary project files.
+    A binary project file holds the same tree as a GudPy YAML file,
+    encoded as tagged, typed values after a magic number and a version.
+    Lists of numbers and strings, such as data files and exponential
+    values, and the elements of compositions, are stored as typed
+    arrays, rather than value by value.
+    The encoded tree is compressed with zlib.
+    Conversion between the tree and objects is shared with FastYAML.
+
+    ...
+
+    Attributes
+    ----------
+    yaml : FastYAML
+        Converts between the tree and objects.
+    Methods
+    -------
+    parseBinary(path, data=None)
+        Parses a binary project file.
+    writeBinary(base, path)
+        Writes a GudrunFile to a binary project file.
+    encode(value)
+        Encodes a tree as bytes.
+    decode(data)
+        Decodes bytes as a tree.
+    """
+
+    def __init__(self):
+        self.yaml = FastYAML()
+
+    def parseBinary(self, path, data=None):
+        """
+        Parses a binary project file.
+
+        Parameters
+        ----------
+        path : str
+            Path to the file.
+        data : bytes, optional
+            Contents of the file, if they have already been read.
+        Returns
+        -------
+        tuple
+            (instrument, beam, components, normalisation,
+            sampleBackgrounds, GUI)
+        """
+        if data is None:
+            with open(path, "rb") as fp:
+                data = fp.read()
+        self.yaml.path = path
+        return self.yaml.constructClasses(self.decode(data))
+
+    def writeBinary(self, base, path):
+        """
+        Writes a GudrunFile to a binary project file.
+
+        Parameters
+        ----------
+        base : GudrunFile
+            GudrunFile to write.
+        path : str
+            Path to write to.
+        """
+        tree = {
+            "Instrument": base.instrument,
+            "Beam": base.beam,
+            "Components": base.components.components,
+            "Normalisation": base.normalisation,
+            "SampleBackgrounds": base.sampleBackgrounds,
+            "GUI": config.GUI
+        }
+        data = self.encode(
+            {k: self.yaml.toYaml(v) for k, v in tree.items()}
+        )
+        with atomicOpen(path, "wb", None) as fp:
+            fp.write(data)
+
+    def encode(self, value):
+        """
+        Encodes a tree of dicts, lists and scalars as bytes,
+        including the header.
+
+        Parameters
+        ----------
+        value : any
+            Tree to encode.
+        Returns
+        -------
+        bytes
+        """
+        out = bytearray()
+        self._encode(value, out, {})
+        return _HEADER.pack(MAGIC, VERSION) + zlib.compress(out, 1)
+
+    def decode(self, data):
+        """
+        Decodes bytes, including the header, as a tree of dicts,
+        lists and scalars.
+
+        Parameters
+        ----------
+        data : bytes
+            Bytes to decode.
+        Returns
+        -------
+        any
+            The decoded tree.
+        """
+        try:
+            magic, version = _HEADER.unpack_from(data)
+        except struct.error as e:
+            raise ParserException(
+                "File is too short to be a GudPy binary project file."
+            ) from e
+        if magic != MAGIC:
+            raise ParserException("File is not a GudPy binary project file.")
+        if version > VERSION:
+            raise ParserException(
+                f"Binary project file is of version {version}, but only"
+                f" versions up to {VERSION} are supported."
+                " Please update GudPy."
+            )
+        try:
+            payload = memoryview(zlib.decompress(data[_HEADER.size:]))
+            value, _ = self._decode(payload, 0, [])
+            return value
+        except (zlib.error, struct.error, IndexError, ValueError) as e:
+            raise ParserException(
+                "Binary project file is corrupt or truncated."
+            ) from e
+
+    @staticmethod
+    def isBinary(prefix):
+        """
+        Decides whether the leading bytes of a file are those
+        of a binary project file.
+
+        Parameters
+        ----------
+        prefix : bytes
+            Leading bytes of the file.
+        Returns
+        -------
+        bool
+        """
+        return prefix[:len(MAGIC)] == MAGIC
+
+    def _encodeStr(self, string, out):
+        raw = string.encode("utf-8")
+        out += _LENGTH.pack(len(raw))
+        out += raw
+
+    def _encodeArray(self, typecode, values, out):
+        values = array(typecode, values)
+        if sys.byteorder != "little":
+            values.byteswap()
+        out += typecode.encode()
+        out += _LENGTH.pack(len(values))
+        out += values.tobytes()
+
+    def _encode(self, value, out, keys):
+        kind = kindOf(value)
+        if value is None:
+            out.append(NONE)
+        elif kind is bool:
+            out.append(TRUE if value else FALSE)
+        elif kind is int:
+            out.append(INT)
+            out += _INT.pack(value)
+        elif kind is float:
+            out.append(FLOAT)
+            out += _FLOAT.pack(value)
+        elif kind is str:
+            out.append(STR)
+            self._encodeStr(value, out)
+        elif kind is dict:
+            out.append(DICT)
+            out += _LENGTH.pack(len(value))
+            for k, v in value.items():
+                self._encodeKey(k, out, keys)
+                self._encode(v, out, keys)
+        elif kind is list:
+            self._encodeList(value, out, keys)
+        else:
+            raise TypeError(
+                f"Cannot encode {kind.__name__} in a binary project file."
+            )
+
+    def _encodeKey(self, key, out, keys):
+        # Keys repeat for every object of a class, so each one is
+        # only written out the first time it is used.
+        index = keys.get(key)
+        if index is None:
+            index = keys[key] = len(keys)
+            out += _LENGTH.pack(index)
+            self._encodeStr(key, out)
+        else:
+            out += _LENGTH.pack(index)
+
+    def _encodeList(self, value, out, keys):
+        kinds = {kindOf(v) for v in value}
+        if len(kinds) == 1:
+            kind, = kinds
+            if kind in _TYPECODES:
+                out.append(NUMBERS)
+                self._encodeArray(_TYPECODES[kind], value, out)
+                return
+            if kind is str:
+                out.append(STRINGS)
+                raw = [v.encode("utf-8") for v in value]
+                self._encodeArray("I", [len(r) for r in raw], out)
+                out += b"".join(raw)
+                return
+            if kind is list:
+                rows = {len(v) for v in value}
+                inner = {kindOf(x) for v in value for x in v}
+                if (
+                    len(rows) == 1 and len(inner) == 1
+                    and inner <= {float}
+                ):
+                    out.append(MATRIX)
+                    out += _LENGTH.pack(rows.pop())
+                    self._encodeArray("d", [x for v in value for x in v], out)
+                    return
+            if kind is dict:
+                columns = {tuple(v) for v in value}
+                if len(columns) == 1:
+                    columns = columns.pop()
+                    out.append(TABLE)
+                    out += _LENGTH.pack(len(value))
+                    out += _LENGTH.pack(len(columns))
+                    for column in columns:
+                        self._encodeKey(column, out, keys)
+                        self._encodeList(
+                            [v[column] for v in value], out, keys
+                        )
+                    return
+        out.append(LIST)
+        out += _LENGTH.pack(len(value))
+        for v in value:
+            self._encode(v, out, keys)
+
+    def _decodeStr(self, data, offset):
+        n, = _LENGTH.unpack_from(data, offset)
+        offset += _LENGTH.size
+        return str(data[offset:offset + n], "utf-8"), offset + n
+
+    def _decodeArray(self, data, offset):
+        typecode = chr(data[offset])
+        n, = _LENGTH.unpack_from(data, offset + 1)
+        offset += 1 + _LENGTH.size
+        values = array(typecode)
+        end = offset + n * values.itemsize
+        values.frombytes(data[offset:end])
+        if sys.byteorder != "little":
+            values.byteswap()
+        return values.tolist(), end
+
+    def _decodeKey(self, data, offset, keys):
+        index, = _LENGTH.unpack_from(data, offset)
+        offset += _LENGTH.size
+        if index == len(keys):
+            key, offset = self._decodeStr(data, offset)
+            keys.append(key)
+        return keys[index], offset
+
+    def _decode(self, data, offset, keys):
+        tag = data[offset]
+        offset += 1
+        if tag == NONE:
+            return None, offset
+        elif tag == TRUE:
+            return True, offset
+        elif tag == FALSE:
+            return False, offset
+        elif tag == INT:
+            return _INT.unpack_from(data, offset)[0], offset + _INT.size
+        elif tag == FLOAT:
+            return _FLOAT.unpack_from(data, offset)[0], offset + _FLOAT.size
+        elif tag == STR:
+            return self._decodeStr(data, offset)
+        elif tag == DICT:
+            n, = _LENGTH.unpack_from(data, offset)
+            offset += _LENGTH.size
+            value = {}
+            for _ in range(n):
+                k, offset = self._decodeKey(data, offset, keys)
+                value[k], offset = self._decode(data, offset, keys)
+            return value, offset
+        elif tag == LIST:
+            n, = _LENGTH.unpack_from(data, offset)
+            offset += _LENGTH.size
+            value = []
+            for _ in range(n):
+                v, offset = self._decode(data, offset, keys)
+                value.append(v)
+            return value, offset
+        elif tag == NUMBERS:
+            return self._decodeArray(data, offset)
+        elif tag == STRINGS:
+            lengths, offset = self._decodeArray(data, offset)
+            value = []
+            for n in lengths:
+                value.append(str(data[offset:offset + n], "utf-8"))
+                offset += n
+            return value, offset
+        elif tag == MATRIX:
+            n, = _LENGTH.unpack_from(data, offset)
+            flat, offset = self._decodeArray(data, offset + _LENGTH.size)
+            return [flat[i:i + n] for i in range(0, len(flat), n)], offset
+        elif tag == TABLE:
+            rows, n = struct.unpack_from("<II", data, offset)
+            offset += 2 * _LENGTH.size
+            value = [{} for _ in range(rows)]
+            for _ in range(n):
+                column, offset = self._decodeKey(data, offset, keys)
+                values, offset = self._decode(data, offset, keys)
+                for row, v in zip(value, values):
+                    row[column] = v
+            return value, offset
+        raise ValueError(f"Unknown tag {tag} at offset {offset - 1}.")
+
+
+def isBinaryFile(path):
+    """
+    Decides whether a file is a binary project file,
+    from its leading bytes.
+
+    Parameters
+    ----------
+    path : str
+        Path to the file.
+    Returns
+    -------
+    bool
+    """
+    if not os.path.isfile(path):
+        return False
+    with open(path, "rb") as fp:
+        return GudPyBinary.isBinary(fp.read(len(MAGIC)))
@@ -15,7 +15,9 @@ from core.beam import Beam
 from core.normalisation import Normalisation
 from core.sample_background import SampleBackground
 from core.sample import Sample
+from core.lazy_sample import LazySample
 from core.container import Container
+from core.utils import readText
 from core import config
 
 
@@ -31,19 +33,15 @@ class YAML:
         yaml_.encoding = 'utf-8'
         return yaml_
 
-    def parseYaml(self, path):
+    def parseYaml(self, path, contents=None):
         self.path = path
-        return self.constructClasses(self.yamlToDict(path))
+        return self.constructClasses(self.yamlToDict(path, contents))
 
-    def yamlToDict(self, path):
-        # Decide the encoding
-        import chardet
-        with open(path, 'rb') as fp:
-            encoding = chardet.detect(fp.read())['encoding']
-
-        # Read the input stream into our attribute.
-        with open(path, encoding=encoding) as fp:
-            return self.yaml.load(fp)
+    def yamlToDict(self, path, contents=None):
+        # Read the file, unless its contents have already been read.
+        if contents is None:
+            contents = readText(path)
+        return self.yaml.load(contents)
 
     def constructClasses(self, yamldict):
         instrument = Instrument()
@@ -169,6 +167,9 @@ class YAML:
                 return var
         elif isinstance(var, Enum):
             return type(var)(var.value).name
+        elif isinstance(var, LazySample):
+            var.materialise()
+            return self.toYaml(var)
         elif isinstance(var, (
             Instrument, Beam, Components, Normalisation,
             SampleBackground, Sample, Container, WeightedComponent,
@@ -177,5 +178,143 @@ class YAML:
             return {
                 k: self.toYaml(v)
                 for k, v in var.__dict__.items()
-                if k not in var.yamlignore
+                if k not in var.yamlignore and not k.startswith("_")
             }
+
+
+class FastYAML(YAML):
+    """
+    Class to represent a faster reader and writer of GudPy YAML files.
+    Uses the safe loader and dumper, which are C-accelerated when
+    ruamel.yaml.clib is available, rather than the round-trip ones,
+    as comments and quoting don't need preserving.
+    Conversion to and from objects is driven by a schema per class,
+    built once from a default instance of the class, rather than
+    inspecting every field of every object.
+
+    ...
+
+    Attributes
+    ----------
+    schemas : dict
+        Maps each class to a dict, mapping its fields to the
+        function that converts a YAML value to that field.
+    Methods
+    -------
+    schema(obj)
+        Returns the schema of the class of an object.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.schemas = {}
+
+    def getYamlModule(self):
+        yaml_ = yaml(typ="safe")
+        yaml_.default_flow_style = None
+        yaml_.encoding = 'utf-8'
+        # Keep fields in the order that they are declared.
+        yaml_.representer.sort_base_mapping_type_on_output = False
+        return yaml_
+
+    def schema(self, obj):
+        """
+        Returns the schema of the class of an object,
+        building it from the object on first use.
+
+        Parameters
+        ----------
+        obj : any
+            Object to return the schema for.
+        Returns
+        -------
+        dict
+            Maps field names to converters, which take the YAML value
+            and the object, and return the value of the field.
+        """
+        cls = type(obj)
+        if cls in self.schemas:
+            return self.schemas[cls]
+
+        schema = {}
+        for k, v in obj.__dict__.items():
+            if isinstance(v, Enum):
+                schema[k] = lambda v_, _, t=type(v): t[v_]
+            elif isinstance(v, DataFiles):
+                schema[k] = lambda v_, _: DataFiles(
+                    list(v_["dataFiles"]), v_["name"]
+                )
+            elif isinstance(v, Composition):
+                schema[k] = self.loadComposition
+            else:
+                schema[k] = lambda v_, _, t=type(v): t(v_)
+
+        if cls in (Component, Composition):
+            schema["elements"] = self.loadElements
+        if cls is Composition:
+            schema["weightedComponents"] = self.loadWeightedComponents
+        if cls is SampleBackground:
+            schema["samples"] = lambda v_, _: [
+                self.load(Sample(), s) for s in v_
+            ]
+        if cls is Sample:
+            schema["containers"] = lambda v_, _: [
+                self.load(Container(), c) for c in v_
+            ]
+
+        self.schemas[cls] = schema
+        return schema
+
+    def load(self, obj, yamldict):
+        schema = self.schema(obj)
+        # The objects are freshly constructed, so there is no
+        # rendered text to discard, and setattr can be bypassed.
+        fields = obj.__dict__
+        for k, v in yamldict.items():
+            fields[k] = schema[k](v, obj)
+        return obj
+
+    def loadComposition(self, v, obj):
+        composition = obj.composition
+        self.load(composition, v)
+        return composition
+
+    def loadElements(self, v, _):
+        return [
+            Element(
+                e["atomicSymbol"], float(e["massNo"]), float(e["abundance"])
+            )
+            for e in v
+        ]
+
+    def loadWeightedComponents(self, v, _):
+        return [
+            WeightedComponent(
+                self.load(Component(), wc["component"]), float(wc["ratio"])
+            )
+            for wc in v
+        ]
+
+    def maskYAMLDicttoClass(self, cls, yamldict):
+        self.load(cls, yamldict)
+
+    def toYaml(self, var):
+        # Enums may also be ints, so must be checked first.
+        if isinstance(var, Enum):
+            return var.name
+        elif isinstance(var, (str, int, float, bool, type(None))):
+            return var
+        elif isinstance(var, (list, tuple)):
+            # The safe dumper only represents lists.
+            return [self.toYaml(v) for v in var]
+        elif isinstance(var, LazySample):
+            var.materialise()
+        toYaml = self.toYaml
+        ignore = getattr(var, "yamlignore", None)
+        if ignore is None:
+            return None
+        return {
+            k: toYaml(v)
+            for k, v in var.__dict__.items()
+            if k not in ignore and k[0] != "_"
+        }
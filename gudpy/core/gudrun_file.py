@@ -1,4 +1,3 @@
-from PySide6.QtCore import QProcess
 import sys
 import os
 import subprocess
@@ -15,12 +14,15 @@ from core.utils import (
         firstNInts,
         nthfloat,
         nthint,
-        resolve
+        readText,
+        resolve,
+        atomicOpen
 )
 from core.instrument import Instrument
 from core.beam import Beam
 from core.normalisation import Normalisation
 from core.sample import Sample
+from core.lazy_sample import LazySample
 from core.sample_background import SampleBackground
 from core.container import Container
 from core.composition import Component, Components, Composition
@@ -28,17 +30,27 @@ from core.element import Element
 from core.data_files import DataFiles
 from core.purge_file import PurgeFile
 from core.output_file_handler import OutputFileHandler
+from core.parallel_run import ParallelRun
+from core.run_cache import RunCache
 from core.enums import (
     CrossSectionSource, Format, Instruments, FTModes, UnitsOfDensity,
     MergeWeights, Scales, NormalisationType, OutputUnits,
     Geometry
 )
 from core import config
-from core.gudpy_yaml import YAML
-from core.exception import ParserException
+from core.gudpy_yaml import YAML, FastYAML
+from core.gudpy_binary import GudPyBinary, isBinaryFile
+from core.exception import GudrunException, ParserException
+from core.token_stream import TokenStream
+from core.project_cache import ProjectCache
 
 SUFFIX = ".exe" if os.name == "nt" else ""
 
+# Number of characters inspected when detecting the format of an input file.
+FORMAT_SNIFF_SIZE = 512
+# Extension of binary project files.
+BINARY_EXTENSION = "gudpyb"
+
 
 class GudrunFile:
     """
@@ -64,8 +76,12 @@ class GudrunFile:
         List of SampleBackgrounds extracted from the input file.
     purged : bool
         Have the detectors been purged?
-    stream : str[]
-        List of strings, where each item represents a line
+    purgeFile : PurgeFile
+        PurgeFile created from the GudrunFile, on first access.
+    lazy : bool
+        Are Samples only parsed when first accessed?
+    stream : TokenStream
+        Stream of tokens, where each token represents a line
         in the input stream.
     Methods
     -------
@@ -112,9 +128,31 @@ class GudrunFile:
     sampleBackgroundHelper():
         Parses the SampleBackground, its Samples and their Containers.
         Returns the SampleBackground object.
+    lazySampleBackgroundHelper():
+        Parses the SampleBackground, and locates the blocks of
+        its Samples and their Containers, without parsing them.
+        Returns the SampleBackground object.
+    parseSampleBlock(lines, start, end, geometry):
+        Parses a single Sample block and its Containers.
+        Returns the Sample object.
+    detectFormat(prefix):
+        Decides whether the input file is YAML or Gudrun text.
     parse():
         Parse the GudrunFile from its path.
         Assign objects from the file to the attributes of the class.
+    getState(geometry=None, GUI=None):
+        Returns the parsed object graph, for caching.
+    setState(state):
+        Restores the parsed object graph from a cached state.
+    surroundingStrings():
+        Returns the strings preceding and following the
+        sample backgrounds.
+    sampleString(head, tail, sampleBackground, sample):
+        Returns the string representation of the GudrunFile,
+        with a single sample.
+    blocks():
+        Yields the string representation of the GudrunFile,
+        one block at a time.
     write_out(overwrite=False)
         Writes out the string representation of the GudrunFile to a file.
     dcs(path=''):
@@ -122,11 +160,16 @@ class GudrunFile:
         default value, then use the path attribute as the path.
     process():
         Write out the GudrunFile, and call gudrun_dcs on the outputted file.
+    waitForOutputs(result=True, timeout=None):
+        Waits for the outputs of a successful run to be completely written.
+    processAndWait(**kwargs):
+        Calls process(), and waits for the outputs,
+        raising a GudrunException if the run didn't succeed.
     purge():
         Create a PurgeFile from the GudrunFile, and run purge_det on it.
     """
 
-    def __init__(self, path=None, config_=False):
+    def __init__(self, path=None, config_=False, lazy=None):
         """
         Constructs all the necessary attributes for the GudrunFile object.
         Calls the GudrunFile's parse method,
@@ -136,10 +179,14 @@ class GudrunFile:
         ----------
         path : str
             Path to the file.
+        lazy : bool, optional
+            Only parse Samples when they are first accessed.
+            Defaults to config.LAZY_PARSING.
         """
 
         self.path = path
-        self.yaml = YAML()
+        self.lazy = config.LAZY_PARSING if lazy is None else lazy
+        self.yaml = FastYAML() if config.FAST_YAML else YAML()
         # Construct the outpath.
         self.outpath = "gudpy.txt"
         self.components = Components(components=[])
@@ -159,7 +206,18 @@ class GudrunFile:
         self.purged = False
         # Parse the GudrunFile.
         self.stream = None
-        self.purgeFile = PurgeFile(self)
+        # The PurgeFile reads every Sample, so is only created when needed.
+        self._purgeFile = None
+
+    @property
+    def purgeFile(self):
+        if self._purgeFile is None:
+            self._purgeFile = PurgeFile(self)
+        return self._purgeFile
+
+    @purgeFile.setter
+    def purgeFile(self, purgeFile):
+        self._purgeFile = purgeFile
 
     def __deepcopy__(self, memo):
         result = self.__class__.__new__(self.__class__)
@@ -172,8 +230,8 @@ class GudrunFile:
 
     def getNextToken(self):
         """
-        Pops the 'next token' from the stream and returns it.
-        Essentially removes the first line in the stream and returns it.
+        Returns the 'next token' from the stream and advances past it.
+        Essentially returns the next line in the stream.
 
         Parameters
         ----------
@@ -182,7 +240,7 @@ class GudrunFile:
         -------
         str | None
         """
-        return self.stream.pop(0) if self.stream else None
+        return self.stream.getNextToken() if self.stream else None
 
     def peekNextToken(self):
         """
@@ -195,7 +253,7 @@ class GudrunFile:
         -------
         str | None
         """
-        return self.stream[0] if self.stream else None
+        return self.stream.peekNextToken() if self.stream else None
 
     def consumeTokens(self, n):
         """
@@ -208,8 +266,7 @@ class GudrunFile:
         -------
         None
         """
-        for _ in range(n):
-            self.getNextToken()
+        self.stream.consumeTokens(n)
 
     def consumeUpToDelim(self, delim):
         """
@@ -222,9 +279,7 @@ class GudrunFile:
         -------
         None
         """
-        line = self.getNextToken()
-        while line[0] != delim:
-            line = self.getNextToken()
+        self.stream.consumeUpToDelim(delim)
 
     def consumeWhitespace(self):
         """
@@ -237,10 +292,7 @@ class GudrunFile:
         -------
         None
         """
-        line = self.peekNextToken()
-        if line and line.isspace():
-            self.getNextToken()
-            line = self.peekNextToken()
+        self.stream.consumeWhitespace()
 
     def parseInstrument(self):
         """
@@ -1270,6 +1322,127 @@ class GudrunFile:
             line = self.peekNextToken()
         return sampleBackground
 
+    def lazySampleBackgroundHelper(self):
+        """
+        Helper method for parsing Sample Background, and locating
+        its Samples and their Containers.
+        Each Sample block, alongside its Containers, is recorded
+        as a LazySample, which is only parsed when first accessed.
+        Returns the SampleBackground object.
+        Parameters
+        ----------
+        None
+        Returns
+        -------
+        SampleBackground
+            The SampleBackground parsed from the lines.
+        """
+
+        # Parse sample background.
+        sampleBackground = self.makeParse("SAMPLE BACKGROUND")
+
+        self.consumeWhitespace()
+        line = self.peekNextToken()
+        start = end = None
+
+        # Locate all Samples and Containers belonging to the
+        # sample background, skipping over their bodies.
+        while "END" not in line and "SAMPLE BACKGROUND" not in line:
+            if not line:
+                raise ParserException("Unexpected EOF during parsing.")
+            elif "GO" in line:
+                self.getNextToken()
+            elif "SAMPLE" in line and firstword(line) == "SAMPLE":
+                if start is not None:
+                    sampleBackground.samples.append(
+                        LazySample(
+                            self.stream.lines, start, end,
+                            config.geometry, self.parseSampleBlock
+                        )
+                    )
+                start = self.stream.cursor
+                self.consumeUpToDelim("}")
+            elif "CONTAINER" in line and firstword(line) == "CONTAINER":
+                self.consumeUpToDelim("}")
+            end = self.stream.cursor
+            self.consumeWhitespace()
+            line = self.peekNextToken()
+        if start is not None:
+            sampleBackground.samples.append(
+                LazySample(
+                    self.stream.lines, start, end,
+                    config.geometry, self.parseSampleBlock
+                )
+            )
+        return sampleBackground
+
+    @classmethod
+    def parseSampleBlock(cls, lines, start, end, geometry):
+        """
+        Parses a single Sample block, located by
+        lazySampleBackgroundHelper, alongside its Containers.
+        Returns the parsed Sample.
+
+        Parameters
+        ----------
+        lines : str[]
+            Lines of the input file.
+        start : int
+            Index of the first line of the Sample block.
+        end : int
+            Index one past the last line of the Sample block.
+        geometry : Geometry
+            Global geometry in effect when the block was located.
+        Returns
+        -------
+        Sample
+            The Sample parsed from the lines.
+        """
+        # The parsing methods only depend upon the stream,
+        # so there is no need to construct a whole GudrunFile.
+        parser = cls.__new__(cls)
+        parser.stream = TokenStream(lines, start, end)
+
+        previous = config.geometry
+        config.geometry = geometry
+        try:
+            sample = parser.makeParse("SAMPLE")
+            parser.consumeWhitespace()
+            line = parser.peekNextToken()
+            while line:
+                if "CONTAINER" in line and firstword(line) == "CONTAINER":
+                    sample.containers.append(parser.makeParse("CONTAINER"))
+                else:
+                    parser.getNextToken()
+                parser.consumeWhitespace()
+                line = parser.peekNextToken()
+        finally:
+            config.geometry = previous
+        return sample
+
+    def detectFormat(self, prefix):
+        """
+        Decides the format of the input file, from the first few hundred
+        characters of its contents, falling back to its extension.
+
+        Parameters
+        ----------
+        prefix : str
+            Leading characters of the input file.
+        Returns
+        -------
+        Format
+            Format.YAML if the file is a GudPy YAML file,
+            otherwise Format.TXT.
+        """
+        if re.search(r"^[ \t]*INSTRUMENT\s+{", prefix, re.MULTILINE):
+            return Format.TXT
+        if re.search(r"^Instrument:", prefix, re.MULTILINE):
+            return Format.YAML
+        if os.path.splitext(self.path)[1].lower() in (".yaml", ".yml"):
+            return Format.YAML
+        return Format.TXT
+
     def parse(self, config_=False):
         """
         Parse the GudrunFile from its path.
@@ -1296,16 +1469,67 @@ class GudrunFile:
                  Cannot parse from an invalid path" + self.path
             )
 
-        try:
-            (
-                self.instrument,
-                self.beam,
-                self.components,
-                self.normalisation,
-                self.sampleBackgrounds,
-                config.GUI
-            ) = self.yaml.parseYaml(self.path)
-        except Exception:
+        # Binary project files are decoded directly, rather than as text.
+        # They are quicker to load than an entry in the ProjectCache.
+        if isBinaryFile(self.path):
+            try:
+                (
+                    self.instrument,
+                    self.beam,
+                    self.components,
+                    self.normalisation,
+                    self.sampleBackgrounds,
+                    config.GUI
+                ) = GudPyBinary().parseBinary(self.path)
+            except ParserException:
+                raise
+            except Exception as e:
+                raise ParserException(
+                    "Whilst parsing a binary project file,"
+                    " an exception occured."
+                    f" {str(e)}"
+                ) from e
+            return
+
+        # Read the file from disk once.
+        contents = readText(self.path)
+
+        # Reuse the object graph from a previous parse, if there is one.
+        # Lazily parsed files are cheap to load, so aren't cached.
+        cache = (
+            ProjectCache()
+            if config.USE_PROJECT_CACHE and not self.lazy
+            else None
+        )
+        if cache:
+            key = cache.key(
+                self.path, contents, config_,
+                getattr(Instrument(), "GudrunStartFolder", "")
+            )
+            state = cache.load(key)
+            if state:
+                self.setState(state)
+                return
+
+        # Hand the contents to the parser for the detected format.
+        format = self.detectFormat(contents[:FORMAT_SNIFF_SIZE])
+        if format == Format.YAML:
+            try:
+                (
+                    self.instrument,
+                    self.beam,
+                    self.components,
+                    self.normalisation,
+                    self.sampleBackgrounds,
+                    config.GUI
+                ) = self.yaml.parseYaml(self.path, contents)
+            except Exception as e:
+                raise ParserException(
+                    "Whilst parsing YAML, an exception occured."
+                    " The input file is most likely of an incorrect format."
+                    f" {str(e)}"
+                ) from e
+        else:
 
             parsing = ""
             KEYWORDS = {
@@ -1314,14 +1538,8 @@ class GudrunFile:
                 "NORMALISATION": False
             }
 
-            # Decide the encoding
-            import chardet
-            with open(self.path, 'rb') as fp:
-                encoding = chardet.detect(fp.read())['encoding']
-
             # Read the input stream into our attribute.
-            with open(self.path, encoding=encoding) as fp:
-                self.stream = fp.readlines()
+            self.stream = TokenStream.fromText(contents)
 
             # Here we go! Get the first token and begin parsing.
             line = self.getNextToken()
@@ -1362,12 +1580,73 @@ class GudrunFile:
             while self.stream:
                 if "SAMPLE BACKGROUND" in line and "{" in line:
                     self.sampleBackgrounds.append(
-                        self.sampleBackgroundHelper()
+                        self.lazySampleBackgroundHelper()
+                        if self.lazy
+                        else self.sampleBackgroundHelper()
                     )
                 elif "COMPONENTS:" in line:
                     self.makeParse("COMPONENTS")
                 line = self.getNextToken()
 
+        if cache:
+            cache.save(
+                key,
+                self.getState(
+                    geometry=(
+                        config.geometry
+                        if format == Format.TXT and KEYWORDS["BEAM"]
+                        else None
+                    ),
+                    GUI=config.GUI if format == Format.YAML else None
+                )
+            )
+
+    def getState(self, geometry=None, GUI=None):
+        """
+        Returns the parsed object graph of the GudrunFile,
+        alongside any global configuration set whilst parsing,
+        for storage in the ProjectCache.
+
+        Parameters
+        ----------
+        geometry : Geometry, optional
+            Global geometry set whilst parsing.
+        GUI : GUIConfig, optional
+            GUI configuration set whilst parsing.
+        Returns
+        -------
+        dict
+        """
+        return {
+            "instrument": self.instrument,
+            "beam": self.beam,
+            "components": self.components,
+            "normalisation": self.normalisation,
+            "sampleBackgrounds": self.sampleBackgrounds,
+            "geometry": geometry,
+            "GUI": GUI
+        }
+
+    def setState(self, state):
+        """
+        Restores the object graph of the GudrunFile,
+        and any global configuration, from a cached state.
+
+        Parameters
+        ----------
+        state : dict
+            State returned by getState.
+        """
+        self.instrument = state["instrument"]
+        self.beam = state["beam"]
+        self.components = state["components"]
+        self.normalisation = state["normalisation"]
+        self.sampleBackgrounds = state["sampleBackgrounds"]
+        if state["geometry"]:
+            config.geometry = state["geometry"]
+        if state["GUI"]:
+            config.GUI = state["GUI"]
+
     def __str__(self):
         """
         Returns the string representation of the GudrunFile object.
@@ -1381,6 +1660,85 @@ class GudrunFile:
         string : str
             String representation of GudrunFile.
         """
+        return "".join(self.blocks())
+
+    def blocks(self):
+        """
+        Yields the string representation of the GudrunFile object,
+        one block at a time, so that it can be written out
+        without being held in memory as a whole.
+
+        Parameters
+        ----------
+        None
+
+        Yields
+        ------
+        string : str
+            Consecutive parts of the string representation.
+        """
+        head, tail = self.surroundingStrings()
+        yield head
+        # Hold back the latest block, so that trailing whitespace
+        # can be stripped from the last one.
+        previous = None
+        for i, sampleBackground in enumerate(self.sampleBackgrounds):
+            for block in (
+                ["\n", *sampleBackground.blocks()]
+                if i else sampleBackground.blocks()
+            ):
+                if previous is not None:
+                    yield previous
+                previous = block
+        if previous is not None:
+            yield previous.rstrip()
+        yield tail
+
+    def sampleString(self, head, tail, sampleBackground, sample):
+        """
+        Returns the string representation of the GudrunFile object,
+        as if it only contained a single sample,
+        without copying the GudrunFile.
+
+        Parameters
+        ----------
+        head : str
+            Leading string, from surroundingStrings.
+        tail : str
+            Trailing string, from surroundingStrings.
+        sampleBackground : SampleBackground
+            SampleBackground the sample belongs to.
+        sample : Sample
+            Sample to represent.
+
+        Returns
+        -------
+        string : str
+            String representation of GudrunFile, with a single sample.
+        """
+        samples = "\n".join(
+            [str(sample), *sampleBackground.convertedSamples([sample])]
+        )
+        return (
+            head
+            + (sampleBackground.headerString() + samples).rstrip()
+            + tail
+        )
+
+    def surroundingStrings(self):
+        """
+        Returns the parts of the string representation of the
+        GudrunFile object that surround the sample backgrounds.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        (str, str)
+            Strings preceding and following the sample backgrounds.
+        """
 
         LINEBREAK = "\n\n"
         header = (
@@ -1400,9 +1758,6 @@ class GudrunFile:
             + LINEBREAK
             + "}"
         )
-        sampleBackgrounds = "\n".join(
-            [str(x) for x in self.sampleBackgrounds]
-        ).rstrip()
         footer = (
             f"\n\n\nEND{config.spc5}"
             f"\n1\nDate and time last written:  "
@@ -1423,9 +1778,8 @@ class GudrunFile:
             + beam
             + LINEBREAK
             + normalisation
-            + LINEBREAK
-            + sampleBackgrounds
-            + footer
+            + LINEBREAK,
+            footer
             + components
         )
 
@@ -1438,10 +1792,17 @@ class GudrunFile:
             self.write_out(path=path.replace(path.split(".")[-1], "txt"))
         elif format == Format.YAML:
             self.write_yaml(path=path.replace(path.split(".")[-1], "yaml"))
+        elif format == Format.BINARY:
+            self.write_binary(
+                path=path.replace(path.split(".")[-1], BINARY_EXTENSION)
+            )
 
     def write_yaml(self, path):
         self.yaml.writeYAML(self, path)
 
+    def write_binary(self, path):
+        GudPyBinary().writeBinary(self, path)
+
     def write_out(self, path='', overwrite=False, writeParameters=True):
         """
         Writes out the string representation of the GudrunFile.
@@ -1458,44 +1819,47 @@ class GudrunFile:
         -------
         None
         """
-        if path:
-            f = open(
-                path, "w", encoding="utf-8"
-            )
-        elif not overwrite:
-            f = open(
+        if not path:
+            path = (
                 os.path.join(
                     self.instrument.GudrunInputFileDir,
                     self.outpath
-                ), "w", encoding="utf-8")
-        else:
-            f = open(self.path, "w", encoding="utf-8")
-        if os.path.basename(f.name) == self.outpath:
+                )
+                if not overwrite
+                else self.path
+            )
+        if os.path.basename(path) == self.outpath:
             for sampleBackground in self.sampleBackgrounds:
                 sampleBackground.writeAllSamples = False
-        f.write(str(self))
-        f.close()
+        # Stream the file out, replacing any existing file only
+        # once it has been written in full.
+        with atomicOpen(path) as f:
+            for block in self.blocks():
+                f.write(block)
 
         if writeParameters:
+            # Every parameter file shares everything but its sample
+            # (and sample background), so render the rest only once.
+            head, tail = self.surroundingStrings()
             for sb in self.sampleBackgrounds:
                 for s in sb.samples:
                     if s.runThisSample:
-                        gf = deepcopy(self)
-                        gf.sampleBackgrounds = [deepcopy(sb)]
-                        gf.sampleBackgrounds[0].samples = [deepcopy(s)]
-                        gf.write_out(
-                            path=os.path.join(
+                        with atomicOpen(
+                            os.path.join(
                                 self.instrument.GudrunInputFileDir,
                                 s.pathName(),
-                            ),
-                            writeParameters=False
-                        )
+                            )
+                        ) as f:
+                            f.write(self.sampleString(head, tail, sb, s))
 
-    def dcs(self, path='', headless=True, iterative=False):
+    def dcs(self, path='', headless=True, iterative=False, useCache=None):
         """
         Call gudrun_dcs on the path supplied.
         If the path is its default value,
         then use the path attribute as the path.
+        When headless, and not iterating, the outputs of a previous run
+        with identical inputs are restored from the RunCache,
+        instead of calling gudrun_dcs again.
 
         Parameters
         ----------
@@ -1503,6 +1867,9 @@ class GudrunFile:
             Overwrite the initial file? (default is False).
         path : str, optional
             Path to parse from (default is empty, which indicates self.path).
+        useCache : bool, optional
+            Use the RunCache? Defaults to config.USE_RUN_CACHE.
+            Pass False to always call gudrun_dcs.
         Returns
         -------
         subprocess.CompletedProcess
@@ -1512,17 +1879,40 @@ class GudrunFile:
         if not path:
             path = os.path.basename(self.path)
         if headless:
-            try:
-                gudrun_dcs = resolve("bin", f"gudrun_dcs{SUFFIX}")
-                cwd = os.getcwd()
-                os.chdir(self.instrument.GudrunInputFileDir)
-                result = subprocess.run(
-                    [gudrun_dcs, path], capture_output=True, text=True
+            if useCache is None:
+                useCache = config.USE_RUN_CACHE
+            dir = self.instrument.GudrunInputFileDir
+            gudrun_dcs = resolve("bin", f"gudrun_dcs{SUFFIX}")
+            # Iterations read back the outputs of the previous run,
+            # which the key doesn't account for, so are never cached.
+            cache = RunCache() if useCache and not iterative else None
+            key = (
+                cache.key(self, os.path.join(dir, path), gudrun_dcs)
+                if cache else None
+            )
+            cached = cache.load(key, dir) if key else None
+            if cached:
+                result = subprocess.CompletedProcess(
+                    [gudrun_dcs, path], *cached
                 )
-                os.chdir(cwd)
-            except FileNotFoundError:
-                os.chdir(cwd)
-                return False
+            else:
+                try:
+                    OutputFileHandler(self).detach()
+                    before = cache.snapshot(dir) if key else None
+                    # Run from the input file directory, without changing
+                    # the working directory of the whole process.
+                    result = subprocess.run(
+                        [gudrun_dcs, path], capture_output=True, text=True,
+                        cwd=dir
+                    )
+                except FileNotFoundError:
+                    return False
+                if key and result.returncode == 0:
+                    cache.save(
+                        key, dir, before,
+                        (result.returncode, result.stdout, result.stderr),
+                        exclude=(os.path.basename(path),)
+                    )
             if not iterative:
                 self.naiveOrganise()
             return result
@@ -1538,19 +1928,40 @@ class GudrunFile:
             if not os.path.exists(gudrun_dcs):
                 return FileNotFoundError()
             else:
+                # Qt is only needed by the GUI, so headless runs
+                # don't pay the cost of importing it.
+                from PySide6.QtCore import QProcess
                 proc = QProcess()
                 proc.setProgram(gudrun_dcs)
                 proc.setArguments([path])
                 return (
                     proc,
-                    self.write_out,
+                    self.prepareRun,
                     [
-                        path,
+                        os.path.join(self.instrument.GudrunInputFileDir, path),
                         False
                     ]
                 )
 
-    def process(self, headless=True, iterative=False):
+    def prepareRun(self, path='', overwrite=False):
+        """
+        Writes out the GudrunFile for gudrun_dcs to run on,
+        and detaches the outputs of the last run from those organised,
+        so that gudrun_dcs can't change the organised outputs.
+
+        Parameters
+        ----------
+        path : str, optional
+            Path to write to.
+        overwrite : bool, optional
+            Overwrite the initial file? (default is False).
+        """
+        self.write_out(path, overwrite)
+        OutputFileHandler(self).detach()
+
+    def process(
+        self, headless=True, iterative=False, parallel=False, useCache=None
+    ):
         """
         Write out the current state of the file,
         and then call gudrun_dcs on the file that
@@ -1558,23 +1969,28 @@ class GudrunFile:
 
         Parameters
         ----------
-        None
+        parallel : bool, optional
+            Run gudrun_dcs on each sample in parallel?
+            Only supported when headless.
+        useCache : bool, optional
+            Use the RunCache? Defaults to config.USE_RUN_CACHE.
         Returns
         -------
         subprocess.CompletedProcess
             The result of calling gudrun_dcs using subprocess.run.
             Can access stdout/stderr from this.
         """
-        cwd = os.getcwd()
-        os.chdir(self.instrument.GudrunInputFileDir)
+        if parallel and headless:
+            self.write_out()
+            OutputFileHandler(self).detach()
+            return ParallelRun(self).run(iterative=iterative)
         self.write_out()
-        dcs = self.dcs(
+        return self.dcs(
             path=self.outpath,
             headless=headless,
-            iterative=iterative
+            iterative=iterative,
+            useCache=useCache
         )
-        os.chdir(cwd)
-        return dcs
 
     def purge(self, *args, **kwargs):
         """
@@ -1608,16 +2024,118 @@ class GudrunFile:
             self.sampleBackgrounds[i].append(sample)
         return sample
 
-    def naiveOrganise(self):
+    def naiveOrganise(self, wait=True):
         outputFileHandler = OutputFileHandler(self)
-        outputFileHandler.naiveOrganise()
+        return outputFileHandler.naiveOrganise(wait)
 
-    def iterativeOrganise(self, head):
+    def iterativeOrganise(self, head, wait=True):
         outputFileHandler = OutputFileHandler(self)
-        outputFileHandler.iterativeOrganise(head)
+        return outputFileHandler.iterativeOrganise(head, wait)
+
+    def waitForOutputs(self, result=True, timeout=None):
+        """
+        Waits for the outputs of a run of gudrun_dcs to be completely
+        written. There is nothing to wait for if the run failed.
+
+        Parameters
+        ----------
+        result : subprocess.CompletedProcess | bool, optional
+            Result of the run, as returned by process().
+        timeout : float, optional
+            Longest time to wait, in seconds.
+        Returns
+        -------
+        bool
+            Did the run succeed, and were its outputs completed?
+        """
+        if not result or getattr(result, "returncode", 0):
+            return False
+        outputFileHandler = OutputFileHandler(self)
+        return outputFileHandler.waitForOutputs(timeout)
+
+    def processAndWait(self, **kwargs):
+        """
+        Runs gudrun_dcs, as process() does, and waits for its outputs.
 
+        Parameters
+        ----------
+        **kwargs
+            Passed to process().
+        Returns
+        -------
+        subprocess.CompletedProcess
+            Result of the run.
+        Raises
+        ------
+        GudrunException
+            If gudrun_dcs couldn't be found, failed,
+            or its outputs weren't completed.
+        """
+        result = self.process(**kwargs)
+        if not result:
+            raise GudrunException("gudrun_dcs couldn't be found.")
+        if result.returncode:
+            raise GudrunException(
+                f"gudrun_dcs failed, with exit code {result.returncode}.\n"
+                f"{result.stderr}"
+            )
+        if not self.waitForOutputs(result):
+            raise GudrunException(
+                "The outputs of gudrun_dcs weren't completely written."
+            )
+        return result
+
+
+def formatOf(path):
+    """
+    Decides the format to write a project file in, from its extension.
 
-Container.getNextToken = GudrunFile.getNextToken
-Container.peekNextToken = GudrunFile.peekNextToken
-Container.consumeUpToDelim = GudrunFile.consumeUpToDelim
-Container.consumeWhitespace = GudrunFile.consumeWhitespace
+    Parameters
+    ----------
+    path : str
+        Path to the project file, or just its extension, such as ".yaml".
+    Returns
+    -------
+    Format
+    """
+    root, ext = os.path.splitext(path)
+    # splitext reads a bare extension as a hidden file without one.
+    if not ext and os.path.basename(root).startswith("."):
+        ext = os.path.basename(root)
+    ext = ext.lower()
+    if ext in (".yaml", ".yml"):
+        return Format.YAML
+    if ext == "." + BINARY_EXTENSION:
+        return Format.BINARY
+    return Format.TXT
+
+
+def convert(path, outpath, format=None):
+    """
+    Converts a project file between the TXT, YAML and binary formats.
+    The format of the input is detected from its contents.
+
+    Parameters
+    ----------
+    path : str
+        Path to the project file to convert.
+    outpath : str
+        Path to write the converted project file to.
+    format : Format, optional
+        Format to convert to, inferred from the extension
+        of outpath if not given.
+    Returns
+    -------
+    GudrunFile
+        The converted project.
+    """
+    if format is None:
+        format = formatOf(outpath)
+    gudrunFile = GudrunFile(path)
+    if format == Format.TXT:
+        gudrunFile.write_out(path=outpath, writeParameters=False)
+    elif format == Format.YAML:
+        gudrunFile.write_yaml(outpath)
+    elif format == Format.BINARY:
+        gudrunFile.write_binary(outpath)
+    return gudrunFile
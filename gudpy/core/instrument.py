@@ -4,9 +4,10 @@ import sys
 from core.utils import spacify, numifyBool, bjoin
 from core.enums import MergeWeights, Scales, Instruments
 from core import config
+from core.renderable import Renderable
 
 
-class Instrument:
+class Instrument(Renderable):
     """
     Class to represent an Instrument.
 
@@ -105,6 +106,8 @@ class Instrument:
         NeXus definition file to be used, if NeXus files are being used.
     Methods
     -------
+    render()
+        Renders the string representation of the Instrument object.
     """
 
     def __init__(self):
@@ -176,7 +179,7 @@ class Instrument:
             "yamlignore"
         }
 
-    def __str__(self):
+    def render(self):
         """
         Returns the string representation of the Instrument object.
 
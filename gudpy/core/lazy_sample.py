@@ -0,0 +1,125 @@
+from core.renderable import stamps
+from core.sample import Sample
+
+
+class LazySample(Sample):
+    """
+    Class to represent a Sample whose block in the input file has been
+    located, but not yet parsed.
+    The first access to, or assignment of, any attribute of the Sample
+    parses the block, alongside the Containers belonging to it,
+    after which the object becomes an ordinary Sample.
+    Until then, its string representation is the original text of the
+    block, so untouched Samples are written out unchanged.
+
+    ...
+
+    Attributes
+    ----------
+    _lines : str[]
+        Lines of the input file, shared between all LazySamples.
+    _start : int
+        Index of the first line of the Sample block.
+    _end : int
+        Index one past the last line of the Sample block,
+        including its Containers and terminating GO.
+    _geometry : Geometry
+        Global geometry in effect when the block was located.
+    _loader : callable
+        Parses the block, returning a Sample.
+    _stamp : int
+        Identifies the block, for stateKey().
+    Methods
+    -------
+    materialise()
+        Parses the block, turning the object into a Sample.
+    """
+
+    def __init__(self, lines, start, end, geometry, loader):
+        """
+        Constructs all the necessary attributes for the LazySample object.
+        Deliberately does not construct the attributes of a Sample.
+
+        Parameters
+        ----------
+        lines : str[]
+            Lines of the input file.
+        start : int
+            Index of the first line of the Sample block.
+        end : int
+            Index one past the last line of the Sample block.
+        geometry : Geometry
+            Global geometry in effect when the block was located.
+        loader : callable
+            Called with (lines, start, end, geometry), returns a Sample.
+        """
+        self._lines = lines
+        self._start = start
+        self._end = end
+        self._geometry = geometry
+        self._loader = loader
+        self._stamp = next(stamps)
+
+    def __getattr__(self, name):
+        # Only called for attributes that are missing,
+        # i.e. all attributes of the Sample itself.
+        if name.startswith("_"):
+            raise AttributeError(name)
+        self.materialise()
+        return getattr(self, name)
+
+    def __setattr__(self, name, value):
+        # Assigning to an attribute of the Sample must parse the block
+        # first, so that the assignment isn't lost.
+        if not name.startswith("_"):
+            self.materialise()
+            Sample.__setattr__(self, name, value)
+        else:
+            object.__setattr__(self, name, value)
+
+    def __deepcopy__(self, memo):
+        # The lines are never modified, so can be shared.
+        result = LazySample(
+            self._lines, self._start, self._end,
+            self._geometry, self._loader
+        )
+        memo[id(self)] = result
+        return result
+
+    def materialise(self):
+        """
+        Parses the block, and turns the object into a Sample,
+        with the parsed attributes.
+
+        Parameters
+        ----------
+        None
+        Returns
+        -------
+        None
+        """
+        sample = self._loader(
+            self._lines, self._start, self._end, self._geometry
+        )
+        self.__dict__.clear()
+        self.__dict__.update(sample.__dict__)
+        self.__class__ = Sample
+
+    def stateKey(self):
+        # The block is never modified, so the key needn't parse it.
+        return (id(self), self._stamp)
+
+    def __str__(self):
+        """
+        Returns the original text of the Sample block.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        string : str
+            String representation of LazySample.
+        """
+        return "\n" + "".join(self._lines[self._start:self._end])
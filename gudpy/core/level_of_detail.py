@@ -0,0 +1,183 @@
+import numpy as np
+
+from core import config
+
+
+def lttb(x, y, threshold):
+    """
+    Downsamples a series with the largest-triangle-three-buckets
+    algorithm, which preserves the visual shape of the series,
+    including its peaks and troughs.
+    The first and last points are always kept. The points between are
+    split into threshold - 2 buckets, and from each bucket the point
+    forming the largest triangle with the point kept from the previous
+    bucket, and the average of the next bucket, is kept.
+
+    Parameters
+    ----------
+    x : numpy.ndarray
+        X values of the series, in ascending order.
+    y : numpy.ndarray
+        Y values of the series.
+    threshold : int
+        Number of points to keep.
+    Returns
+    -------
+    numpy.ndarray
+        Indices of the points kept, in ascending order.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    # Bucket i spans [edges[i], edges[i + 1]).
+    edges = np.floor(np.linspace(1, n - 1, threshold - 1)).astype(np.intp)
+    # The average of every bucket, and then of the final point,
+    # which acts as the bucket following the last.
+    counts = np.append(np.diff(edges), 1)
+    averageX = np.add.reduceat(x[:-1], edges[:-1]) / counts[:-1]
+    averageY = np.add.reduceat(y[:-1], edges[:-1]) / counts[:-1]
+    averageX = np.append(averageX, x[-1])[1:].tolist()
+    averageY = np.append(averageY, y[-1])[1:].tolist()
+
+    # The dependence on the previously kept point makes the algorithm
+    # sequential, plain floats are quicker than NumPy for small buckets.
+    xs = x.tolist()
+    ys = y.tolist()
+    bounds = edges.tolist()
+    indices = [0]
+    a = 0
+    for i in range(threshold - 2):
+        ax, ay = xs[a], ys[a]
+        cx, cy = averageX[i], averageY[i]
+        # Twice the area of the triangle formed by the kept point,
+        # the candidate and the average of the next bucket.
+        dx, dy = ax - cx, cy - ay
+        best, a = -1.0, bounds[i]
+        for j in range(bounds[i], bounds[i + 1]):
+            area = abs(dx * (ys[j] - ay) + dy * (xs[j] - ax))
+            if area > best:
+                best, a = area, j
+        indices.append(a)
+    indices.append(n - 1)
+    return np.array(indices, dtype=np.intp)
+
+
+class LevelOfDetail:
+    """
+    Class to represent a multi-resolution pyramid of a series,
+    for drawing large series quickly.
+    Level 0 is the series itself, and each subsequent level is
+    downsampled from the previous with lttb, by a constant factor.
+    Levels are built the first time they are needed.
+    For a visible range of x and a plot width, window() picks the
+    coarsest level with enough points to draw the range at full
+    detail, so zooming in gradually reveals every point.
+
+    ...
+
+    Attributes
+    ----------
+    levels : (numpy.ndarray, numpy.ndarray)[]
+        X and Y values of each level built so far.
+    factor : int
+        Factor by which each level is smaller than the last.
+    minPoints : int
+        Size below which no further levels are built.
+    sorted : bool
+        Whether the x values are in ascending order.
+        Series that aren't are never downsampled.
+    Methods
+    -------
+    level(i)
+        Returns the x and y values of a level.
+    window(xmin, xmax, width)
+        Returns the level, and the slice of it, to draw a range with.
+    """
+
+    def __init__(self, x, y, factor=4, minPoints=256):
+        """
+        Constructs all the necessary attributes for the LevelOfDetail object.
+
+        Parameters
+        ----------
+        x : numpy.ndarray
+            X values of the series.
+        y : numpy.ndarray
+            Y values of the series.
+        factor : int, optional
+            Factor by which each level is smaller than the last.
+        minPoints : int, optional
+            Size below which no further levels are built.
+        """
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        self.levels = [(x, y)]
+        self.factor = factor
+        self.minPoints = minPoints
+        self.sorted = bool(len(x) < 2 or np.all(np.diff(x) >= 0))
+
+    def level(self, i):
+        """
+        Returns the x and y values of a level, building it,
+        and the levels before it, if they haven't been built yet.
+
+        Parameters
+        ----------
+        i : int
+            Index of the level.
+        Returns
+        -------
+        (numpy.ndarray, numpy.ndarray)
+        """
+        while len(self.levels) <= i:
+            x, y = self.levels[-1]
+            kept = lttb(x, y, max(len(x) // self.factor, 3))
+            self.levels.append((x[kept], y[kept]))
+        return self.levels[i]
+
+    def span(self, x, xmin, xmax):
+        # The points just outside of the range are included,
+        # so that lines leaving the plot are drawn.
+        lo = max(int(np.searchsorted(x, xmin, "left")) - 1, 0)
+        hi = min(int(np.searchsorted(x, xmax, "right")) + 1, len(x))
+        return lo, hi
+
+    def window(self, xmin, xmax, width):
+        """
+        Returns the level, and the slice of it, to draw the range
+        [xmin, xmax] of the series with, across a number of pixels.
+        The slice has at least config.LOD_POINTS_PER_PIXEL points per
+        pixel, or is the whole range at full detail.
+
+        Parameters
+        ----------
+        xmin : float
+            Lowest visible x.
+        xmax : float
+            Highest visible x.
+        width : float
+            Width of the plot, in pixels.
+        Returns
+        -------
+        (int, int, int)
+            Index of the level, and the start and end of the slice.
+        """
+        x, _ = self.levels[0]
+        if not self.sorted:
+            return 0, 0, len(x)
+        target = max(int(width * config.LOD_POINTS_PER_PIXEL), 2)
+        lo, hi = self.span(x, xmin, xmax)
+        chosen = (0, lo, hi)
+        i = 0
+        while hi - lo > target and len(x) > self.minPoints:
+            i += 1
+            x, _ = self.level(i)
+            lo, hi = self.span(x, xmin, xmax)
+            if hi - lo < target:
+                break
+            chosen = (i, lo, hi)
+        return chosen
+
+    def __len__(self):
+        return len(self.levels[0][0])
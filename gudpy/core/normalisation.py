@@ -5,9 +5,10 @@ from core.enums import (
     CrossSectionSource, Geometry, UnitsOfDensity
 )
 from core import config
+from core.renderable import Renderable
 
 
-class Normalisation:
+class Normalisation(Renderable):
     """
     Class to represent Normalisation.
 
@@ -63,6 +64,8 @@ class Normalisation:
         Vanadium signal to background acceptance ratio.
     Methods
     -------
+    render()
+        Renders the string representation of the Normalisation object.
     """
     def __init__(self):
         """
@@ -100,7 +103,11 @@ class Normalisation:
             "yamlignore"
         }
 
-    def __str__(self):
+    def renderKey(self):
+        # The rendered geometry depends upon the geometry of the beam.
+        return (*super().renderKey(), config.geometry)
+
+    def render(self):
         """
         Returns the string representation of the Normalisation object.
 
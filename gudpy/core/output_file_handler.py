@@ -1,5 +1,12 @@
+from concurrent.futures import ThreadPoolExecutor, wait as waitFor
 import os
 import shutil
+import threading
+import time
+import uuid
+
+from core.utils import atomicOpen
+from core import config
 
 
 class OutputFileHandler():
@@ -40,6 +47,27 @@ class OutputFileHandler():
 
             ]
         }
+        # Outputs that are read back from the input file directory,
+        # by the GUI, the iterators, and later runs of gudrun_dcs,
+        # such as the corrections, when they aren't forced to be
+        # recalculated. These keep their data across runs.
+        self.retained = {
+            "mdcs01",
+            "mint01",
+            "mgor01",
+            "mdor01",
+            "gud",
+            "sample",
+            "abs01",
+            "mul01",
+            "mut01"
+        }
+        # Outputs that are read back as soon as gudrun_dcs exits,
+        # and what each ends with once it has been completely written.
+        self.trailers = {
+            "gud": b"Suggested tweak factor",
+            "mint01": b""
+        }
 
     def getRunFiles(self):
         self.runFiles = [
@@ -49,47 +77,408 @@ class OutputFileHandler():
             and len(s.dataFiles)
         ]
 
-    def organiseSampleFiles(self, run, sampleRunFile, tree=""):
+    def indexRunFiles(self):
+        """
+        Lists the input file directory once, indexing the outputs
+        of each run by their suffix.
+
+        Returns
+        -------
+        dict
+            Maps run prefixes to dicts of suffixes to filenames.
+        """
         dir = self.gudrunFile.instrument.GudrunInputFileDir
-        if tree:
-            outputDir = os.path.join(dir, tree, run)
-        else:
-            outputDir = os.path.join(dir, run)
-            if os.path.exists(outputDir):
-                shutil.rmtree(outputDir)
-        if not os.path.exists(outputDir):
-            os.makedirs(outputDir)
-        os.makedirs(os.path.join(outputDir, "outputs"))
-        os.makedirs(os.path.join(outputDir, "diagnostics"))
+        runs = {run for run, _ in self.runFiles}
+        index = {run: {} for run in runs}
+        for f in os.listdir(dir):
+            run, _, suffix = f.rpartition(".")
+            if run in runs:
+                index[run][suffix] = f
+        return index
+
+    def transfer(self, src, dst):
+        """
+        Hardlinks a file into place, keeping the original.
+        Files are copied when they can't be linked,
+        such as across filesystems.
+
+        Parameters
+        ----------
+        src : str
+            Path to the file.
+        dst : str
+            Path to place the file at.
+        """
+        if os.path.lexists(dst):
+            os.remove(dst)
+        try:
+            os.link(src, dst)
+        except OSError:
+            shutil.copyfile(src, dst)
+
+    def stageSampleFiles(self, run, sampleRunFile, outputDir, index):
+        dir = self.gudrunFile.instrument.GudrunInputFileDir
+        os.makedirs(os.path.join(outputDir, "outputs"), exist_ok=True)
+        os.makedirs(os.path.join(outputDir, "diagnostics"), exist_ok=True)
         if os.path.exists(os.path.join(dir, sampleRunFile)):
-            shutil.copyfile(
+            self.transfer(
                 os.path.join(dir, sampleRunFile),
                 os.path.join(outputDir, "outputs", sampleRunFile)
             )
-        for f in os.listdir(dir):
-            for suffix in self.outputs["sampleOutputs"]:
-                if f == f"{run}.{suffix}":
-                    shutil.copyfile(
+        files = index.get(run, {})
+        for target, suffixes in (
+            ("outputs", self.outputs["sampleOutputs"]),
+            ("diagnostics", self.outputs["sampleDiagnostics"])
+        ):
+            for suffix in suffixes:
+                f = files.get(suffix)
+                if f:
+                    # Every output is kept in the input file directory,
+                    # as the same run may be organised again, such as
+                    # into the tree of an iteration.
+                    self.transfer(
                         os.path.join(dir, f),
-                        os.path.join(outputDir, "outputs", f)
-                    )
-            for suffix in self.outputs["sampleDiagnostics"]:
-                if f == f"{run}.{suffix}":
-                    shutil.copyfile(
-                        os.path.join(dir, f),
-                        os.path.join(outputDir, "diagnostics", f)
+                        os.path.join(outputDir, target, f)
                     )
 
-    def naiveOrganise(self):
-        for run, runFile in self.runFiles:
-            self.organiseSampleFiles(run, runFile)
-
-    def iterativeOrganise(self, head):
-        path = os.path.join(
-                self.gudrunFile.instrument.GudrunInputFileDir,
-                head
-                )
-        if os.path.exists(path):
-            shutil.rmtree(path)
+    def organiseSampleFiles(self, run, sampleRunFile, tree="", index=None):
+        dir = self.gudrunFile.instrument.GudrunInputFileDir
+        if index is None:
+            index = self.indexRunFiles()
+        if tree:
+            outputDir = os.path.join(dir, tree, run)
+        else:
+            outputDir = os.path.join(dir, run)
+            if os.path.exists(outputDir):
+                shutil.rmtree(outputDir)
+        self.stageSampleFiles(run, sampleRunFile, outputDir, index)
+
+    def organise(self, head=""):
+        """
+        Organises the outputs of the last run, in the background.
+        The outputs are first snapshotted into a staging directory,
+        which only links files, so gudrun_dcs may be run again
+        as soon as this returns. Replacing the previously organised
+        outputs with the staging directory is left to the organiser.
+
+        Parameters
+        ----------
+        head : str, optional
+            Directory to organise the outputs of each run under.
+            If empty, each run is organised into its own directory.
+        Returns
+        -------
+        Future
+            Completes once the outputs are organised.
+        """
+        dir = self.gudrunFile.instrument.GudrunInputFileDir
+        staging = os.path.join(dir, f".gudpy-organise-{uuid.uuid4().hex}")
+        os.makedirs(staging)
+        index = self.indexRunFiles()
         for run, runFile in self.runFiles:
-            self.organiseSampleFiles(run, runFile, tree=head)
+            self.stageSampleFiles(
+                run, runFile, os.path.join(staging, run), index
+            )
+        if head:
+            moves = [(staging, os.path.join(dir, head))]
+        else:
+            moves = [
+                (os.path.join(staging, run), os.path.join(dir, run))
+                for run in dict.fromkeys(run for run, _ in self.runFiles)
+            ]
+        return organiser.submit(
+            [dst for _, dst in moves], self.publish, staging, moves
+        )
+
+    def publish(self, staging, moves):
+        """
+        Replaces previously organised outputs with those staged.
+
+        Parameters
+        ----------
+        staging : str
+            Staging directory.
+        moves : (str, str)[]
+            Staged directories, and where to move them to.
+        """
+        for src, dst in moves:
+            if os.path.exists(dst):
+                shutil.rmtree(dst)
+            os.makedirs(os.path.dirname(dst), exist_ok=True)
+            os.replace(src, dst)
+        shutil.rmtree(staging, ignore_errors=True)
+
+    def naiveOrganise(self, wait=True):
+        future = self.organise()
+        if wait:
+            future.result()
+        return future
+
+    def iterativeOrganise(self, head, wait=True):
+        future = self.organise(head)
+        if wait:
+            future.result()
+        return future
+
+    def complete(self, path, suffix, previous, now, interval):
+        """
+        Decides if an output has been completely written.
+        An output is complete once its size has stopped changing,
+        and it ends with a complete line, following its trailer.
+
+        Parameters
+        ----------
+        path : str
+            Path to the output.
+        suffix : str
+            Suffix of the output.
+        previous : dict
+            Maps paths to their states at the previous check.
+            Updated with the state of this output.
+        now : float
+            Time of this check, as from time.time().
+        interval : float
+            Time between checks, in seconds.
+        Returns
+        -------
+        bool
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+        state = (stat.st_size, stat.st_mtime_ns)
+        # Outputs that haven't changed for a whole interval are stable,
+        # so outputs that are already complete need not be checked twice.
+        stable = (
+            previous.get(path) == state
+            or now - stat.st_mtime_ns / 1e9 >= interval
+        )
+        previous[path] = state
+        if not stable or not stat.st_size:
+            return False
+        try:
+            with open(path, "rb") as fp:
+                fp.seek(max(0, stat.st_size - 4096))
+                tail = fp.read()
+        except OSError:
+            return False
+        if not tail.endswith(b"\n"):
+            return False
+        trailer = self.trailers[suffix]
+        return not trailer or trailer in tail.rstrip().rsplit(b"\n", 1)[-1]
+
+    def pendingOutputs(self):
+        """
+        Returns the outputs of the last run that are read back,
+        to be checked by poll().
+
+        Returns
+        -------
+        set
+            Pairs of the path and suffix of each output.
+        """
+        dir = self.gudrunFile.instrument.GudrunInputFileDir
+        return {
+            (os.path.join(dir, f"{run}.{suffix}"), suffix)
+            for run, _ in self.runFiles
+            for suffix in self.trailers
+        }
+
+    def poll(self, pending, previous, interval=None):
+        """
+        Checks the pending outputs once, without waiting.
+
+        Parameters
+        ----------
+        pending : set
+            Outputs still to be completed, as from pendingOutputs().
+        previous : dict
+            Maps paths to their states at the previous check.
+        interval : float, optional
+            Time between checks, in seconds.
+            Defaults to config.OUTPUT_POLL_INTERVAL.
+        Returns
+        -------
+        set
+            Outputs that are still not complete.
+        """
+        if interval is None:
+            interval = config.OUTPUT_POLL_INTERVAL
+        now = time.time()
+        return {
+            (path, suffix) for path, suffix in pending
+            if not self.complete(path, suffix, previous, now, interval)
+        }
+
+    def waitForOutputs(self, timeout=None, interval=None):
+        """
+        Waits for the outputs of the last run, that are read back,
+        to be completely written, after gudrun_dcs exits.
+        Blocks, so the GUI polls instead.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            Longest time to wait, in seconds.
+            Defaults to config.OUTPUT_WAIT_TIMEOUT.
+        interval : float, optional
+            Time between checks, in seconds.
+            Defaults to config.OUTPUT_POLL_INTERVAL.
+        Returns
+        -------
+        bool
+            Were the outputs completed before timing out?
+        """
+        if timeout is None:
+            timeout = config.OUTPUT_WAIT_TIMEOUT
+        if interval is None:
+            interval = config.OUTPUT_POLL_INTERVAL
+        pending = self.pendingOutputs()
+        previous = {}
+        deadline = time.monotonic() + timeout
+        while True:
+            pending = self.poll(pending, previous, interval)
+            if not pending:
+                return True
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(interval)
+
+    def detach(self):
+        """
+        Detaches the outputs in the input file directory from the
+        organised outputs, where they still share data through hardlinks.
+        gudrun_dcs may rewrite its outputs in place, which would otherwise
+        change the organised outputs too. Retained outputs are given their
+        own copies of their data, the rest are unlinked, as the run
+        writes them anew. Should be called before running gudrun_dcs.
+        """
+        dir = self.gudrunFile.instrument.GudrunInputFileDir
+        for run, files in self.indexRunFiles().items():
+            for suffix, f in files.items():
+                path = os.path.join(dir, f)
+                try:
+                    stat = os.stat(path)
+                    if stat.st_nlink < 2:
+                        continue
+                    if suffix not in self.retained:
+                        os.remove(path)
+                        continue
+                    with open(path, "rb") as src:
+                        with atomicOpen(path, "wb", encoding=None) as dst:
+                            shutil.copyfileobj(src, dst)
+                    # The copy keeps the times of the original, so that
+                    # the RunCache still recognises corrections read back.
+                    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+                except OSError:
+                    continue
+
+
+class OutputOrganiser:
+    """
+    Class to represent a bounded pool of I/O threads, which finish
+    organising outputs in the background, whilst gudrun_dcs runs again.
+    Tasks that organise into the same destination run in the order
+    they were submitted.
+
+    ...
+
+    Attributes
+    ----------
+    executor : ThreadPoolExecutor
+        Pool of threads that tasks are run on.
+    futures : dict
+        Maps destinations to the last task submitted to organise into them.
+    Methods
+    -------
+    submit(destinations, fn, *args)
+        Runs a task in the background.
+    wait()
+        Waits for every task submitted so far to complete.
+    pending()
+        Returns the number of tasks that haven't completed.
+    """
+
+    def __init__(self, maxWorkers=None):
+        """
+        Constructs all the necessary attributes for the OutputOrganiser object.
+
+        Parameters
+        ----------
+        maxWorkers : int, optional
+            Number of threads to organise with.
+            Defaults to config.ORGANISE_THREADS.
+        """
+        self.executor = ThreadPoolExecutor(
+            max_workers=maxWorkers or config.ORGANISE_THREADS,
+            thread_name_prefix="gudpy-organise"
+        )
+        self.futures = {}
+        self.lock = threading.Lock()
+
+    def submit(self, destinations, fn, *args):
+        """
+        Runs a task in the background, once the tasks previously
+        submitted to organise into any of the same destinations complete.
+
+        Parameters
+        ----------
+        destinations : str[]
+            Paths that the task organises into.
+        fn : callable
+            The task.
+        *args
+            Arguments to call the task with.
+        Returns
+        -------
+        Future
+        """
+        with self.lock:
+            previous = {
+                self.futures[d] for d in destinations if d in self.futures
+            }
+            # Tasks are started in the order they were submitted, so the
+            # previous tasks are running or complete by the time this is.
+            future = self.executor.submit(self.run, previous, fn, args)
+            for d in destinations:
+                self.futures[d] = future
+        return future
+
+    def run(self, previous, fn, args):
+        waitFor(previous)
+        return fn(*args)
+
+    def wait(self):
+        """
+        Waits for every task submitted so far to complete.
+
+        Raises
+        ------
+        Exception
+            The first exception raised by a task, if any were.
+        """
+        with self.lock:
+            futures = set(self.futures.values())
+        waitFor(futures)
+        with self.lock:
+            for d, future in list(self.futures.items()):
+                if future.done():
+                    del self.futures[d]
+        for future in futures:
+            future.result()
+
+    def pending(self):
+        """
+        Returns the number of tasks that haven't completed.
+
+        Returns
+        -------
+        int
+        """
+        with self.lock:
+            return len({f for f in self.futures.values() if not f.done()})
+
+
+# Organiser shared by every OutputFileHandler.
+organiser = OutputOrganiser()
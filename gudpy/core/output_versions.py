@@ -0,0 +1,165 @@
+import os
+
+# Extensions of the output files that results are shown from.
+OUTPUT_EXTENSIONS = (".gud", ".mint01", ".mdcs01", ".mdor01", ".mgor01")
+
+
+def outputPath(sample, inputDir, ext):
+    """
+    Returns the path to an output file of a sample,
+    and whether it exists.
+    The file is looked for relative to the working directory,
+    and then to the input file directory.
+
+    Parameters
+    ----------
+    sample : Sample | Container
+        Sample to find the output file of.
+    inputDir : str
+        Directory of the input file.
+    ext : str
+        Extension of the output file.
+    Returns
+    -------
+    (str, bool)
+    """
+    baseFile = sample.dataFiles[0]
+    path = baseFile.replace(os.path.splitext(baseFile)[-1], ext)
+    if os.path.exists(path):
+        return path, True
+    elif os.path.exists(os.path.join(inputDir, path)):
+        return os.path.join(inputDir, path), True
+    return path, False
+
+
+class OutputVersions:
+    """
+    Class to represent the versions of the output files of samples,
+    as of when their results were last loaded.
+    Comparing against the current versions tells which samples'
+    results are stale, such that only those need reloading.
+
+    ...
+
+    Attributes
+    ----------
+    versions : dict
+        Maps samples to the version of their outputs when recorded.
+    Methods
+    -------
+    version(sample, inputDir)
+        Returns the current version of the outputs of a sample.
+    changed(sample, inputDir)
+        Decides whether the outputs of a sample changed since recorded.
+    record(sample, inputDir)
+        Records the current version of the outputs of a sample.
+    forget(sample)
+        Forgets the recorded version of the outputs of a sample.
+    paths(samples, inputDir)
+        Returns the paths of the existing outputs of samples.
+    """
+
+    def __init__(self):
+        """
+        Constructs all the necessary attributes for the OutputVersions object.
+        """
+        self.versions = {}
+
+    def version(self, sample, inputDir):
+        """
+        Returns the current version of the outputs of a sample.
+        This comprises the name and data files of the sample, and the
+        path, size and modification time of each of its outputs.
+
+        Parameters
+        ----------
+        sample : Sample | Container
+            Sample to version the outputs of.
+        inputDir : str
+            Directory of the input file.
+        Returns
+        -------
+        tuple
+        """
+        if not len(sample.dataFiles):
+            return (sample.name,)
+        outputs = []
+        for ext in OUTPUT_EXTENSIONS:
+            path, exists = outputPath(sample, inputDir, ext)
+            try:
+                stat = os.stat(path) if exists else None
+            except OSError:
+                stat = None
+            outputs.append(
+                (path, stat.st_size, stat.st_mtime_ns) if stat
+                else (path, None, None)
+            )
+        return (sample.name, tuple(sample.dataFiles), *outputs)
+
+    def changed(self, sample, inputDir):
+        """
+        Decides whether the outputs of a sample changed since their
+        version was recorded, or were never recorded.
+
+        Parameters
+        ----------
+        sample : Sample | Container
+            Sample to check.
+        inputDir : str
+            Directory of the input file.
+        Returns
+        -------
+        bool
+        """
+        return (
+            sample not in self.versions
+            or self.versions[sample] != self.version(sample, inputDir)
+        )
+
+    def record(self, sample, inputDir):
+        """
+        Records the current version of the outputs of a sample.
+
+        Parameters
+        ----------
+        sample : Sample | Container
+            Sample to record.
+        inputDir : str
+            Directory of the input file.
+        """
+        self.versions[sample] = self.version(sample, inputDir)
+
+    def forget(self, sample):
+        """
+        Forgets the recorded version of the outputs of a sample.
+
+        Parameters
+        ----------
+        sample : Sample | Container
+            Sample to forget.
+        """
+        self.versions.pop(sample, None)
+
+    def paths(self, samples, inputDir):
+        """
+        Returns the paths of the existing outputs of samples.
+
+        Parameters
+        ----------
+        samples : Sample[]
+            Samples to find the outputs of.
+        inputDir : str
+            Directory of the input file.
+        Returns
+        -------
+        str[]
+        """
+        paths = []
+        for sample in samples:
+            if not len(sample.dataFiles):
+                continue
+            for ext in OUTPUT_EXTENSIONS:
+                path, exists = outputPath(sample, inputDir, ext)
+                if exists:
+                    paths.append(os.path.abspath(path))
+        return paths
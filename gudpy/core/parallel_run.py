@@ -0,0 +1,202 @@
+from concurrent.futures import ThreadPoolExecutor
+from copy import copy
+import os
+import shutil
+import subprocess
+import uuid
+
+from core.file_library import GudPyFileLibrary
+from core.utils import resolve
+from core import config
+
+SUFFIX = ".exe" if os.name == "nt" else ""
+
+
+class ParallelRun():
+    """
+    Class for running gudrun_dcs over the samples of a GudrunFile in
+    parallel.
+    The GudrunFile is partitioned into one input file per sample, or per
+    sample background, each of which is run in its own scratch directory.
+    The inputs in the input file directory, such as the raw data and
+    calibration files, are symlinked into each scratch directory,
+    so relative paths resolve as they would for a single run.
+    Once every run completes, the outputs are merged back into the
+    input file directory, and organised.
+
+    ...
+
+    Attributes
+    ----------
+    gudrunFile : GudrunFile
+        GudrunFile to run.
+    split : str
+        What to partition by, "sample" or "background".
+    partitions : GudrunFile[]
+        GudrunFiles each holding a single partition.
+    Methods
+    -------
+    partition():
+        Partitions the samples of the GudrunFile.
+    run(workers=None, iterative=False, gudrun_dcs=None):
+        Runs gudrun_dcs on each partition in parallel.
+    """
+
+    def __init__(self, gudrunFile, split="sample"):
+        self.gudrunFile = gudrunFile
+        self.split = split
+        self.partition()
+
+    def partition(self):
+        # Partitions share everything but their sample backgrounds,
+        # so shallow copies suffice, and nothing is mutated.
+        self.partitions = []
+        for sampleBackground in self.gudrunFile.sampleBackgrounds:
+            samples = [
+                s for s in sampleBackground.samples
+                if s.runThisSample
+                or any(c.runAsSample for c in s.containers)
+            ]
+            if not samples:
+                continue
+            groups = (
+                [[s] for s in samples] if self.split == "sample"
+                else [sampleBackground.samples]
+            )
+            for group in groups:
+                background = copy(sampleBackground)
+                background.samples = group
+                partition = copy(self.gudrunFile)
+                partition.sampleBackgrounds = [background]
+                self.partitions.append(partition)
+
+    def shared(self, dir):
+        """
+        Returns the names of the entries of the input file directory to
+        share with each scratch directory. Only inputs are shared:
+        the top-level entries holding the files that gudrun_dcs reads,
+        and the startup files, so that gudrun_dcs never writes
+        through a link into the outputs of a previous run.
+
+        Parameters
+        ----------
+        dir : str
+            Input file directory.
+        Returns
+        -------
+        str[]
+        """
+        instrument = self.gudrunFile.instrument
+        paths = GudPyFileLibrary(self.gudrunFile).references()
+        paths.extend(
+            os.path.join(dir, f) for f in (
+                instrument.dataFileDir, instrument.startupFileFolder,
+                instrument.GudrunStartFolder
+            ) if f
+        )
+        shared = set()
+        for path in paths:
+            relative = os.path.relpath(os.path.abspath(path), dir)
+            top = relative.split(os.sep)[0]
+            if top in (os.curdir, os.pardir) or top.startswith(".gudpy"):
+                continue
+            if top != self.gudrunFile.outpath and os.path.lexists(
+                os.path.join(dir, top)
+            ):
+                shared.add(top)
+        return sorted(shared)
+
+    def prepare(self, dir, scratch, shared, partition):
+        os.makedirs(scratch)
+        for f in shared:
+            src, dst = os.path.join(dir, f), os.path.join(scratch, f)
+            # Corrections may be rewritten by each run, so are copied.
+            if f.rpartition(".")[2] in GudPyFileLibrary.CORRECTIONS:
+                shutil.copyfile(src, dst)
+                continue
+            os.symlink(src, dst, target_is_directory=os.path.isdir(src))
+        partition.write_out(
+            path=os.path.join(scratch, self.gudrunFile.outpath),
+            writeParameters=False
+        )
+
+    def merge(self, dir, scratch):
+        """
+        Moves the outputs written into a scratch directory
+        into the input file directory.
+
+        Parameters
+        ----------
+        dir : str
+            Input file directory.
+        scratch : str
+            Scratch directory.
+        """
+        for entry in os.scandir(scratch):
+            if entry.is_symlink() or entry.name == self.gudrunFile.outpath:
+                continue
+            dst = os.path.join(dir, entry.name)
+            if entry.is_dir():
+                if os.path.exists(dst):
+                    shutil.rmtree(dst)
+            os.replace(entry.path, dst)
+
+    def run(self, workers=None, iterative=False, gudrun_dcs=None):
+        """
+        Runs gudrun_dcs on each partition in parallel, merges the outputs
+        back into the input file directory, and then organises them,
+        unless iterating.
+
+        Parameters
+        ----------
+        workers : int, optional
+            Number of gudrun_dcs processes to run at once.
+            Defaults to config.PARALLEL_RUN_WORKERS.
+        iterative : bool, optional
+            Is this run part of an iteration?
+        gudrun_dcs : str, optional
+            Path to the gudrun_dcs binary.
+        Returns
+        -------
+        subprocess.CompletedProcess | bool
+            The combined result of each run, in the order
+            of the partitions. Can access stdout/stderr from this.
+            False if gudrun_dcs couldn't be found.
+        """
+        if not gudrun_dcs:
+            gudrun_dcs = resolve("bin", f"gudrun_dcs{SUFFIX}")
+        if not os.path.exists(gudrun_dcs):
+            return False
+        dir = os.path.abspath(self.gudrunFile.instrument.GudrunInputFileDir)
+        root = os.path.join(dir, f".gudpy-scratch-{uuid.uuid4().hex}")
+        shared = self.shared(dir)
+        scratches = [
+            os.path.join(root, str(i)) for i in range(len(self.partitions))
+        ]
+        try:
+            for scratch, partition in zip(scratches, self.partitions):
+                self.prepare(dir, scratch, shared, partition)
+            # Each worker only waits on its gudrun_dcs process,
+            # so threads run the processes just as concurrently.
+            with ThreadPoolExecutor(
+                max_workers=workers or config.PARALLEL_RUN_WORKERS
+            ) as executor:
+                results = list(executor.map(
+                    lambda scratch: subprocess.run(
+                        [gudrun_dcs, self.gudrunFile.outpath],
+                        cwd=scratch, capture_output=True, text=True
+                    ),
+                    scratches
+                ))
+            for scratch in scratches:
+                self.merge(dir, scratch)
+        finally:
+            shutil.rmtree(root, ignore_errors=True)
+        if not iterative:
+            self.gudrunFile.naiveOrganise()
+        return subprocess.CompletedProcess(
+            [gudrun_dcs, self.gudrunFile.outpath],
+            next((r.returncode for r in results if r.returncode), 0),
+            "".join(r.stdout for r in results),
+            "".join(r.stderr for r in results)
+        )
@@ -0,0 +1,239 @@
+from functools import lru_cache
+import gc
+import hashlib
+import os
+import pickle
+
+from core import config
+from core.utils import atomicOpen
+
+
+@lru_cache(maxsize=None)
+def schema():
+    """
+    Hashes the source of core, which defines the classes that are
+    pickled, so that entries written by any other code are never loaded.
+    Where the source isn't available, as in frozen builds,
+    only the version is used.
+
+    Returns
+    -------
+    str
+        Hex digest identifying the code.
+    """
+    digest = hashlib.sha256(config.__version__.encode("utf-8"))
+    dir = os.path.dirname(os.path.abspath(__file__))
+    for name in sorted(os.listdir(dir)):
+        if name.endswith(".py"):
+            digest.update(name.encode("utf-8"))
+            with open(os.path.join(dir, name), "rb") as fp:
+                digest.update(fp.read())
+    return digest.hexdigest()
+
+
+class ProjectCache:
+    """
+    Class to represent an on-disk cache of parsed input files.
+    Each entry stores the fully constructed object graph of a GudrunFile
+    (instrument, beam, components, normalisation and sample backgrounds),
+    pickled into a single binary file.
+    Entries are keyed by a hash of the file contents, its directory and
+    the source of core, so they are invalidated automatically whenever
+    any of those change.
+    Since unpickling can run arbitrary code, entries are only loaded from
+    a directory that is private to the current user.
+
+    ...
+
+    Attributes
+    ----------
+    cacheDir : str
+        Directory in which cache entries are stored.
+    maxEntries : int
+        Maximum number of entries kept, oldest are evicted first.
+    Methods
+    -------
+    key(path, contents, *context)
+        Computes the key of an input file.
+    trusted()
+        Checks that the cache directory is private to the current user.
+    load(key)
+        Returns the cached state for a key, or None.
+    save(key, state)
+        Stores the state against a key.
+    prune()
+        Evicts the oldest entries, until at most maxEntries remain.
+    clear()
+        Removes all entries.
+    """
+
+    SUFFIX = ".gudpycache"
+
+    def __init__(self, cacheDir=None, maxEntries=None):
+        """
+        Constructs all the necessary attributes for the ProjectCache object.
+
+        Parameters
+        ----------
+        cacheDir : str, optional
+            Directory in which cache entries are stored.
+            Defaults to config.projectCacheDir.
+        maxEntries : int, optional
+            Maximum number of entries kept.
+            Defaults to config.PROJECT_CACHE_SIZE.
+        """
+        self.cacheDir = cacheDir if cacheDir else config.projectCacheDir
+        self.maxEntries = (
+            maxEntries if maxEntries is not None
+            else config.PROJECT_CACHE_SIZE
+        )
+
+    def key(self, path, contents, *context):
+        """
+        Computes the key of an input file.
+
+        Parameters
+        ----------
+        path : str
+            Path to the input file.
+        contents : str
+            Decoded contents of the input file.
+        *context
+            Anything else the parsed result depends upon,
+            such as whether the file is a configuration file.
+        Returns
+        -------
+        str
+            Hex digest identifying the parsed result.
+        """
+        digest = hashlib.sha256()
+        for part in (
+            schema(),
+            os.path.dirname(os.path.abspath(path)),
+            *context
+        ):
+            digest.update(str(part).encode("utf-8"))
+            digest.update(b"\0")
+        digest.update(contents.encode("utf-8"))
+        return digest.hexdigest()
+
+    def entryPath(self, key):
+        return os.path.join(self.cacheDir, key + self.SUFFIX)
+
+    def trusted(self):
+        """
+        Checks that the cache directory is owned by, and only writable by,
+        the current user, so that nobody else could have written entries.
+
+        Returns
+        -------
+        bool
+        """
+        if not hasattr(os, "getuid"):
+            return True
+        try:
+            stat = os.stat(self.cacheDir)
+        except OSError:
+            return False
+        return stat.st_uid == os.getuid() and not stat.st_mode & 0o077
+
+    def load(self, key):
+        """
+        Returns the cached state for a key.
+        Unreadable or stale entries are treated as misses.
+
+        Parameters
+        ----------
+        key : str
+            Key of the entry.
+        Returns
+        -------
+        dict | None
+            The cached state, or None if there is no usable entry.
+        """
+        if not self.trusted():
+            return None
+        path = self.entryPath(key)
+        # Unpickling creates many small objects, which would otherwise
+        # trigger repeated, fruitless, garbage collections.
+        enabled = gc.isenabled()
+        gc.disable()
+        try:
+            with open(path, "rb") as fp:
+                version, state = pickle.load(fp)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            self.remove(path)
+            return None
+        finally:
+            if enabled:
+                gc.enable()
+        if version != schema():
+            self.remove(path)
+            return None
+        return state
+
+    def save(self, key, state):
+        """
+        Stores the state against a key.
+        The entry is written to a temporary file and then renamed into
+        place, so that readers never observe a partial entry.
+        Failure to write is not an error, the cache is best-effort.
+
+        Parameters
+        ----------
+        key : str
+            Key of the entry.
+        state : dict
+            State to store.
+        """
+        try:
+            os.makedirs(self.cacheDir, mode=0o700, exist_ok=True)
+            if not self.trusted():
+                os.chmod(self.cacheDir, 0o700)
+                if not self.trusted():
+                    return
+            with atomicOpen(self.entryPath(key), "wb", None) as fp:
+                pickle.dump(
+                    (schema(), state), fp,
+                    protocol=pickle.HIGHEST_PROTOCOL
+                )
+            self.prune()
+        except Exception:
+            return
+
+    def entries(self):
+        try:
+            return [
+                os.path.join(self.cacheDir, f)
+                for f in os.listdir(self.cacheDir)
+                if f.endswith(self.SUFFIX)
+            ]
+        except OSError:
+            return []
+
+    def prune(self):
+        """
+        Evicts the least recently written entries,
+        until at most maxEntries remain.
+        """
+        entries = self.entries()
+        if len(entries) <= self.maxEntries:
+            return
+        entries.sort(key=lambda p: os.stat(p).st_mtime)
+        for path in entries[:len(entries) - self.maxEntries]:
+            self.remove(path)
+
+    def clear(self):
+        """
+        Removes all entries.
+        """
+        for path in self.entries():
+            self.remove(path)
+
+    def remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -2,9 +2,8 @@ import os
 import sys
 import subprocess
 
-from PySide6.QtCore import QProcess
 from core.enums import Instruments
-from core.utils import resolve, spacify, numifyBool
+from core.utils import resolve, spacify, numifyBool, atomicOpen
 from core import config
 
 SUFFIX = ".exe" if os.name == "nt" else ""
@@ -70,6 +69,9 @@ class PurgeFile():
     -------
     collectGudrunFileAttributes()
         Collects the attributes needed for the purge file.
+    blocks()
+        Yields the string representation of the PurgeFile,
+        one line at a time.
     write_out()
         Writes out the string representation of the PurgeFile to purge_det.dat
     purge()
@@ -101,20 +103,24 @@ class PurgeFile():
 
         Parameters
         ----------
-        None
+        path : str, optional
+            Path to write to. Defaults to purge_det.dat,
+            in the input file directory.
         Returns
         -------
         None
         """
-        # Write out the string representation of the PurgeFile
-        # To purge_det.dat.
         if not path:
-            f = open("purge_det.dat", "w", encoding="utf-8")
-            f.write(str(self))
-        else:
-            f = open(path, "w", encoding="utf-8")
-            f.write(str(self))
-        f.close()
+            path = os.path.join(
+                self.gudrunFile.instrument.GudrunInputFileDir,
+                "purge_det.dat"
+            )
+        # Stream the string representation of the PurgeFile
+        # to purge_det.dat, replacing any existing file only
+        # once it has been written in full.
+        with atomicOpen(path) as f:
+            for block in self.blocks():
+                f.write(block)
 
     def collectGudrunFileAttributes(self):
         """
@@ -203,75 +209,27 @@ class PurgeFile():
         string : str
             String representation of PurgeFile.
         """
-        HEADER = f"'  '  '          '  '{os.path.sep}'\n\n"
-        TAB = "          "
-
-        # Collect data files as strings of the format:
-        # {name} {period number}
-        # do this for normalisation, normalisation background,
-        # sample background, sample and container data files.
-        # insert eight space 'tab' after each period number,
-        # for consistency with original Gudrun code.
+        return "".join(self.blocks())
 
-        TAB = "          "
-        self.normalisationDataFilesString = ""
-        self.normalisationBackgroundDataFilesString = ""
-
-        # Iterate through normalisation and normalisation background
-        # data files, appending their string representation with
-        # period number to the relevant string.
-        for dataFile in self.normalisationDataFiles[0]:
-            self.normalisationDataFilesString += (
-                f"{dataFile}  {str(self.normalisationPeriodNo)}{TAB}\n"
-            )
-        for dataFile in self.normalisationBackgroundDataFiles[0]:
-            self.normalisationBackgroundDataFilesString += (
-                f"{dataFile}  {str(self.normalisationPeriodNoBg)}{TAB}\n"
-
-            )
-        self.sampleBackgroundDataFilesString = ""
-        self.sampleDataFilesString = ""
-        self.containerDataFilesString = ""
+    def blocks(self):
+        """
+        Yields the string representation of the PurgeFile object,
+        one line at a time, so that it can be written out
+        without being held in memory as a whole.
 
-        # Iterate through sample background
-        # data files, appending their string representation with
-        # period number to the relevant string.
-        for dataFiles, periodNumber in self.sampleBackgroundDataFiles:
-            for dataFile in dataFiles:
-                self.sampleBackgroundDataFilesString += (
-                    f"{dataFile}  {str(periodNumber)}{TAB}\n"
-                )
-        # Iterate through sample data files,
-        # appending their string representation with
-        # period number to the relevant string.
-        for dataFiles, periodNumber in self.sampleDataFiles:
-            for dataFile in dataFiles:
-                self.sampleDataFilesString += (
-                    f"{dataFile}  {str(periodNumber)}{TAB}\n"
-                )
+        Parameters
+        ----------
+        None
 
-        # Iterate through container data files,
-        # appending their string representation with
-        # period number to the relevant string.
-        for dataFiles, periodNumber in self.containerDataFiles:
-            for dataFile in dataFiles:
-                self.containerDataFilesString += (
-                    f"{dataFile}  {str(periodNumber)}{TAB}\n"
-                )
+        Yields
+        ------
+        string : str
+            Consecutive lines of the string representation.
+        """
+        HEADER = f"'  '  '          '  '{os.path.sep}'\n\n"
+        TAB = "          "
 
-        dataFileLines = (
-            f'{self.normalisationDataFilesString}'
-            f'{self.normalisationBackgroundDataFilesString}'
-            f'{self.sampleBackgroundDataFilesString}'
-            f'{self.sampleDataFilesString}'
-            f'{self.containerDataFilesString}'
-            if not self.excludeSampleAndCan
-            else
-            f'{self.normalisationDataFilesString}'
-            f'{self.normalisationBackgroundDataFilesString}'
-            f'{self.sampleBackgroundDataFilesString}'
-        )
-        return (
+        yield (
             f'{HEADER}'
             f'{Instruments(self.instrumentName.value).name}{TAB}'
             f'Instrument name\n'
@@ -297,9 +255,30 @@ class PurgeFile():
             f'{numifyBool(self.ignoreBad)}{TAB}'
             f'Ignore any existing bad spectrum and spike files'
             f' (spec.bad, spike.dat)?\n'
-            f'{dataFileLines}'
         )
 
+        # Write out data files in the format:
+        # {name} {period number}
+        # do this for normalisation, normalisation background,
+        # sample background, sample and container data files.
+        # insert eight space 'tab' after each period number,
+        # for consistency with original Gudrun code.
+        dataFiles = [
+            (self.normalisationDataFiles[0], self.normalisationPeriodNo),
+            (
+                self.normalisationBackgroundDataFiles[0],
+                self.normalisationPeriodNoBg
+            ),
+            *self.sampleBackgroundDataFiles
+        ]
+        if not self.excludeSampleAndCan:
+            dataFiles.extend(self.sampleDataFiles)
+            dataFiles.extend(self.containerDataFiles)
+
+        for files, periodNumber in dataFiles:
+            for dataFile in files:
+                yield f"{dataFile}  {str(periodNumber)}{TAB}\n"
+
     def purge(
         self,
         standardDeviation=(10, 10),
@@ -335,16 +314,14 @@ class PurgeFile():
         self.excludeSampleAndCan = excludeSampleAndCan
         if headless:
             try:
-                cwd = os.getcwd()
                 purge_det = resolve("bin", f"purge_det{SUFFIX}")
-                os.chdir(self.gudrunFile.instrument.GudrunInputFileDir)
                 self.write_out()
                 result = subprocess.run(
                     [purge_det, "purge_det.dat"],
                     capture_output=True,
-                    text=True
+                    text=True,
+                    cwd=self.gudrunFile.instrument.GudrunInputFileDir
                 )
-                os.chdir(cwd)
             except FileNotFoundError:
                 return False
             return result
@@ -359,6 +336,7 @@ class PurgeFile():
                 )
             if not os.path.exists(purge_det):
                 return FileNotFoundError()
+            from PySide6.QtCore import QProcess
             proc = QProcess()
             proc.setProgram(purge_det)
             proc.setArguments([])
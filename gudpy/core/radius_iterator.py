@@ -31,4 +31,4 @@ class RadiusIterator(SingleParamIterator):
         self.targetRadius = targetRadius
 
     def organiseOutput(self, n):
-        self.gudrunFile.iterativeOrganise(f"IterateByRadius_{n}")
+        self.gudrunFile.iterativeOrganise(f"IterateByRadius_{n}", wait=False)
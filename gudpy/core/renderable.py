@@ -0,0 +1,141 @@
+from itertools import count
+
+from core.data_files import DataFiles
+from core.composition import Composition
+
+# Stamps are drawn from a single counter, so that no two changes,
+# to any objects, share a stamp.
+stamps = count()
+
+
+def freeze(value):
+    """
+    Returns a hashable snapshot of a value that may be changed in place,
+    such as a list, DataFiles or Composition.
+
+    Parameters
+    ----------
+    value : any
+        Value to take a snapshot of.
+    Returns
+    -------
+    any
+        Snapshot of the value, which compares equal to a snapshot
+        of any value with the same rendering.
+    """
+    if isinstance(value, (list, tuple)):
+        return tuple([freeze(v) for v in value])
+    if isinstance(value, Composition):
+        return tuple([
+            (e.atomicSymbol, e.massNo, e.abundance) for e in value.elements
+        ])
+    if isinstance(value, DataFiles):
+        return (value.name, tuple(value.dataFiles))
+    return value
+
+
+class Renderable:
+    """
+    Base class for objects of the input file, which cache the block of
+    text they render to.
+    Assigning to any attribute of the object discards its cached text.
+    Changes that don't go through assignment, such as appending to a
+    list, or changing a nested object, are caught by comparing the
+    renderKey of the object with the key its text was rendered with.
+    As such, rendering an unchanged object only costs its renderKey.
+    Each assignment also discards the stamp of the object, which is
+    drawn afresh when next needed, so that the key of a parent can
+    include the stateKey of each child, rather than its text.
+
+    ...
+
+    Methods
+    -------
+    render()
+        Renders the block of text representing the object.
+    renderKey()
+        Returns a snapshot of everything the text depends upon,
+        that may change without assigning to an attribute.
+    stateKey()
+        Returns a snapshot of the whole state of the object.
+    """
+
+    def __setattr__(self, name, value):
+        self.__dict__.pop("_rendered", None)
+        self.__dict__.pop("_state", None)
+        object.__setattr__(self, name, value)
+
+    def __setstate__(self, state):
+        # Copies, and objects unpickled from another process,
+        # are stamped afresh.
+        self.__dict__.update(state)
+        self.__dict__.pop("_state", None)
+
+    def render(self):
+        raise NotImplementedError
+
+    def renderKey(self):
+        """
+        Returns a snapshot of the attributes of the object
+        that may be changed in place, rather than assigned to.
+
+        Parameters
+        ----------
+        None
+        Returns
+        -------
+        tuple
+        """
+        return tuple(
+            freeze(v) for v in self.__dict__.values()
+            if isinstance(v, (list, DataFiles, Composition))
+        )
+
+    def stateKey(self):
+        """
+        Returns a snapshot of the whole state of the object, for the
+        renderKey of its parent. An object only keeps its stamp until
+        it is assigned to, and its renderKey covers every change made
+        in place, so the snapshot is unchanged only if the object is.
+
+        Parameters
+        ----------
+        None
+        Returns
+        -------
+        tuple
+        """
+        key = self.renderKey()
+        state = self.__dict__.get("_state")
+        if state is None:
+            state = (id(self), next(stamps), key)
+        elif state[2] != key:
+            state = (*state[:2], key)
+        else:
+            # The same tuple is returned whilst unchanged,
+            # so comparing the keys of parents is quick.
+            return state
+        self.__dict__["_state"] = state
+        return state
+
+    def __str__(self):
+        """
+        Returns the string representation of the object,
+        rendering it only if it changed since it was last rendered.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        string : str
+            String representation of the object.
+        """
+        key = self.renderKey()
+        rendered = self.__dict__.get("_rendered")
+        if rendered is not None and rendered[0] == key:
+            return rendered[1]
+        text = self.render()
+        self.__dict__["_rendered"] = (key, text)
+        return text
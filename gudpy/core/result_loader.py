@@ -0,0 +1,129 @@
+from concurrent.futures import ThreadPoolExecutor
+import threading
+
+from core.dataset_cache import datasetCache
+from core import config
+
+
+class ResultLoader:
+    """
+    Class to represent a pool of threads, which load the output files
+    of samples into the datasetCache in the background.
+    Each batch of loads is tagged with the generation it was submitted
+    in. Cancelling starts a new generation, after which loads of older
+    generations are abandoned, and their callbacks are never called.
+
+    ...
+
+    Attributes
+    ----------
+    generation : int
+        Current generation of loads.
+    executor : ThreadPoolExecutor
+        Pool of threads that loads are run on.
+    futures : Future[]
+        Loads of the current generation that may not have finished.
+    Methods
+    -------
+    submit(key, paths, callback)
+        Loads files in the background, then calls back with them.
+    cancel()
+        Abandons all loads submitted so far.
+    shutdown()
+        Abandons all loads, and stops the threads.
+    """
+
+    def __init__(self, maxWorkers=None):
+        """
+        Constructs all the necessary attributes for the ResultLoader object.
+
+        Parameters
+        ----------
+        maxWorkers : int, optional
+            Number of threads to load with.
+            Defaults to config.RESULT_LOADER_THREADS.
+        """
+        self.generation = 0
+        self.executor = ThreadPoolExecutor(
+            max_workers=maxWorkers or config.RESULT_LOADER_THREADS,
+            thread_name_prefix="gudpy-results"
+        )
+        self.futures = []
+        self.lock = threading.Lock()
+
+    def submit(self, key, paths, callback):
+        """
+        Loads files in the background, then calls back with them,
+        from the loading thread, unless cancelled in the meantime.
+
+        Parameters
+        ----------
+        key : any
+            Passed back to the callback, to identify the batch.
+        paths : (str, callable)[]
+            Paths of the files to load, and the loaders to load them with.
+        callback : callable
+            Called with (key, datasets, generation). datasets maps each
+            path to its dataset, or to the exception raised loading it.
+        Returns
+        -------
+        int
+            The generation the batch was submitted in.
+        """
+        with self.lock:
+            generation = self.generation
+            self.futures = [f for f in self.futures if not f.done()]
+            self.futures.append(
+                self.executor.submit(
+                    self.load, key, paths, callback, generation
+                )
+            )
+        return generation
+
+    def load(self, key, paths, callback, generation):
+        datasets = {}
+        for path, loader in paths:
+            if self.generation != generation:
+                return
+            try:
+                datasets[path] = datasetCache.load(path, loader)
+            except Exception as e:
+                datasets[path] = e
+        if self.generation == generation:
+            callback(key, datasets, generation)
+
+    def cancel(self):
+        """
+        Abandons all loads submitted so far. Loads that haven't started
+        never will, and those in progress stop after their current file.
+
+        Returns
+        -------
+        int
+            The new generation.
+        """
+        with self.lock:
+            self.generation += 1
+            for future in self.futures:
+                future.cancel()
+            self.futures = []
+            return self.generation
+
+    def pending(self):
+        """
+        Returns the number of loads of the current generation
+        that haven't finished.
+
+        Returns
+        -------
+        int
+        """
+        with self.lock:
+            return len([f for f in self.futures if not f.done()])
+
+    def shutdown(self):
+        """
+        Abandons all loads, and stops the threads.
+        """
+        self.cancel()
+        self.executor.shutdown(wait=False)
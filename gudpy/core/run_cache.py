@@ -0,0 +1,342 @@
+import hashlib
+import json
+import os
+import re
+import shutil
+import uuid
+
+from core.file_library import GudPyFileLibrary
+from core import config
+
+
+class RunCache:
+    """
+    Class to represent an on-disk cache of the outputs of gudrun_dcs.
+    Each entry stores every file that a run of gudrun_dcs wrote into
+    the input file directory, along with what it printed.
+    Entries are keyed by a hash of the input file as it was rendered,
+    the gudrun_dcs binary, and the fingerprints of every file that
+    gudrun_dcs reads, as resolved by GudPyFileLibrary.references(),
+    so a run is only skipped if nothing it depends upon has changed.
+
+    ...
+
+    Attributes
+    ----------
+    cacheDir : str
+        Directory in which cache entries are stored.
+    maxSize : int
+        Maximum total size of the entries, in bytes.
+    maxEntries : int
+        Maximum number of entries kept.
+    hashContents : bool
+        Should the contents of referenced files be hashed,
+        rather than only their sizes and modification times?
+    Methods
+    -------
+    key(gudrunFile, path, binary)
+        Computes the key of a run of gudrun_dcs.
+    snapshot(dir)
+        Records the state of the files in a directory.
+    load(key, dir)
+        Restores the outputs cached for a key, returning the result.
+    save(key, dir, before, result, exclude=())
+        Stores the outputs of a run against a key.
+    prune()
+        Evicts the least recently used entries, until within the limits.
+    clear()
+        Removes all entries.
+    """
+
+    SUFFIX = ".gudpyrun"
+    # Plain JSON, as nothing in the cache directory need be trusted.
+    MANIFEST = "manifest.json"
+    # The time the input file was written doesn't affect the run.
+    TIMESTAMP = re.compile(rb"^Date and time last written:.*$", re.M)
+
+    def __init__(
+        self, cacheDir=None, maxSize=None, maxEntries=None, hashContents=None
+    ):
+        """
+        Constructs all the necessary attributes for the RunCache object.
+
+        Parameters
+        ----------
+        cacheDir : str, optional
+            Directory in which cache entries are stored.
+            Defaults to config.runCacheDir.
+        maxSize : int, optional
+            Maximum total size of the entries, in bytes.
+            Defaults to config.RUN_CACHE_SIZE.
+        maxEntries : int, optional
+            Maximum number of entries kept.
+            Defaults to config.RUN_CACHE_ENTRIES.
+        hashContents : bool, optional
+            Should the contents of referenced files be hashed?
+            Defaults to config.RUN_CACHE_HASH_CONTENTS.
+        """
+        self.cacheDir = cacheDir if cacheDir else config.runCacheDir
+        self.maxSize = (
+            maxSize if maxSize is not None
+            else config.RUN_CACHE_SIZE
+        )
+        self.maxEntries = (
+            maxEntries if maxEntries is not None
+            else config.RUN_CACHE_ENTRIES
+        )
+        self.hashContents = (
+            hashContents if hashContents is not None
+            else config.RUN_CACHE_HASH_CONTENTS
+        )
+
+    def fingerprint(self, path, contents=False):
+        """
+        Fingerprints a file, by its size and modification time,
+        and optionally a hash of its contents.
+
+        Parameters
+        ----------
+        path : str
+            Path to the file.
+        contents : bool, optional
+            Should the contents be hashed?
+        Returns
+        -------
+        str
+            The fingerprint, or "missing" if the file doesn't exist.
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return "missing"
+        fingerprint = f"{stat.st_size}:{stat.st_mtime_ns}"
+        if contents:
+            digest = hashlib.sha256()
+            with open(path, "rb") as fp:
+                for chunk in iter(lambda: fp.read(1 << 20), b""):
+                    digest.update(chunk)
+            fingerprint += f":{digest.hexdigest()}"
+        return fingerprint
+
+    def key(self, gudrunFile, path, binary):
+        """
+        Computes the key of a run of gudrun_dcs.
+
+        Parameters
+        ----------
+        gudrunFile : GudrunFile
+            GudrunFile being run.
+        path : str
+            Path to the input file, as written out.
+        binary : str
+            Path to the gudrun_dcs binary.
+        Returns
+        -------
+        str | None
+            Hex digest identifying the run,
+            or None if the input file or binary cannot be read.
+        """
+        binaryFingerprint = self.fingerprint(binary)
+        if binaryFingerprint == "missing":
+            return None
+        try:
+            with open(path, "rb") as fp:
+                contents = fp.read()
+        except OSError:
+            return None
+        digest = hashlib.sha256()
+        for part in (
+            config.__version__,
+            os.path.abspath(binary),
+            binaryFingerprint
+        ):
+            digest.update(str(part).encode("utf-8"))
+            digest.update(b"\0")
+        digest.update(self.TIMESTAMP.sub(b"", contents))
+        digest.update(b"\0")
+        try:
+            references = GudPyFileLibrary(gudrunFile).references()
+            for reference in references:
+                digest.update(reference.encode("utf-8"))
+                digest.update(b"\0")
+                digest.update(
+                    self.fingerprint(
+                        reference, self.hashContents
+                    ).encode("utf-8")
+                )
+                digest.update(b"\0")
+        except OSError:
+            return None
+        return digest.hexdigest()
+
+    def entryPath(self, key):
+        return os.path.join(self.cacheDir, key + self.SUFFIX)
+
+    def snapshot(self, dir):
+        """
+        Records the state of the files in a directory, so that
+        the files a run writes can be told apart afterwards.
+
+        Parameters
+        ----------
+        dir : str
+            Directory to record.
+        Returns
+        -------
+        dict
+            Maps filenames to their sizes and modification times.
+        """
+        return {
+            entry.name: (entry.stat().st_size, entry.stat().st_mtime_ns)
+            for entry in os.scandir(dir)
+            if entry.is_file(follow_symlinks=False)
+        }
+
+    def load(self, key, dir):
+        """
+        Restores the outputs cached for a key into a directory.
+        Unreadable entries are treated as misses.
+
+        Parameters
+        ----------
+        key : str
+            Key of the entry.
+        dir : str
+            Directory to restore the outputs into.
+        Returns
+        -------
+        tuple | None
+            The return code, stdout and stderr of the cached run,
+            or None if there is no usable entry.
+        """
+        path = self.entryPath(key)
+        try:
+            with open(
+                os.path.join(path, self.MANIFEST), encoding="utf-8"
+            ) as fp:
+                version, manifest = json.load(fp)
+            files = [os.path.basename(f) for f in manifest["files"]]
+            result = tuple(manifest["result"])
+        except FileNotFoundError:
+            return None
+        except Exception:
+            self.remove(path)
+            return None
+        if version != config.__version__:
+            self.remove(path)
+            return None
+        try:
+            for f in files:
+                # Copied, rather than linked, so that later runs
+                # may rewrite the outputs without affecting the entry.
+                # Each copy replaces the output, rather than writing
+                # through it, as it may be linked into organised outputs.
+                dst = os.path.join(dir, f)
+                tmp = os.path.join(dir, f".{f}.{uuid.uuid4().hex}.tmp")
+                try:
+                    shutil.copyfile(os.path.join(path, f), tmp)
+                    os.replace(tmp, dst)
+                finally:
+                    if os.path.exists(tmp):
+                        os.remove(tmp)
+            # Marks the entry as recently used.
+            os.utime(path)
+        except OSError:
+            self.remove(path)
+            return None
+        return result
+
+    def save(self, key, dir, before, result, exclude=()):
+        """
+        Stores the files that a run wrote into a directory against a key.
+        The entry is written to a temporary directory and then renamed
+        into place, so that readers never observe a partial entry.
+        Failure to write is not an error, the cache is best-effort.
+
+        Parameters
+        ----------
+        key : str
+            Key of the entry.
+        dir : str
+            Directory the run wrote into.
+        before : dict
+            Snapshot of the directory, from before the run.
+        result : tuple
+            The return code, stdout and stderr of the run.
+        exclude : str[], optional
+            Filenames not to store, such as the input file.
+        """
+        tmp = os.path.join(self.cacheDir, f".{uuid.uuid4().hex}.tmp")
+        try:
+            after = self.snapshot(dir)
+            files = [
+                f for f, state in after.items()
+                if before.get(f) != state
+                and f not in exclude
+                and not f.startswith(".gudpy")
+            ]
+            if sum(after[f][0] for f in files) > self.maxSize:
+                return
+            os.makedirs(tmp)
+            for f in files:
+                shutil.copyfile(os.path.join(dir, f), os.path.join(tmp, f))
+            with open(
+                os.path.join(tmp, self.MANIFEST), "w", encoding="utf-8"
+            ) as fp:
+                json.dump(
+                    [
+                        config.__version__,
+                        {"files": files, "result": list(result)}
+                    ],
+                    fp
+                )
+            path = self.entryPath(key)
+            if os.path.exists(path):
+                self.remove(path)
+            os.replace(tmp, path)
+            self.prune()
+        except Exception:
+            return
+        finally:
+            self.remove(tmp)
+
+    def entries(self):
+        try:
+            return [
+                os.path.join(self.cacheDir, f)
+                for f in os.listdir(self.cacheDir)
+                if f.endswith(self.SUFFIX)
+            ]
+        except OSError:
+            return []
+
+    def size(self, path):
+        try:
+            return sum(
+                entry.stat().st_size for entry in os.scandir(path)
+            )
+        except OSError:
+            return 0
+
+    def prune(self):
+        """
+        Evicts the least recently used entries, until at most maxEntries
+        remain, whose total size is at most maxSize.
+        """
+        entries = self.entries()
+        entries.sort(key=lambda p: os.stat(p).st_mtime, reverse=True)
+        total = 0
+        for i, path in enumerate(entries):
+            total += self.size(path)
+            if i >= self.maxEntries or total > self.maxSize:
+                self.remove(path)
+
+    def clear(self):
+        """
+        Removes all entries.
+        """
+        for path in self.entries():
+            self.remove(path)
+
+    def remove(self, path):
+        shutil.rmtree(path, ignore_errors=True)
@@ -6,9 +6,10 @@ from core.enums import (
     NormalisationType, OutputUnits, Geometry
 )
 from core import config
+from core.renderable import Renderable, freeze
 
 
-class Sample:
+class Sample(Renderable):
     """
     Class to represent a Sample.
 
@@ -95,6 +96,8 @@ class Sample:
         List of Container objects attached to this sample.
     Methods
     -------
+    render()
+        Renders the string representation of the Sample object.
     """
     def __init__(self):
         """
@@ -152,7 +155,23 @@ class Sample:
             {ord(x): '' for x in r'/\!*~,&|[]'}
         ) + ".sample"
 
-    def __str__(self):
+    def renderKey(self):
+        # Spelled out, rather than using the generic key,
+        # as it is computed for every sample on every write.
+        # The rendered geometry depends upon the geometry of the beam.
+        return (
+            self.dataFiles.name,
+            tuple(self.dataFiles.dataFiles),
+            freeze(self.composition),
+            freeze(self.resonanceValues),
+            freeze(self.exponentialValues),
+            config.geometry,
+            tuple([
+                x.stateKey() for x in self.containers if not x.runAsSample
+            ])
+        )
+
+    def render(self):
         """
         Returns the string representation of the Sample object.
 
@@ -1,7 +1,9 @@
 from core.data_files import DataFiles
+from core.lazy_sample import LazySample
+from core.renderable import Renderable
 
 
-class SampleBackground:
+class SampleBackground(Renderable):
     """
     Class to represent a SampleBackground.
 
@@ -17,6 +19,17 @@ class SampleBackground:
         List of Sample objects against the SampleBackground.
     Methods
     -------
+    headerString()
+        Returns the string representation, excluding samples.
+    convertedSamples(samples)
+        Returns the string representations of the containers
+        of some samples, that are to be run as samples.
+    render()
+        Renders the string representation of the SampleBackground object.
+    blocks()
+        Returns the string representation, as a cached list of blocks.
+    renderBlocks()
+        Yields the string representation, one block at a time.
     """
     def __init__(self):
         """
@@ -37,9 +50,10 @@ class SampleBackground:
             "yamlignore"
         }
 
-    def __str__(self):
+    def headerString(self):
         """
-        Returns the string representation of the SampleBackground object.
+        Returns the string representation of the SampleBackground object,
+        excluding its samples.
 
         Parameters
         ----------
@@ -48,22 +62,9 @@ class SampleBackground:
         Returns
         -------
         string : str
-            String representation of SampleBackground.
+            String representation of the SampleBackground block.
         """
         TAB = "          "
-        CONV_SAMPLES = [
-            str(c.convertToSample())
-            for s in self.samples
-            for c in s.containers
-            if c.runAsSample
-        ]
-        if self.writeAllSamples:
-            samples = [str(x) for x in self.samples]
-        else:
-            samples = [str(x) for x in self.samples if x.runThisSample]
-        SAMPLES = "\n".join([*samples, *CONV_SAMPLES])
-        self.writeAllSamples = True
-
         dataFilesLine = (
             f'{str(self.dataFiles)}\n'
             if len(self.dataFiles) > 0
@@ -77,6 +78,115 @@ class SampleBackground:
             f'Number of  files and period number\n'
             f'{dataFilesLine}\n'
             f'}}\n'
-            f'{SAMPLES}'
+        )
+
+    def convertedSamples(self, samples):
+        """
+        Returns the string representations of the containers of some
+        of the samples of the SampleBackground object,
+        that are to be run as samples.
+
+        Parameters
+        ----------
+        samples : Sample[]
+            Samples whose containers to convert.
+
+        Returns
+        -------
+        str[]
+            String representations of the converted containers.
+        """
+        # Containers of unparsed samples can't have been marked
+        # to run as samples, so leave them unparsed.
+        return [
+            str(c.convertToSample())
+            for s in samples
+            if not isinstance(s, LazySample)
+            for c in s.containers
+            if c.runAsSample
+        ]
 
+    def renderKey(self):
+        return (
+            *super().renderKey(),
+            self.writeAllSamples,
+            tuple(x.stateKey() for x in self.samples),
+            tuple(
+                c.stateKey()
+                for s in self.samples
+                if not isinstance(s, LazySample)
+                for c in s.containers
+                if c.runAsSample
+            )
         )
+
+    def render(self):
+        """
+        Returns the string representation of the SampleBackground object.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        string : str
+            String representation of SampleBackground.
+        """
+        return "".join(self.renderBlocks())
+
+    def __str__(self):
+        return "".join(self.blocks())
+
+    def blocks(self):
+        """
+        Returns the string representation of the SampleBackground object,
+        as a list of blocks, so that it can be written out
+        without being joined into a whole.
+        The blocks are cached whilst neither the SampleBackground,
+        nor any of its Samples, change.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        str[]
+            Consecutive parts of the string representation.
+        """
+        key = self.renderKey()
+        rendered = self.__dict__.get("_rendered")
+        if rendered is None or rendered[0] != key:
+            rendered = (key, list(self.renderBlocks()))
+        # Only the next write may leave out samples that aren't run.
+        if not self.writeAllSamples:
+            self.writeAllSamples = True
+        self.__dict__["_rendered"] = rendered
+        return rendered[1]
+
+    def renderBlocks(self):
+        """
+        Yields the string representation of the SampleBackground object,
+        one block at a time.
+
+        Parameters
+        ----------
+        None
+
+        Yields
+        ------
+        string : str
+            Consecutive parts of the string representation.
+        """
+        if self.writeAllSamples:
+            samples = self.samples
+        else:
+            samples = [x for x in self.samples if x.runThisSample]
+        CONV_SAMPLES = self.convertedSamples(self.samples)
+
+        yield self.headerString()
+        for i, sample in enumerate([*samples, *CONV_SAMPLES]):
+            if i:
+                yield "\n"
+            yield str(sample)
@@ -1,6 +1,7 @@
-from core.gud_file import GudFile
 import os
-import time
+
+from core.gud_file import loadGudFile
+from core.output_file_handler import organiser
 
 
 class SingleParamIterator():
@@ -61,7 +62,7 @@ class SingleParamIterator():
                             self.gudrunFile.instrument.dataFileType,
                             "gud"
                         )
-                gudFile = GudFile(
+                gudFile = loadGudFile(
                     os.path.join(
                         self.gudrunFile.instrument.GudrunInputFileDir,
                         gudPath
@@ -113,9 +114,13 @@ class SingleParamIterator():
         ----------
         n : int
             Number of iterations to perform.
+        Raises
+        ------
+        GudrunException
+            If a run of gudrun_dcs didn't succeed.
         """
         for i in range(n):
-            self.gudrunFile.process()
-            time.sleep(1)
+            self.gudrunFile.processAndWait()
             self.performIteration(i)
             self.organiseOutput(i)
+        organiser.wait()
@@ -28,4 +28,6 @@ class ThicknessIterator(SingleParamIterator):
         object.upstreamThickness = totalThickness / 2
 
     def organiseOutput(self, n):
-        self.gudrunFile.iterativeOrganise(f"IterateByThickness_{n}")
+        self.gudrunFile.iterativeOrganise(
+            f"IterateByThickness_{n}", wait=False
+        )
@@ -0,0 +1,179 @@
+import io
+
+from core.utils import readText
+
+
+class TokenStream:
+    """
+    Class to represent a stream of tokens read from an input file.
+    Each token is a single line of the input.
+    The stream walks the lines with a cursor, rather than removing
+    them from the front of a list, so consuming a token is O(1)
+    and the underlying lines are never copied or shifted.
+
+    ...
+
+    Attributes
+    ----------
+    lines : str[]
+        List of strings, where each item represents a line
+        in the input stream.
+    cursor : int
+        Index of the next token in the input stream.
+    end : int
+        Index one past the last token in the input stream.
+    Methods
+    -------
+    fromText(text)
+        Constructs a TokenStream from the lines of a string.
+    fromFile(path)
+        Constructs a TokenStream from the lines of a file.
+    getNextToken():
+        Returns the next token in the input stream, whilst
+        advancing past it.
+    peekNextToken():
+        Returns the next token in the input stream without
+        advancing past it.
+    consumeTokens(n):
+        Advances past n tokens in the input stream.
+    consumeUpToDelim(delim):
+        Advances past tokens until the delimiter is reached.
+    consumeWhitespace():
+        Advances past tokens, until a non-whitespace
+        token is reached.
+    """
+
+    def __init__(self, lines=None, start=0, end=None):
+        """
+        Constructs all the necessary attributes for the TokenStream object.
+
+        Parameters
+        ----------
+        lines : str[], optional
+            Lines making up the input stream.
+        start : int, optional
+            Index of the first line of the stream.
+        end : int, optional
+            Index one past the last line of the stream.
+            Defaults to the end of the lines.
+        """
+        self.lines = lines if lines is not None else []
+        self.cursor = start
+        self.end = len(self.lines) if end is None else end
+
+    @classmethod
+    def fromText(cls, text):
+        """
+        Constructs a TokenStream from the lines of a string.
+
+        Parameters
+        ----------
+        text : str
+            Text to split into lines.
+        Returns
+        -------
+        TokenStream
+        """
+        return cls(io.StringIO(text).readlines())
+
+    @classmethod
+    def fromFile(cls, path):
+        """
+        Constructs a TokenStream from the lines of a file,
+        detecting its encoding.
+
+        Parameters
+        ----------
+        path : str
+            Path to the file.
+        Returns
+        -------
+        TokenStream
+        """
+        return cls.fromText(readText(path))
+
+    def __bool__(self):
+        return self.cursor < self.end
+
+    def __len__(self):
+        return max(self.end - self.cursor, 0)
+
+    def getNextToken(self):
+        """
+        Returns the 'next token' from the stream and advances past it.
+
+        Parameters
+        ----------
+        None
+        Returns
+        -------
+        str | None
+        """
+        if self.cursor < self.end:
+            token = self.lines[self.cursor]
+            self.cursor += 1
+            return token
+        return None
+
+    def peekNextToken(self):
+        """
+        Returns the next token in the input stream, without advancing.
+
+        Parameters
+        ----------
+        None
+        Returns
+        -------
+        str | None
+        """
+        if self.cursor < self.end:
+            return self.lines[self.cursor]
+        return None
+
+    def consumeTokens(self, n):
+        """
+        Consume n tokens from the input stream.
+
+        Parameters
+        ----------
+        n : int
+            Number of tokens to consume.
+        Returns
+        -------
+        None
+        """
+        self.cursor = min(self.cursor + n, self.end)
+
+    def consumeUpToDelim(self, delim):
+        """
+        Consume tokens iteratively, until a delimiter is reached.
+        The token beginning with the delimiter is also consumed.
+
+        Parameters
+        ----------
+        delim : str
+            Delimiter to consume up to.
+        Returns
+        -------
+        None
+        """
+        line = self.getNextToken()
+        while line[0] != delim:
+            line = self.getNextToken()
+
+    def consumeWhitespace(self):
+        """
+        Consume tokens iteratively, while they are whitespace.
+
+        Parameters
+        ----------
+        None
+        Returns
+        -------
+        None
+        """
+        while (
+            self.cursor < self.end
+            and self.lines[self.cursor].isspace()
+        ):
+            self.cursor += 1
@@ -1,7 +1,7 @@
 import os
-import time
 
-from core.gud_file import GudFile
+from core.gud_file import loadGudFile
+from core.output_file_handler import organiser
 
 
 class TweakFactorIterator():
@@ -58,7 +58,7 @@ class TweakFactorIterator():
                             self.gudrunFile.instrument.dataFileType,
                             "gud"
                         )
-                gudFile = GudFile(
+                gudFile = loadGudFile(
                     os.path.join(
                         self.gudrunFile.instrument.GudrunInputFileDir,
                         gudPath
@@ -81,13 +81,19 @@ class TweakFactorIterator():
         ----------
         n : int
             Number of iterations to perform.
+        Raises
+        ------
+        GudrunException
+            If a run of gudrun_dcs didn't succeed.
         """
         # Perform n iterations of tweaking by tweak factor.
         for i in range(n):
 
             # Write out what we currently have,
             # and run gudrun_dcs on that file.
-            self.gudrunFile.process(iterative=True)
-            time.sleep(1)
+            self.gudrunFile.processAndWait(iterative=True)
             self.performIteration(i)
-            self.gudrunFile.iterativeOrganise(f"IterateByTweakFactor_{i+1}")
+            self.gudrunFile.iterativeOrganise(
+                f"IterateByTweakFactor_{i+1}", wait=False
+            )
+        organiser.wait()
@@ -1,7 +1,22 @@
 from collections import deque
+from contextlib import contextmanager
 from itertools import islice
 import os
 import re
+import shutil
+import tempfile
+import threading
+
+# Number of bytes given to chardet when a file is not valid UTF-8.
+ENCODING_SNIFF_SIZE = 64 * 1024
+# Maximum number of (path, mtime) encodings remembered.
+ENCODING_CACHE_SIZE = 256
+
+_encodings = {}
+
+# Umask of the process, read when first needed.
+_umask = None
+_umaskLock = threading.Lock()
 
 
 def spacify(iterable, num_spaces=1):
@@ -162,3 +177,135 @@ def nthreplace(str, old, new, nth):
     if len(tokens) > nth:
         string = f'{old.join(tokens[:nth])}{new}{old.join(tokens[nth:])}'
     return string
+
+
+def detectEncoding(path, data):
+    """
+    Decides the encoding of the contents of a file.
+    A strict UTF-8 decode is tried first, and chardet is only
+    consulted on a bounded prefix of the data if that fails.
+    Results are memoized per (path, mtime).
+
+    Parameters
+    ----------
+    path : str
+        Path the data was read from.
+    data : bytes
+        Contents of the file.
+    Returns
+    -------
+    str
+        Name of the encoding.
+    """
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+    if key in _encodings:
+        return _encodings[key]
+
+    try:
+        data.decode("utf-8")
+        encoding = "utf-8"
+    except UnicodeDecodeError:
+        import chardet
+        encoding = chardet.detect(data[:ENCODING_SNIFF_SIZE])["encoding"]
+        try:
+            data.decode(encoding)
+        except (TypeError, LookupError, UnicodeDecodeError):
+            # The prefix was not representative, so use all of the data.
+            encoding = chardet.detect(data)["encoding"] or "utf-8"
+
+    if len(_encodings) >= ENCODING_CACHE_SIZE:
+        _encodings.clear()
+    _encodings[key] = encoding
+    return encoding
+
+
+def readText(path):
+    """
+    Reads a file from disk once, and returns its decoded contents,
+    with universal newlines applied.
+
+    Parameters
+    ----------
+    path : str
+        Path to the file.
+    Returns
+    -------
+    str
+        Decoded contents of the file.
+    """
+    with open(path, "rb") as fp:
+        data = fp.read()
+    text = data.decode(detectEncoding(path, data))
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
+def umask():
+    """
+    Returns the umask of the process, without changing it where possible.
+    On Linux it is read from /proc. Elsewhere it can only be read by
+    setting it, so it is set and restored just once, under a lock.
+
+    Returns
+    -------
+    int
+        The umask.
+    """
+    global _umask
+    with _umaskLock:
+        if _umask is None:
+            try:
+                with open("/proc/self/status", encoding="ascii") as fp:
+                    for line in fp:
+                        if line.startswith("Umask:"):
+                            _umask = int(line.split()[1], 8)
+                            break
+            except (OSError, ValueError):
+                pass
+        if _umask is None:
+            _umask = os.umask(0o022)
+            os.umask(_umask)
+        return _umask
+
+
+@contextmanager
+def atomicOpen(path, mode="w", encoding="utf-8"):
+    """
+    Opens a temporary file alongside a path for writing, which replaces
+    the path once it has been written and closed successfully.
+    If writing fails, the temporary file is removed, so the path is
+    never left partially written.
+
+    Parameters
+    ----------
+    path : str
+        Path to write to.
+    mode : str, optional
+        Mode to open the temporary file with, "w" or "wb".
+    encoding : str | None, optional
+        Encoding of the file, None for binary modes.
+    Yields
+    ------
+    file
+        The open temporary file.
+    """
+    directory, name = os.path.split(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(
+        dir=directory, prefix=f".{name}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, mode, encoding=encoding) as fp:
+            yield fp
+        # Keep the permissions of the file being replaced,
+        # or else give those open() would have.
+        try:
+            shutil.copymode(path, tmp)
+        except OSError:
+            os.chmod(tmp, 0o666 & ~umask())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
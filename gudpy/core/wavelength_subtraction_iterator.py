@@ -1,8 +1,8 @@
 from pathlib import Path
-import time
 from copy import deepcopy
 
 from core.enums import Scales
+from core.output_file_handler import organiser
 
 
 class WavelengthSubtractionIterator():
@@ -253,10 +253,13 @@ class WavelengthSubtractionIterator():
         for i in range(n):
 
             self.wavelengthIteration(i)
-            self.gudrunFile.process(iterative=True)
-            time.sleep(1)
-            self.gudrunFile.iterativeOrganise(f"WavelengthIteration_{i+1}")
+            self.gudrunFile.processAndWait(iterative=True)
+            self.gudrunFile.iterativeOrganise(
+                f"WavelengthIteration_{i+1}", wait=False
+            )
             self.QIteration(i)
-            self.gudrunFile.process(iterative=True)
-            time.sleep(1)
-            self.gudrunFile.iterativeOrganise(f"QIteration_{i+1}")
+            self.gudrunFile.processAndWait(iterative=True)
+            self.gudrunFile.iterativeOrganise(
+                f"QIteration_{i+1}", wait=False
+            )
+        organiser.wait()
@@ -6,7 +6,7 @@ from PySide6.QtWidgets import QGraphicsTextItem
 from core.sample import Sample
 from core.container import Container
 from gui.widgets.charts.sample_plot_config import SamplePlotConfig
-from gui.widgets.charts.enums import PlotModes, SeriesTypes
+from gui.widgets.charts.enums import PlotModes
 from gui.widgets.charts.enums import Axes
 
 
@@ -34,6 +34,11 @@ class GudPyChart(QChart):
 
         self.label = QGraphicsTextItem("x=,y=", self)
 
+        # Redraw series at the level of detail needed,
+        # whenever the plot is zoomed, scrolled or resized.
+        self.plotAreaChanged.connect(self.updateLevelOfDetail)
+        self.logarithmicXAxis.rangeChanged.connect(self.updateLevelOfDetail)
+
     def connectMarkers(self):
         for marker in self.legend().markers():
             marker.clicked.connect(self.handleMarkerClicked)
@@ -80,6 +85,17 @@ class GudPyChart(QChart):
     def addSample(self, sample):
         self.samples.append(sample)
 
+    def release(self):
+        for plotConfig in self.configs.values():
+            plotConfig.release()
+        self.configs = {}
+
+    def setLoading(self):
+        """
+        Shows the chart as a placeholder, until plotted.
+        """
+        self.setTitle("Loading results...")
+
     def removeAllSeries(self):
         for series in self.series():
             self.removeSeries(series)
@@ -88,6 +104,7 @@ class GudPyChart(QChart):
         if plotMode:
             self.plotMode = plotMode
 
+        self.setTitle("")
         self.removeAllSeries()
         for axis in self.axes():
             self.removeAxis(axis)
@@ -120,7 +137,7 @@ class GudPyChart(QChart):
                         self.addSeries(series)
                     elif isinstance(sample, Container) and plotsContainers:
                         self.addSeries(series)
-                    if not series.points():
+                    if not series.count():
                         series.hide()
             if (
                 len(sample.dataFiles)
@@ -150,6 +167,7 @@ class GudPyChart(QChart):
             YLabel = "G(r)"
         if self.series():
             self.createDefaultAxes()
+            self.axisX().rangeChanged.connect(self.updateLevelOfDetail)
             self.axisX().setTitleText(XLabel)
             self.axisY().setTitleText(YLabel)
 
@@ -166,6 +184,15 @@ class GudPyChart(QChart):
                     series.attachAxis(self.logarithmicYAxis)
 
         self.connectMarkers()
+        self.updateLevelOfDetail()
+
+    def updateLevelOfDetail(self, *_):
+        axes = self.axes(Qt.Horizontal)
+        if not axes or not self.plotArea().width():
+            return
+        xmin, xmax = axes[0].min(), axes[0].max()
+        for plotConfig in self.configs.values():
+            plotConfig.decimate(xmin, xmax, self.plotArea().width())
 
     def toggleVisible(self, seriesType):
         """
@@ -175,21 +202,11 @@ class GudPyChart(QChart):
         series : dict | QLineSeries
             Series(') to toggle visibility on.
         """
-        targetAttr = (
-            {
-                SeriesTypes.MINT01: "mint01Series",
-                SeriesTypes.MDCS01: "mdcs01Series",
-                SeriesTypes.DCSLEVEL: "dcsSeries",
-                SeriesTypes.MGOR01: "mgor01Series",
-                SeriesTypes.MDOR01: "mdor01Series"
-            }[seriesType]
-        )
-
+        # Only series that have been built can be toggled.
         for sample in self.samples:
-            if self.configs[sample].__dict__[targetAttr]:
-                self.configs[sample].__dict__[targetAttr].setVisible(
-                    not self.configs[sample].__dict__[targetAttr].isVisible()
-                )
+            series = self.configs[sample].builtSeries.get(seriesType)
+            if series:
+                series.setVisible(not series.isVisible())
 
     def isVisible(self, seriesType):
         """
@@ -201,21 +218,11 @@ class GudPyChart(QChart):
         """
         # If it's a dict, assume that if any value (series)
         # is visible, then they all should be.
-        targetAttr = (
-            {
-                SeriesTypes.MINT01: "mint01Series",
-                SeriesTypes.MDCS01: "mdcs01Series",
-                SeriesTypes.DCSLEVEL: "dcsSeries",
-                SeriesTypes.MGOR01: "mgor01Series",
-                SeriesTypes.MDOR01: "mdor01Series"
-            }[seriesType]
-        )
-
         return any(
             [
-                self.configs[sample].__dict__[targetAttr].isVisible()
+                self.configs[sample].builtSeries[seriesType].isVisible()
                 for sample in self.samples
-                if self.configs[sample].__dict__[targetAttr]
+                if self.configs[sample].builtSeries.get(seriesType)
             ]
         )
 
@@ -235,11 +242,7 @@ class GudPyChart(QChart):
             )
 
     def toggleSampleVisibility(self, state, sample):
-        self.configs[sample].mint01Series.setVisible(state)
-        self.configs[sample].mdcs01Series.setVisible(state)
-        self.configs[sample].dcsSeries.setVisible(state)
-        self.configs[sample].mdor01Series.setVisible(state)
-        self.configs[sample].mgor01Series.setVisible(state)
+        self.configs[sample].setVisible(state)
 
     def toggleLogarithmicAxis(self, axis):
         if axis == Axes.A:
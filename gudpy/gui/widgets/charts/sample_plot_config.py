@@ -1,153 +1,153 @@
-
-import os
-
+from core.output_versions import outputPath
 from gui.widgets.charts.sample_plot_data import (
     DCSLevel, Mdcs01Plot,
     Mdor01Plot, Mgor01Plot, Mint01Plot
 )
-from gui.widgets.charts.enums import PlotModes
+from gui.widgets.charts.enums import PlotModes, SeriesTypes
 
 
 class SamplePlotConfig():
+    """
+    Class to represent the series plotted for a sample.
+    Series, and the output files behind them, are only loaded the first
+    time a plot mode needs them, and are then reused.
+    """
+
+    PLOTS = {
+        SeriesTypes.MINT01: (Mint01Plot, ".mint01", "mint01"),
+        SeriesTypes.MDCS01: (Mdcs01Plot, ".mdcs01", "mdcs01"),
+        SeriesTypes.MDOR01: (Mdor01Plot, ".mdor01", "mdor01"),
+        SeriesTypes.MGOR01: (Mgor01Plot, ".mgor01", "mgor01")
+    }
+
+    SF = [SeriesTypes.MINT01, SeriesTypes.MDCS01, SeriesTypes.DCSLEVEL]
+    SF_MINT01 = [SeriesTypes.MINT01]
+    SF_MDCS01 = [SeriesTypes.MDCS01, SeriesTypes.DCSLEVEL]
+    RDF = [SeriesTypes.MDOR01, SeriesTypes.MGOR01]
+    SERIES = {
+        PlotModes.SF: SF,
+        PlotModes.SF_MINT01: SF_MINT01,
+        PlotModes.SF_MDCS01: SF_MDCS01,
+        PlotModes.RDF: RDF,
+        PlotModes.SF_CANS: SF,
+        PlotModes.SF_MINT01_CANS: SF_MINT01,
+        PlotModes.SF_MDCS01_CANS: SF_MDCS01,
+        PlotModes.RDF_CANS: RDF
+    }
 
     def __init__(self, sample, inputDir, parent):
         self.sample = sample
         self.inputDir = inputDir
         self.parent = parent
-        self.constructDataSets()
-
-    def constructDataSets(self):
-        if len(self.sample.dataFiles):
-
-            baseFile = self.sample.dataFiles[0]
-            ext = os.path.splitext(self.sample.dataFiles[0])[-1]
-
-            # mint01 dataset.
-            mintPath = baseFile.replace(ext, ".mint01")
-            hasMintData = False
-
-            if os.path.exists(mintPath):
-                hasMintData = True
-            elif os.path.exists(os.path.join(self.inputDir, mintPath)):
-                mintPath = os.path.join(self.inputDir, mintPath)
-                hasMintData = True
-
-            self.mint01DataSet = Mint01Plot(mintPath, hasMintData)
-            self.mint01Series = self.mint01DataSet.toLineSeries(self.parent)
-            if self.mint01Series:
-                self.mint01Series.setName(f"{self.sample.name} mint01")
-
-            # mdcs01 dataset.
-            mdcsPath = baseFile.replace(ext, ".mdcs01")
-            hasMdcsData = False
-
-            if os.path.exists(mdcsPath):
-                hasMdcsData = True
-            elif os.path.exists(os.path.join(self.inputDir, mdcsPath)):
-                mdcsPath = os.path.join(self.inputDir, mdcsPath)
-                hasMdcsData = True
-
-            self.mdcs01DataSet = Mdcs01Plot(mdcsPath, hasMdcsData)
-            self.mdcs01Series = self.mdcs01DataSet.toLineSeries(self.parent)
-            if self.mdcs01Series:
-                self.mdcs01Series.setName(f"{self.sample.name} mdcs01")
-
-            # gud data, for dcs level.
-            gudPath = baseFile.replace(ext, ".gud")
-            hasDCSData = False
-
-            if os.path.exists(gudPath):
-                hasDCSData = True
-            elif os.path.exists(os.path.join(self.inputDir, gudPath)):
-                gudPath = os.path.join(self.inputDir, gudPath)
-                hasDCSData = True
-
-            self.dcsLevel = DCSLevel(gudPath, hasDCSData)
-            if hasMdcsData:
-                self.dcsLevel.extend(
-                    [p.x() for p in self.mdcs01Series.points()]
-                )
-            self.dcsSeries = self.dcsLevel.toLineSeries(self.parent)
-            if self.dcsSeries:
-                self.dcsSeries.setName(
-                    f"{self.sample.name} Expected DCS level"
+        self.visible = True
+        self.dataSets = {}
+        self.builtSeries = {}
+
+    def outputPath(self, ext):
+        """
+        Returns the path to an output file of the sample,
+        and whether it exists.
+        """
+        return outputPath(self.sample, self.inputDir, ext)
+
+    def dataSet(self, seriesType):
+        if seriesType not in self.dataSets:
+            if seriesType == SeriesTypes.DCSLEVEL:
+                dcsLevel = DCSLevel(*self.outputPath(".gud"))
+                mdcs01DataSet = self.dataSet(SeriesTypes.MDCS01)
+                if mdcs01DataSet.dataSet:
+                    dcsLevel.extend(mdcs01DataSet.dataSet.x)
+                self.dataSets[seriesType] = dcsLevel
+            else:
+                plot, ext, _ = self.PLOTS[seriesType]
+                self.dataSets[seriesType] = plot(*self.outputPath(ext))
+        return self.dataSets[seriesType]
+
+    def series(self, seriesType):
+        """
+        Returns the series of the given type,
+        building it if it hasn't been built yet.
+        """
+        if not len(self.sample.dataFiles):
+            return None
+        if seriesType not in self.builtSeries:
+            series = self.dataSet(seriesType).toLineSeries(self.parent)
+            if seriesType == SeriesTypes.DCSLEVEL:
+                series.setName(f"{self.sample.name} Expected DCS level")
+            else:
+                series.setName(
+                    f"{self.sample.name} {self.PLOTS[seriesType][2]}"
                 )
-
-            # mdor01 dataset.
-            mdorPath = baseFile.replace(ext, ".mdor01")
-            hasMdorData = False
-
-            if os.path.exists(mdorPath):
-                hasMdorData = True
-            elif os.path.exists(os.path.join(self.inputDir, mdorPath)):
-                mdorPath = os.path.join(self.inputDir, mdorPath)
-                hasMdorData = True
-
-            self.mdor01DataSet = Mdor01Plot(mdorPath, hasMdorData)
-            self.mdor01Series = self.mdor01DataSet.toLineSeries(self.parent)
-            if self.mdor01Series:
-                self.mdor01Series.setName(f"{self.sample.name} mdor01")
-
-            # mgor01 dataset.
-            mgorPath = baseFile.replace(ext, ".mgor01")
-            hasMgorData = False
-
-            if os.path.exists(mgorPath):
-                hasMgorData = True
-            elif os.path.exists(os.path.join(self.inputDir, mgorPath)):
-                mgorPath = os.path.join(self.inputDir, mgorPath)
-                hasMgorData = True
-
-            self.mgor01DataSet = Mgor01Plot(mgorPath, hasMgorData)
-            self.mgor01Series = self.mgor01DataSet.toLineSeries(self.parent)
-            if self.mgor01Series:
-                self.mgor01Series.setName(f"{self.sample.name} mgor01")
-
-    # return all series
-    def series(self):
-        return [
-            self.mint01Series,
-            self.mdcs01Series,
-            self.dcsSeries,
-            self.mdor01Series,
-            self.mgor01Series
-        ]
-
-    def SF(self):
-        return [
-            self.mint01Series,
-            self.mdcs01Series,
-            self.dcsSeries
-        ]
-
-    def SF_MINT01(self):
-        return [
-            self.mint01Series
-        ]
-
-    def SF_MDCS01(self):
-        return [
-            self.mdcs01Series,
-            self.dcsSeries
-        ]
-
-    def RDF(self):
-        return [
-            self.mdor01Series,
-            self.mgor01Series
-        ]
+            series.setVisible(self.visible)
+            self.builtSeries[seriesType] = series
+        return self.builtSeries[seriesType]
+
+    @property
+    def mint01Series(self):
+        return self.series(SeriesTypes.MINT01)
+
+    @property
+    def mdcs01Series(self):
+        return self.series(SeriesTypes.MDCS01)
+
+    @property
+    def dcsSeries(self):
+        return self.series(SeriesTypes.DCSLEVEL)
+
+    @property
+    def mdor01Series(self):
+        return self.series(SeriesTypes.MDOR01)
+
+    @property
+    def mgor01Series(self):
+        return self.series(SeriesTypes.MGOR01)
+
+    def setVisible(self, state):
+        """
+        Sets the visibility of the series built so far,
+        and of those built later.
+        """
+        self.visible = state
+        for series in self.builtSeries.values():
+            series.setVisible(state)
+
+    def decimate(self, xmin, xmax, width):
+        """
+        Redraws the series built so far, at the level of detail needed
+        to show the range [xmin, xmax] across a plot width in pixels.
+        """
+        for seriesType in self.builtSeries:
+            if seriesType != SeriesTypes.DCSLEVEL:
+                self.dataSets[seriesType].decimate(xmin, xmax, width)
+
+    def release(self):
+        """
+        Releases the datasets of the sample,
+        so that they may be evicted from the datasetCache.
+        """
+        for seriesType, dataSet in self.dataSets.items():
+            if seriesType != SeriesTypes.DCSLEVEL:
+                dataSet.release()
 
     def plotData(self, plotMode):
         if len(self.sample.dataFiles):
-            return {
-                PlotModes.SF: self.SF,
-                PlotModes.SF_MINT01: self.SF_MINT01,
-                PlotModes.SF_MDCS01: self.SF_MDCS01,
-                PlotModes.RDF: self.RDF,
-                PlotModes.SF_CANS: self.SF,
-                PlotModes.SF_MINT01_CANS: self.SF_MINT01,
-                PlotModes.SF_MDCS01_CANS: self.SF_MDCS01,
-                PlotModes.RDF_CANS: self.RDF
-            }[plotMode]()
+            return [
+                self.series(seriesType)
+                for seriesType in self.SERIES[plotMode]
+            ]
         else:
             return []
+
+    @classmethod
+    def outputs(cls, plotMode):
+        """
+        Returns the extensions of the output files needed
+        to plot in a plot mode.
+        """
+        extensions = []
+        for seriesType in cls.SERIES[plotMode]:
+            if seriesType == SeriesTypes.DCSLEVEL:
+                extensions.extend([".gud", ".mdcs01"])
+            else:
+                extensions.append(cls.PLOTS[seriesType][1])
+        return list(dict.fromkeys(extensions))
@@ -1,21 +1,13 @@
 from abc import abstractmethod
+import numpy as np
 from PySide6.QtCharts import QLineSeries
-from PySide6.QtCore import QPoint, QPointF
 
-from core.gud_file import GudFile
+from core.dataset_cache import datasetCache
+from core.level_of_detail import LevelOfDetail
+from core.gud_file import loadGudFile
 
-
-class Point():
-    def __init__(self, x, y, err):
-        self.x = x
-        self.y = y
-        self.err = err
-
-    def toQPointF(self):
-        return QPointF(self.x, self.y)
-
-    def toQPoint(self):
-        return QPoint(self.x, self.y)
+# Plot width, in pixels, assumed until a series is first shown.
+INITIAL_PLOT_WIDTH = 1000
 
 
 class GudPyPlot():
@@ -28,31 +20,44 @@ class GudPyPlot():
 
     @abstractmethod
     def constructDataSet(self, path):
-        dataSet = []
-        with open(path, "r", encoding="utf-8") as fp:
-            for dataLine in fp.readlines():
-
-                # Ignore commented lines.
-                if dataLine[0] == "#":
-                    continue
+        return datasetCache.acquire(path)
 
-                x, y, err, *__ = [float(n) for n in dataLine.split()]
-                dataSet.append(Point(x, y, err))
-        return dataSet
-
-    def toQPointList(self):
-        return [x.toQPoint() for x in self.dataSet] if self.dataSet else None
-
-    def toQPointFList(self):
-        return [x.toQPointF() for x in self.dataSet] if self.dataSet else None
+    def release(self):
+        if self.dataSet is not None:
+            datasetCache.release(self.dataSet)
+            self.dataSet = None
 
     def toLineSeries(self, parent):
         self.series = QLineSeries(parent)
-        points = self.toQPointFList()
-        if points:
-            self.series.append(points)
+        self.levelOfDetail = None
+        self.shown = None
+        if self.dataSet:
+            # Large series are drawn downsampled, at a level of detail
+            # picked from the visible range, see decimate.
+            self.levelOfDetail = LevelOfDetail(
+                self.dataSet.x, self.dataSet.y
+            )
+            x = self.dataSet.x
+            self.decimate(x[0], x[-1], INITIAL_PLOT_WIDTH)
         return self.series
 
+    def decimate(self, xmin, xmax, width):
+        """
+        Redraws the series, at the level of detail needed to show
+        the range [xmin, xmax] across a plot width in pixels.
+        """
+        if not self.levelOfDetail:
+            return
+        window = self.levelOfDetail.window(xmin, xmax, width)
+        if window == self.shown:
+            return
+        self.shown = window
+        level, lo, hi = window
+        x, y = self.levelOfDetail.level(level)
+        # Hand the columns to the series as arrays,
+        # rather than point by point.
+        self.series.replaceNp(x[lo:hi], y[lo:hi])
+
 
 class Mint01Plot(GudPyPlot):
 
@@ -104,15 +109,18 @@ class DCSLevel:
 
     @abstractmethod
     def extractDCSLevel(self, path):
-        gudFile = GudFile(path)
+        gudFile = loadGudFile(path)
         return gudFile.expectedDCS
 
     def extend(self, xAxis):
-        if self.dcsLevel:
-            self.data = [QPointF(x, self.dcsLevel) for x in xAxis]
+        if self.dcsLevel and len(xAxis):
+            # The level is constant, so only its ends need drawing.
+            self.data = np.asarray(xAxis, dtype=np.float64)[[0, -1]]
 
     def toLineSeries(self, parent):
         self.series = QLineSeries(parent)
-        if self.data:
-            self.series.append(self.data)
+        if len(self.data):
+            self.series.appendNp(
+                self.data, np.full_like(self.data, self.dcsLevel)
+            )
         return self.series
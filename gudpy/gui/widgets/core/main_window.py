@@ -1,13 +1,15 @@
 from abc import abstractmethod
 import os
 import sys
-import time
 import math
+import time
 import traceback
 from queue import Queue
 from collections.abc import Sequence
 import re
-from PySide6.QtCore import QFile, QFileInfo, QTimer, QThread, QProcess
+from PySide6.QtCore import (
+    QFile, QFileInfo, QFileSystemWatcher, QTimer, QThread, QProcess
+)
 from PySide6.QtGui import QPainter, QIcon
 from PySide6.QtUiTools import QUiLoader
 from PySide6.QtWidgets import (
@@ -78,11 +80,12 @@ from gui.widgets.tables.resonance_table import ResonanceTable
 from gui.widgets.tables.components_table import ComponentsList
 from gui.widgets.core.exponential_spinbox import ExponentialSpinBox
 from gui.widgets.charts.chart import GudPyChart
+from gui.widgets.charts.sample_plot_config import SamplePlotConfig
 from gui.widgets.charts.chartview import GudPyChartView
 from gui.widgets.charts.beam_plot import BeamChart
 from gui.widgets.charts.enums import PlotModes, SPLIT_PLOTS
 
-from core.enums import Format, Geometry
+from core.enums import Geometry
 from gui.widgets.slots.instrument_slots import InstrumentSlots
 from gui.widgets.slots.beam_slots import BeamSlots
 from gui.widgets.slots.component_slots import ComponentSlots
@@ -93,7 +96,7 @@ from gui.widgets.slots.sample_slots import SampleSlots
 from gui.widgets.slots.output_slots import OutputSlots
 from gui.widgets.resources import resources_rc  # noqa
 from core.file_library import GudPyFileLibrary
-from core.gudrun_file import GudrunFile
+from core.gudrun_file import GudrunFile, formatOf
 from core.exception import ParserException
 from core import config
 from core.tweak_factor_iterator import TweakFactorIterator
@@ -102,9 +105,13 @@ from core.wavelength_subtraction_iterator import (
 )
 from core.run_containers_as_samples import RunContainersAsSamples
 from core.run_individual_files import RunIndividualFiles
-from core.gud_file import GudFile
+from core.gud_file import GudFile, loadGudFile
+from core.output_versions import OutputVersions, outputPath
+from core.output_file_handler import OutputFileHandler, organiser
+from core.result_loader import ResultLoader
+from core.column_file import ColumnFile
 from core.utils import breplace, nthint
-from gui.widgets.core.worker import CompositionWorker
+from gui.widgets.core.worker import CompositionWorker, ResultsWorker
 
 
 class GudPyMainWindow(QMainWindow):
@@ -152,6 +159,14 @@ class GudPyMainWindow(QMainWindow):
         self.iterator = None
         self.queue = Queue()
         self.results = {}
+        self.outputVersions = OutputVersions()
+        # Results are loaded in the background,
+        # samples are pending until their results are plotted.
+        self.resultLoader = ResultLoader()
+        self.resultsWorker = ResultsWorker()
+        self.resultsWorker.loaded.connect(self.resultLoaded)
+        self.pendingResults = {}
+        self.allPlotsStale = False
         self.allPlots = []
         self.plotModes = {}
         self.proc = None
@@ -168,6 +183,25 @@ class GudPyMainWindow(QMainWindow):
         self.timer.setSingleShot(True)
         self.timer.timeout.connect(self.autosave)
 
+        # Outputs written by runs outside of this window, such as
+        # headless runs, are picked up when config.WATCH_OUTPUTS is set.
+        self.outputWatcher = QFileSystemWatcher(self)
+        self.outputWatcher.directoryChanged.connect(self.outputsChanged)
+        self.outputWatcher.fileChanged.connect(self.outputsChanged)
+        self.refreshTimer = QTimer(self)
+        self.refreshTimer.setSingleShot(True)
+        self.refreshTimer.setInterval(config.WATCH_OUTPUTS_DELAY)
+        self.refreshTimer.timeout.connect(self.refreshResults)
+
+        # The outputs of each iteration are polled for, once gudrun_dcs
+        # exits, so that waiting for them never blocks the event loop.
+        self.outputsTimer = QTimer(self)
+        self.outputsTimer.setInterval(
+            int(config.OUTPUT_POLL_INTERVAL * 1000)
+        )
+        self.outputsTimer.timeout.connect(self.pollOutputs)
+        self.pendingOutputs = None
+
     def initComponents(self):
         """
         Loads the UI file for the GudPyMainWindow.
@@ -588,7 +622,7 @@ class GudPyMainWindow(QMainWindow):
             "Select Input file for GudPy",
             ".",
             "YAML (*.yaml);;Gudrun Compatible "
-            "(*.txt);;Sample Parameters (*.sample)"
+            "(*.txt);;GudPy Binary (*.gudpyb);;Sample Parameters (*.sample)"
         )
         if filename:
             try:
@@ -619,12 +653,13 @@ class GudPyMainWindow(QMainWindow):
             self,
             "Save input file as..", ".",
             "YAML (*.yaml);;Gudrun Compatible (*.txt)"
+            ";;GudPy Binary (*.gudpyb)"
         )
         if filename:
             ext = re.search(r'\((.+?)\)', filter).group(1).replace('*', '')
-            fmt = Format.TXT if ext == ".txt" else Format.YAML
             if filter and sys.platform.startswith("linux"):
                 filename += ext
+            fmt = formatOf(filename)
             if os.path.basename(filename) == "txt":
                 QMessageBox.warning(
                     self.mainWidget,
@@ -768,7 +803,12 @@ class GudPyMainWindow(QMainWindow):
                 self.mainWidget.dcsLabel.setText(
                     "DCS Level"
                 )
-                self.mainWidget.resultLabel.setText("Error")
+                self.mainWidget.resultLabel.setText(
+                    "Loading results..."
+                    if self.mainWidget.objectTree.currentObject()
+                    in self.pendingResults
+                    else "Error"
+                )
                 self.mainWidget.resultLabel.setStyleSheet(
                     ""
                 )
@@ -852,45 +892,161 @@ class GudPyMainWindow(QMainWindow):
                 )
 
     def updateSamples(self):
+        """
+        Rebuilds the results of the samples whose outputs changed
+        since their results were last built, keeping the rest.
+
+        Returns
+        -------
+        bool
+            Whether any results were rebuilt or removed.
+        """
         samples = [
             *self.mainWidget.objectTree.getSamples(),
             *self.mainWidget.objectTree.getContainers()
         ]
+        inputDir = self.gudrunFile.instrument.GudrunInputFileDir
+        changed = False
+
+        # Drop the results of samples that no longer exist,
+        # releasing their datasets.
+        current = {id(sample) for sample in samples}
+        for sample in list(self.results.keys()):
+            if id(sample) not in current:
+                topChart, bottomChart, _ = self.results.pop(sample)
+                topChart.release()
+                bottomChart.release()
+                self.outputVersions.forget(sample)
+                changed = True
+
         for sample in samples:
-            topChart = GudPyChart(
-                self.gudrunFile
-            )
-            topChart.addSample(sample)
-            bottomChart = GudPyChart(
-                self.gudrunFile
-            )
-            bottomChart.addSample(sample)
-            if sample not in self.plotModes.keys():
-                plotMode = (
-                    PlotModes.SF if isinstance(sample, Sample)
-                    else PlotModes.SF_CANS
-                )
-                self.plotModes[sample] = plotMode
-            plotMode = self.plotModes[sample]
-            if self.isPlotModeSplittable(plotMode):
-                top, bottom = self.splitPlotMode(plotMode)
-                topChart.plot(top)
-                bottomChart.plot(bottom)
-            else:
-                topChart.plot(plotMode)
-            path = None
-            if len(sample.dataFiles):
-                path = breplace(
-                    sample.dataFiles[0],
-                    self.gudrunFile.instrument.dataFileType,
-                    "gud"
-                )
-                if not os.path.exists(path):
-                    path = os.path.join(
-                        self.gudrunFile.instrument.GudrunInputFileDir, path
+            if (
+                sample in self.results
+                and not self.outputVersions.changed(sample, inputDir)
+            ):
+                continue
+            changed = True
+            if sample in self.results:
+                topChart, bottomChart, _ = self.results[sample]
+                topChart.release()
+                bottomChart.release()
+            # Record the versions before loading, so that outputs
+            # written whilst loading are picked up by the next refresh.
+            self.outputVersions.record(sample, inputDir)
+            self.results[sample] = self.buildResult(sample)
+            self.loadResult(sample)
+        return changed
+
+    def buildResult(self, sample):
+        """
+        Builds placeholder charts for the results of a sample,
+        which are plotted once its outputs are loaded.
+        """
+        topChart = GudPyChart(
+            self.gudrunFile
+        )
+        topChart.addSample(sample)
+        topChart.setLoading()
+        bottomChart = GudPyChart(
+            self.gudrunFile
+        )
+        bottomChart.addSample(sample)
+        bottomChart.setLoading()
+        if sample not in self.plotModes.keys():
+            plotMode = (
+                PlotModes.SF if isinstance(sample, Sample)
+                else PlotModes.SF_CANS
+            )
+            self.plotModes[sample] = plotMode
+        return [topChart, bottomChart, None]
+
+    def plotModesOf(self, sample):
+        plotMode = self.plotModes[sample]
+        if self.isPlotModeSplittable(plotMode):
+            return self.splitPlotMode(plotMode)
+        return [plotMode]
+
+    def loadResult(self, sample):
+        """
+        Loads the outputs a sample's results need, in the background.
+        """
+        inputDir = self.gudrunFile.instrument.GudrunInputFileDir
+        paths = []
+        if len(sample.dataFiles):
+            extensions = [".gud"] + [
+                ext for plotMode in self.plotModesOf(sample)
+                for ext in SamplePlotConfig.outputs(plotMode)
+            ]
+            for ext in dict.fromkeys(extensions):
+                path, exists = outputPath(sample, inputDir, ext)
+                if exists:
+                    paths.append(
+                        (path, GudFile if ext == ".gud" else ColumnFile)
                     )
-            gf = GudFile(path) if path and os.path.exists(path) else None
-            self.results[sample] = [topChart, bottomChart, gf]
+        self.pendingResults[sample] = True
+        self.resultLoader.submit(
+            sample, paths, self.resultsWorker.emitLoaded
+        )
+
+    def resultLoaded(self, sample, datasets, generation):
+        """
+        Plots the results of a sample, once its outputs are loaded.
+        """
+        if (
+            generation != self.resultLoader.generation
+            or sample not in self.pendingResults
+        ):
+            return
+        del self.pendingResults[sample]
+        try:
+            self.plotResult(sample)
+        except ParserException:
+            # The outputs are incomplete, so will be rewritten,
+            # show them when they are.
+            self.outputVersions.forget(sample)
+        if sample is self.mainWidget.objectTree.currentObject():
+            self.focusResult()
+        if not self.pendingResults and self.allPlotsStale:
+            self.updateAllSamples()
+
+    def cancelResults(self):
+        """
+        Abandons loading results, leaving the samples
+        to be loaded by the next refresh.
+        """
+        self.resultLoader.cancel()
+        for sample in self.pendingResults:
+            self.outputVersions.forget(sample)
+        self.pendingResults = {}
+
+    def plotResult(self, sample):
+        """
+        Plots the charts, and finds the GudFile, of the results of a sample.
+        Its outputs have been loaded into the datasetCache.
+        """
+        topChart, bottomChart, _ = self.results[sample]
+        plotModes = self.plotModesOf(sample)
+        topChart.plot(plotModes[0])
+        if len(plotModes) > 1:
+            bottomChart.plot(plotModes[1])
+        else:
+            bottomChart.setTitle("")
+        path = None
+        if len(sample.dataFiles):
+            path = breplace(
+                sample.dataFiles[0],
+                self.gudrunFile.instrument.dataFileType,
+                "gud"
+            )
+            if not os.path.exists(path):
+                path = os.path.join(
+                    self.gudrunFile.instrument.GudrunInputFileDir, path
+                )
+        gf = (
+            loadGudFile(path)
+            if path and os.path.exists(path) else None
+        )
+        self.results[sample] = [topChart, bottomChart, gf]
 
     def updateAllSamples(self):
 
@@ -898,6 +1054,8 @@ class GudPyMainWindow(QMainWindow):
             *self.mainWidget.objectTree.getSamples(),
             *self.mainWidget.objectTree.getContainers()
         ]
+        for chart in self.allPlots:
+            chart.release()
         if len(self.allPlots):
             allTopChart = GudPyChart(
                 self.gudrunFile
@@ -927,14 +1085,58 @@ class GudPyMainWindow(QMainWindow):
             )
             allBottomChart.addSamples(samples)
         self.allPlots = [allTopChart, allBottomChart]
+        self.allPlotsStale = False
         self.mainWidget.allSampleTopPlot.setChart(allTopChart)
         self.mainWidget.allSampleBottomPlot.setChart(allBottomChart)
 
     def updateResults(self):
 
-        self.updateSamples()
-        self.updateAllSamples()
+        # The plots of all samples only need rebuilding
+        # if the results of any sample did, and are rebuilt
+        # once every sample's results have loaded.
+        if self.updateSamples() or not self.allPlots:
+            self.allPlotsStale = True
+        if self.allPlotsStale and not self.pendingResults:
+            self.updateAllSamples()
         self.focusResult()
+        self.watchOutputs()
+
+    def watchOutputs(self):
+        """
+        Watches the input file directory and the outputs of the samples
+        for changes, if config.WATCH_OUTPUTS is set.
+        """
+        watched = set(
+            self.outputWatcher.files() + self.outputWatcher.directories()
+        )
+        paths = set()
+        if config.WATCH_OUTPUTS and self.gudrunFile:
+            inputDir = self.gudrunFile.instrument.GudrunInputFileDir
+            if os.path.isdir(inputDir):
+                paths.add(os.path.abspath(inputDir))
+            paths.update(
+                self.outputVersions.paths(self.results.keys(), inputDir)
+            )
+        if watched - paths:
+            self.outputWatcher.removePaths(list(watched - paths))
+        if paths - watched:
+            self.outputWatcher.addPaths(list(paths - watched))
+
+    def outputsChanged(self, _):
+        # Outputs are written in bursts, so wait for a quiet period.
+        # Runs started from this window refresh once they finish.
+        if config.WATCH_OUTPUTS and not self.proc:
+            self.refreshTimer.start()
+
+    def refreshResults(self):
+        if not self.gudrunFile or self.proc:
+            return
+        try:
+            self.updateResults()
+        except ParserException:
+            # Outputs may still be being written,
+            # in which case they will change again.
+            pass
 
     def updateComponents(self):
         """
@@ -961,6 +1163,8 @@ class GudPyMainWindow(QMainWindow):
         sys.exit(0)
 
     def makeProc(self, cmd, slot, finished=None, func=None, args=None):
+        # The run will rewrite the outputs being loaded.
+        self.cancelResults()
         self.proc = cmd
         self.proc.readyReadStandardOutput.connect(slot)
         self.proc.started.connect(self.procStarted)
@@ -993,8 +1197,6 @@ class GudPyMainWindow(QMainWindow):
         elif not purge:
             self.setControlsEnabled(True)
         else:
-            os.chdir(self.gudrunFile.instrument.GudrunInputFileDir)
-            self.gudrunFile.purgeFile.write_out()
             self.makeProc(purge, self.progressPurge, func=func, args=args)
 
     def runGudrun_(self):
@@ -1335,31 +1537,72 @@ class GudPyMainWindow(QMainWindow):
             self.nextCompositionIteration()
 
     def nextIteration(self):
+        # Stopped, and already finished.
+        if not self.proc:
+            return
         if self.error:
             self.procFinished()
             return
+        if (
+            self.proc.exitStatus() != QProcess.NormalExit
+            or self.proc.exitCode()
+        ):
+            self.error = (
+                f"gudrun_dcs failed, with exit code {self.proc.exitCode()}."
+                f"\n{self.output}"
+            )
+            self.procFinished()
+            return
+        # gudrun_dcs has exited, but its outputs may not be flushed yet.
+        self.outputHandler = OutputFileHandler(self.gudrunFile)
+        self.pendingOutputs = self.outputHandler.pendingOutputs()
+        self.previousOutputs = {}
+        self.outputsDeadline = time.monotonic() + config.OUTPUT_WAIT_TIMEOUT
+        self.outputsTimer.start()
+        self.pollOutputs()
+
+    def pollOutputs(self):
+        if self.pendingOutputs is None:
+            self.outputsTimer.stop()
+            return
+        self.pendingOutputs = self.outputHandler.poll(
+            self.pendingOutputs, self.previousOutputs
+        )
+        if self.pendingOutputs and time.monotonic() < self.outputsDeadline:
+            return
+        self.outputsTimer.stop()
+        pending, self.pendingOutputs = self.pendingOutputs, None
+        if pending:
+            self.error = (
+                "The outputs of gudrun_dcs weren't completely written:\n"
+                + "\n".join(sorted(path for path, _ in pending))
+            )
+            self.procFinished()
+            return
+        self.iterationOutputsWritten()
+
+    def iterationOutputsWritten(self):
         if isinstance(self.iterator, TweakFactorIterator):
             self.gudrunFile.iterativeOrganise(
-                f"IterateByTweakFactor_{self.currentIteration+1}"
+                f"IterateByTweakFactor_{self.currentIteration+1}", wait=False
             )
         elif isinstance(self.iterator, ThicknessIterator):
             self.gudrunFile.iterativeOrganise(
-                f"IterateByThickness_{self.currentIteration+1}"
+                f"IterateByThickness_{self.currentIteration+1}", wait=False
             )
         elif isinstance(self.iterator, RadiusIterator):
             self.gudrunFile.iterativeOrganise(
-                f"IterateByRadius_{self.currentIteration+1}"
+                f"IterateByRadius_{self.currentIteration+1}", wait=False
             )
         elif isinstance(self.iterator, DensityIterator):
             self.gudrunFile.iterativeOrganise(
-                f"IterateByDensity_{self.currentIteration+1}"
+                f"IterateByDensity_{self.currentIteration+1}", wait=False
             )
         if isinstance(
             self.iterator, (
                 TweakFactorIterator, SingleParamIterator
             )
         ):
-            time.sleep(1)
             self.iterator.performIteration(self.currentIteration)
             self.gudrunFile.write_out()
             self.outputIterations[self.currentIteration + 1] = self.output
@@ -1367,12 +1610,15 @@ class GudPyMainWindow(QMainWindow):
         elif isinstance(self.iterator, WavelengthSubtractionIterator):
             if (self.currentIteration + 1) % 2 == 0:
                 self.iterator.gudrunFile.iterativeOrganise(
-                    f"QIteration_{(self.currentIteration // 2) + 1}"
+                    f"QIteration_{(self.currentIteration // 2) + 1}",
+                    wait=False
                 )
                 self.outputIterations[self.currentIteration + 1] = self.output
             else:
                 self.iterator.gudrunFile.iterativeOrganise(
-                    f"WavelengthIteration_{(self.currentIteration // 2) + 1}")
+                    f"WavelengthIteration_{(self.currentIteration // 2) + 1}",
+                    wait=False
+                )
                 self.outputIterations[self.currentIteration + 1] = self.output
         if not self.queue.empty():
             self.currentIteration += 1
@@ -1683,9 +1929,9 @@ class GudPyMainWindow(QMainWindow):
 
     def runGudrunFinished(self, gudrunFile=None):
         if gudrunFile:
-            gudrunFile.naiveOrganise()
+            gudrunFile.naiveOrganise(wait=False)
         else:
-            self.gudrunFile.naiveOrganise()
+            self.gudrunFile.naiveOrganise(wait=False)
         self.procFinished()
 
     def procFinished(self):
@@ -1711,6 +1957,9 @@ class GudPyMainWindow(QMainWindow):
             self.error = ""
             self.queue = Queue()
         if self.queue.empty():
+            # Outputs are organised in the background whilst runs
+            # are queued, the results shown are of them all organised.
+            organiser.wait()
             if self.warning:
                 QMessageBox.warning(
                     self.mainWidget, "GudPy Warning",
@@ -1740,6 +1989,10 @@ class GudPyMainWindow(QMainWindow):
 
     def stopProc(self):
         self.queue = Queue()
+        if self.pendingOutputs is not None:
+            self.pendingOutputs = None
+            self.outputsTimer.stop()
+            self.procFinished()
         if self.proc:
             if self.proc.state() == QProcess.Running:
                 self.proc.kill()
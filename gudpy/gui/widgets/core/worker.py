@@ -2,7 +2,7 @@ import os
 from copy import deepcopy
 from PySide6.QtCore import QObject, Signal, QThread
 
-from core.gud_file import GudFile
+from core.gud_file import loadGudFile
 from core.sample import Sample
 from core.composition_iterator import gss
 
@@ -113,7 +113,7 @@ class CompositionWorker(QObject):
             "gud"
         )
 
-        gudFile = GudFile(
+        gudFile = loadGudFile(
             os.path.join(
                 gudrunFile.instrument.GudrunInputFileDir, gudPath
             )
@@ -124,3 +124,16 @@ class CompositionWorker(QObject):
             return 0
         else:
             return (gudFile.expectedDCS-gudFile.averageLevelMergedDCS)**2
+
+
+class ResultsWorker(QObject):
+    """
+    Hands results loaded by a ResultLoader, on its threads,
+    back to the GUI thread.
+    """
+    loaded = Signal(object, object, int)
+
+    def emitLoaded(self, sample, datasets, generation):
+        # Called from the loading thread, the signal is
+        # delivered to receivers in the GUI thread.
+        self.loaded.emit(sample, datasets, generation)
@@ -0,0 +1,212 @@
+import importlib.util
+import io
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from contextlib import redirect_stderr, redirect_stdout
+from unittest import TestCase, skipIf
+from unittest.mock import patch
+
+from core.cli import main, parser
+from core.gudrun_file import GudrunFile
+from core.dataset_cache import datasetCache
+from core import config
+from test.test_load_gud_file import GUD_FILE
+
+
+# Stands in for gudrun_dcs: writes a complete .gud and .mint01
+# for the first data file of each sample in the input file.
+STUB = """#!{python}
+import re
+import sys
+
+runs = []
+with open(sys.argv[1], encoding="utf-8") as fp:
+    for line in fp:
+        match = re.match(r"(\\S+)\\.raw\\s+.*data files", line)
+        if match:
+            runs.append(match.group(1))
+for run in runs:
+    with open(run + ".gud", "w", encoding="utf-8") as fp:
+        fp.write({gud!r}.replace("NAME", run))
+    with open(run + ".mint01", "w", encoding="utf-8") as fp:
+        fp.write("  0.1  1.0\\n")
+print("ran " + " ".join(runs))
+"""
+
+
+class TestCLI(TestCase):
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = os.path.join(self.tmp.name, "input")
+        shutil.copytree("test/TestData/NIMROD-water", self.dir)
+        self.path = os.path.join(self.dir, "water.txt")
+        self.stub = os.path.join(self.tmp.name, "gudrun_dcs")
+        with open(self.stub, "w", encoding="utf-8") as fp:
+            fp.write(
+                STUB.format(
+                    python=sys.executable,
+                    gud=GUD_FILE.format(
+                        name="NAME", expected=4.0, level=3.0, tweak=1.33333,
+                        result="This DCS level is   75.0% of expected level."
+                    )
+                )
+            )
+        os.chmod(self.stub, 0o755)
+        self.patches = [
+            patch.object(
+                config, "runCacheDir", os.path.join(self.tmp.name, "cache")
+            )
+        ]
+        for p in self.patches:
+            p.start()
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        for p in self.patches:
+            p.stop()
+        datasetCache.clear()
+        self.tmp.cleanup()
+        return super().tearDown()
+
+    def main(self, *argv):
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            status = main(list(argv))
+        return status, stdout.getvalue(), stderr.getvalue()
+
+    def testDoesNotImportQt(self):
+
+        result = subprocess.run(
+            [
+                sys.executable, "-c",
+                "import sys, core.cli; print('PySide6' in sys.modules)"
+            ],
+            capture_output=True, text=True, check=True
+        )
+        self.assertEqual(result.stdout.strip(), "False")
+
+    def testEntryPointRoutesOnlyCommands(self):
+
+        spec = importlib.util.spec_from_file_location(
+            "gudpy_main", "__main__.py"
+        )
+        entryPoint = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(entryPoint)
+        [commands] = [
+            action.choices for action in parser()._actions
+            if action.dest == "command"
+        ]
+        self.assertEqual(
+            set(entryPoint.COMMANDS),
+            {*commands, "-h", "--help", "--version"}
+        )
+        # Options of Qt are left to the GUI.
+        self.assertNotIn("-style", entryPoint.COMMANDS)
+
+    @skipIf(os.name == "nt", "The stub gudrun_dcs is a POSIX script.")
+    def testRun(self):
+
+        with patch("core.gudrun_file.resolve", lambda *_: self.stub):
+            status, stdout, _ = self.main("run", self.path)
+        self.assertEqual(status, 0)
+        self.assertIn("ran", stdout)
+        sample = GudrunFile(self.path).sampleBackgrounds[0].samples[0]
+        run = os.path.splitext(sample.dataFiles[0])[0]
+        self.assertTrue(
+            os.path.exists(
+                os.path.join(self.dir, run, "outputs", f"{run}.gud")
+            )
+        )
+
+    def testMissingBinary(self):
+
+        with patch(
+            "core.gudrun_file.resolve",
+            lambda *_: os.path.join(self.tmp.name, "missing")
+        ):
+            status, _, stderr = self.main("run", self.path)
+        self.assertEqual(status, 1)
+        self.assertIn("gudrun_dcs couldn't be found", stderr)
+
+    def testInvalidPath(self):
+
+        status, _, stderr = self.main(
+            "run", os.path.join(self.dir, "missing.txt")
+        )
+        self.assertEqual(status, 1)
+        self.assertTrue(stderr)
+
+    def testPurge(self):
+
+        calls = []
+
+        def run(args, **kwargs):
+            calls.append((args, kwargs.get("cwd")))
+            return subprocess.CompletedProcess(args, 0, "purged", "")
+
+        with patch("subprocess.run", run):
+            status, stdout, _ = self.main(
+                "purge", self.path, "--standard-deviation", "5", "7"
+            )
+        self.assertEqual(status, 0)
+        self.assertEqual(stdout, "purged")
+        self.assertEqual(calls[0][1], self.dir)
+        with open(
+            os.path.join(self.dir, "purge_det.dat"), encoding="utf-8"
+        ) as fp:
+            self.assertIn("5  7", fp.read())
+
+    @skipIf(os.name == "nt", "The stub gudrun_dcs is a POSIX script.")
+    def testIterateTweakFactor(self):
+
+        output = os.path.join(self.tmp.name, "iterated.txt")
+        with patch("core.gudrun_file.resolve", lambda *_: self.stub):
+            status, _, _ = self.main(
+                "iterate", "tweak", self.path, "-n", "2", "-o", output
+            )
+        self.assertEqual(status, 0)
+        for i in (1, 2):
+            self.assertTrue(
+                os.path.isdir(
+                    os.path.join(self.dir, f"IterateByTweakFactor_{i}")
+                )
+            )
+        iterated = GudrunFile(output)
+        for sample in iterated.sampleBackgrounds[0].samples:
+            if sample.runThisSample:
+                self.assertAlmostEqual(sample.sampleTweakFactor, 1.33333)
+
+    @skipIf(os.name == "nt", "The stub gudrun_dcs is a POSIX script.")
+    def testIterateFailingRun(self):
+
+        with open(self.stub, "a", encoding="utf-8") as fp:
+            fp.write("sys.exit(3)\n")
+        with patch("core.gudrun_file.resolve", lambda *_: self.stub):
+            status, _, stderr = self.main(
+                "iterate", "tweak", self.path, "-n", "2"
+            )
+        self.assertEqual(status, 1)
+        self.assertIn("exit code 3", stderr)
+        self.assertFalse(
+            os.path.isdir(os.path.join(self.dir, "IterateByTweakFactor_1"))
+        )
+
+    def testIterateCompositionNeedsComponents(self):
+
+        status, _, stderr = self.main(
+            "iterate", "composition", self.path, "--component", "H2O"
+        )
+        self.assertEqual(status, 2)
+        self.assertIn("components", stderr)
+
+    def testExport(self):
+
+        archive = os.path.join(self.tmp.name, "mint.zip")
+        status, stdout, _ = self.main("export", self.path, "--to", archive)
+        self.assertEqual(status, 0)
+        self.assertTrue(os.path.exists(archive))
+        self.assertIn(archive, stdout)
@@ -0,0 +1,101 @@
+import os
+import tempfile
+from shutil import copyfile
+from unittest import TestCase
+
+import numpy as np
+
+from core import config
+from core.column_cache import ColumnCache
+from core.column_file import ColumnFile
+
+
+class TestColumnCache(TestCase):
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cacheDir = config.columnCacheDir
+        config.columnCacheDir = os.path.join(self.tmp.name, "cache")
+        self.useColumnCache = config.USE_COLUMN_CACHE
+        config.USE_COLUMN_CACHE = True
+        self.path = os.path.join(self.tmp.name, "water.mint01")
+        copyfile(
+            "test/TestData/water-ref/wavelength3/"
+            "NIMROD00016608_H2O_in_N9.mint01",
+            self.path
+        )
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        config.columnCacheDir = self.cacheDir
+        config.USE_COLUMN_CACHE = self.useColumnCache
+        self.tmp.cleanup()
+        return super().tearDown()
+
+    def testCacheIsPopulated(self):
+
+        ColumnFile(self.path)
+        self.assertEqual(len(ColumnCache().entries()), 1)
+
+    def testReloadFromCache(self):
+
+        c1 = ColumnFile(self.path)
+        c2 = ColumnFile(self.path)
+
+        self.assertNotIsInstance(c1.columns, np.memmap)
+        self.assertIsInstance(c2.columns, np.memmap)
+        self.assertTrue(np.array_equal(c1.columns, c2.columns))
+        self.assertTrue(c2.x.flags["C_CONTIGUOUS"])
+
+    def testCacheInvalidatedByRewrite(self):
+
+        c1 = ColumnFile(self.path)
+        with open(self.path, "a", encoding="utf-8") as fp:
+            fp.write("  0.1000000E+03  0.1000000E+01  0.0000000E+00\n")
+        stat = os.stat(self.path)
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        c2 = ColumnFile(self.path)
+        self.assertEqual(len(c2), len(c1) + 1)
+        self.assertEqual(c2.x[-1], 100.0)
+        # The entry of the previous version is replaced.
+        self.assertEqual(len(ColumnCache().entries()), 1)
+
+    def testCorruptEntryIsIgnored(self):
+
+        c1 = ColumnFile(self.path)
+        [entry] = ColumnCache().entries()
+        with open(entry, "wb") as fp:
+            fp.write(b"not a cache entry")
+
+        c2 = ColumnFile(self.path)
+        self.assertTrue(np.array_equal(c1.columns, c2.columns))
+
+    def testOffByDefault(self):
+
+        config.USE_COLUMN_CACHE = self.useColumnCache
+        ColumnFile(self.path)
+        self.assertEqual(len(ColumnCache().entries()), 0)
+
+    def testPrune(self):
+
+        columns = np.zeros((3, 1000))
+        cache = ColumnCache(maxSize=int(2.5 * (columns.nbytes + 128)))
+        for i in range(4):
+            path = os.path.join(self.tmp.name, f"{i}.mint01")
+            with open(path, "w", encoding="utf-8"):
+                pass
+            key = cache.key(path)
+            cache.save(key, columns)
+            # Ensure the entries are ordered by when they were written.
+            os.utime(cache.entryPath(key), (i, i))
+        entries = sorted(os.path.basename(p) for p in cache.entries())
+        self.assertEqual(len(entries), 2)
+        self.assertEqual(
+            entries,
+            sorted(
+                cache.key(os.path.join(self.tmp.name, f"{i}.mint01"))
+                + cache.SUFFIX
+                for i in (2, 3)
+            )
+        )
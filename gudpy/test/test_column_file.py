@@ -0,0 +1,87 @@
+import os
+import tempfile
+from unittest import TestCase
+
+import numpy as np
+
+from core.column_file import ColumnFile
+from core.exception import ParserException
+
+
+class TestColumnFile(TestCase):
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = (
+            "test/TestData/water-ref/wavelength3/"
+            "NIMROD00016608_H2O_in_N9"
+        )
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+        return super().tearDown()
+
+    def write(self, contents):
+        path = os.path.join(self.tmp.name, "test.mint01")
+        with open(path, "w", encoding="utf-8") as fp:
+            fp.write(contents)
+        return path
+
+    def expected(self, path):
+        # The rows, as parsed line by line.
+        rows = []
+        with open(path, "r", encoding="utf-8") as fp:
+            for line in fp:
+                if line[0] == "#":
+                    continue
+                rows.append([float(n) for n in line.split()])
+        return rows
+
+    def testLoadOutputFiles(self):
+        for ext in (".mint01", ".mdcs01", ".mdor01", ".mgor01"):
+            path = self.path + ext
+            columnFile = ColumnFile(path)
+            rows = self.expected(path)
+
+            self.assertEqual(len(columnFile), len(rows))
+            self.assertListEqual(columnFile.x.tolist(), [r[0] for r in rows])
+            self.assertListEqual(columnFile.y.tolist(), [r[1] for r in rows])
+            self.assertListEqual(
+                columnFile.err.tolist(), [r[2] for r in rows]
+            )
+            for column in (columnFile.x, columnFile.y, columnFile.err):
+                self.assertTrue(column.flags["C_CONTIGUOUS"])
+                self.assertEqual(column.dtype, np.float64)
+
+    def testExtraColumns(self):
+        columnFile = ColumnFile(self.write(
+            "# comment\n"
+            "1.0 2.0 0.1 5.0 6.0\n"
+            "2.0 3.0 0.2 7.0 8.0\n"
+        ))
+        self.assertListEqual(columnFile.x.tolist(), [1.0, 2.0])
+        self.assertListEqual(
+            columnFile.extra.tolist(), [[5.0, 7.0], [6.0, 8.0]]
+        )
+
+    def testRaggedColumns(self):
+        columnFile = ColumnFile(self.write(
+            "1.0 2.0 0.1 5.0\n"
+            "\n"
+            "2.0 3.0 0.2\n"
+        ))
+        self.assertListEqual(columnFile.err.tolist(), [0.1, 0.2])
+        self.assertEqual(len(columnFile.extra), 0)
+
+    def testEmptyFile(self):
+        columnFile = ColumnFile(self.write("# comment only\n"))
+        self.assertEqual(len(columnFile), 0)
+        self.assertEqual(len(columnFile.x), 0)
+        self.assertEqual(len(columnFile.err), 0)
+
+    def testInvalidFile(self):
+        with self.assertRaises(ParserException):
+            ColumnFile(self.write("1.0 2.0 abc\n"))
+        with self.assertRaises(ParserException):
+            ColumnFile(os.path.join(self.tmp.name, "missing.mint01"))
@@ -0,0 +1,115 @@
+import os
+import tempfile
+from shutil import copyfile
+from unittest import TestCase
+
+from core import config
+from core.column_file import ColumnFile
+from core.dataset_cache import DatasetCache
+
+
+class TestDatasetCache(TestCase):
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.useColumnCache = config.USE_COLUMN_CACHE
+        config.USE_COLUMN_CACHE = False
+        self.loads = []
+        self.paths = []
+        source = "test/TestData/water-ref/wavelength3/NIMROD00016608_H2O_in_N9"
+        for i in range(5):
+            for ext in (".mint01", ".mdcs01", ".mdor01", ".mgor01"):
+                path = os.path.join(self.tmp.name, f"{i}{ext}")
+                copyfile(source + ext, path)
+                self.paths.append(path)
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        config.USE_COLUMN_CACHE = self.useColumnCache
+        self.tmp.cleanup()
+        return super().tearDown()
+
+    def loader(self, path):
+        self.loads.append(path)
+        return ColumnFile(path)
+
+    def testEachFileIsReadOnce(self):
+
+        cache = DatasetCache()
+        # Top and bottom charts for each sample, and for all samples.
+        held = [
+            cache.acquire(path, self.loader)
+            for _ in range(4) for path in self.paths
+        ]
+        self.assertEqual(sorted(self.loads), sorted(self.paths))
+        self.assertEqual(cache.misses, len(self.paths))
+        self.assertEqual(cache.hits, 3 * len(self.paths))
+        for dataset in held:
+            cache.release(dataset)
+
+        # Refreshing again reads nothing.
+        for path in self.paths:
+            cache.acquire(path, self.loader)
+        self.assertEqual(len(self.loads), len(self.paths))
+
+    def testReloadOnChange(self):
+
+        cache = DatasetCache()
+        path = self.paths[0]
+        d1 = cache.acquire(path, self.loader)
+        with open(path, "a", encoding="utf-8") as fp:
+            fp.write("  0.1000000E+03  0.1000000E+01  0.0000000E+00\n")
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        d2 = cache.acquire(path, self.loader)
+        self.assertIsNot(d1, d2)
+        self.assertEqual(len(d2), len(d1) + 1)
+        # Both versions are held, and accounted for.
+        self.assertEqual(cache.size(), d1.nbytes + d2.nbytes)
+
+        cache.release(d1)
+        self.assertEqual(cache.size(), d2.nbytes)
+        self.assertIs(cache.acquire(path, self.loader), d2)
+
+    def testEvictLeastRecentlyUsed(self):
+
+        cache = DatasetCache()
+        first = cache.load(self.paths[0], self.loader)
+        cache.maxSize = 2 * first.nbytes
+        cache.load(self.paths[1], self.loader)
+        cache.load(self.paths[0], self.loader)
+        cache.load(self.paths[2], self.loader)
+
+        # The second file was used least recently.
+        self.assertEqual(
+            [key[0] for key in cache.entries],
+            [os.path.abspath(p) for p in (self.paths[0], self.paths[2])]
+        )
+        self.assertLessEqual(cache.size(), cache.maxSize)
+
+    def testHeldDatasetsAreNotEvicted(self):
+
+        cache = DatasetCache(maxSize=0)
+        dataset = cache.acquire(self.paths[0], self.loader)
+        cache.load(self.paths[1], self.loader)
+        self.assertEqual(len(cache.entries), 1)
+        self.assertIs(cache.load(self.paths[0], self.loader), dataset)
+
+        cache.release(dataset)
+        self.assertEqual(len(cache.entries), 0)
+
+    def testSizeOfOtherDatasets(self):
+
+        # Datasets without an nbytes, such as GudFiles,
+        # are accounted by the size of their file.
+        cache = DatasetCache()
+        path = self.paths[0]
+        dataset = cache.load(path, open)
+        self.addCleanup(dataset.close)
+        self.assertIs(cache.load(path, open), dataset)
+        self.assertIsNot(cache.load(path, self.loader), dataset)
+        self.assertEqual(
+            cache.size(),
+            os.path.getsize(path) + cache.load(path, self.loader).nbytes
+        )
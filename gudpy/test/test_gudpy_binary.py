@@ -0,0 +1,128 @@
+import os
+from unittest import TestCase
+
+from core import config
+from core.enums import Format
+from core.exception import ParserException
+from core.gudpy_binary import GudPyBinary, MAGIC, VERSION
+from core.gudrun_file import GudrunFile, convert, formatOf
+from test import test_gudpy_io
+
+
+class TestGudPyBinary(TestCase):
+
+    def setUp(self) -> None:
+        self.useProjectCache = config.USE_PROJECT_CACHE
+        config.USE_PROJECT_CACHE = False
+        self.path = "test/TestData/NIMROD-water/water.txt"
+        # Binary files are written alongside the input file, so that
+        # the input file directory of the round-tripped project matches.
+        self.binaryPath = "test/TestData/NIMROD-water/water.gudpyb"
+        self.yamlPath = "test/TestData/NIMROD-water/water_binary.yaml"
+        self.txtPath = "test/TestData/NIMROD-water/water_binary.txt"
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        config.USE_PROJECT_CACHE = self.useProjectCache
+        for path in (self.binaryPath, self.yamlPath, self.txtPath):
+            if os.path.exists(path):
+                os.remove(path)
+        return super().tearDown()
+
+    def fixtures(self, test):
+        # Reuse the expected values and assertions of the TXT format,
+        # against a project that went through a binary file.
+        io = test_gudpy_io.TestGudPyIO(test)
+        io.setUp()
+        self.addCleanup(io.tearDown)
+        io.g.write_binary(self.binaryPath)
+        io.g = GudrunFile(self.binaryPath)
+        return io
+
+    def testLoadBinaryGudrunFile(self):
+        io = self.fixtures("testLoadGudrunFile")
+        io.testLoadGudrunFile()
+
+    def testReloadBinaryGudrunFile(self):
+        io = self.fixtures("testReloadGudrunFile")
+        io.testReloadGudrunFile()
+
+    def testRewriteBinaryGudrunFile(self):
+        io = self.fixtures("testRewriteGudrunFile")
+        io.testRewriteGudrunFile()
+
+    def testTxtToBinaryToTxt(self):
+        g1 = GudrunFile(self.path)
+        convert(self.path, self.binaryPath)
+        g2 = convert(self.binaryPath, self.txtPath)
+        self.assertEqual(str(g1)[:-5], str(g2)[:-5])
+        with open(self.txtPath, encoding="utf-8") as fp:
+            self.assertEqual(fp.read()[:-5], str(g1)[:-5])
+
+    def testYamlToBinaryToYaml(self):
+        convert(self.path, self.yamlPath)
+        with open(self.yamlPath, encoding="utf-8") as fp:
+            expected = fp.read()
+        convert(self.yamlPath, self.binaryPath)
+        convert(self.binaryPath, self.yamlPath)
+        with open(self.yamlPath, encoding="utf-8") as fp:
+            self.assertEqual(fp.read(), expected)
+
+    def testBinaryIsSmallerThanYaml(self):
+        convert(self.path, self.yamlPath)
+        convert(self.path, self.binaryPath)
+        self.assertLess(
+            os.path.getsize(self.binaryPath),
+            os.path.getsize(self.yamlPath)
+        )
+
+    def testSave(self):
+        g = GudrunFile(self.path)
+        g.save(path=self.yamlPath, format=Format.BINARY)
+        path = os.path.splitext(self.yamlPath)[0] + ".gudpyb"
+        self.addCleanup(os.remove, path)
+        self.assertTrue(os.path.exists(path))
+        self.assertEqual(str(GudrunFile(path))[:-5], str(g)[:-5])
+
+    def testFormatOf(self):
+        self.assertEqual(formatOf("a.txt"), Format.TXT)
+        self.assertEqual(formatOf("a.yaml"), Format.YAML)
+        self.assertEqual(formatOf("a.gudpyb"), Format.BINARY)
+        # Bare extensions, as taken from the filters of the save dialog.
+        self.assertEqual(formatOf(".txt"), Format.TXT)
+        self.assertEqual(formatOf(".yaml"), Format.YAML)
+        self.assertEqual(formatOf(".gudpyb"), Format.BINARY)
+
+    def testEncodeDecode(self):
+        binary = GudPyBinary()
+        tree = {
+            "none": None,
+            "bools": [True, False],
+            "ints": [1, -2, 2**40],
+            "floats": [0.1, -1e-300],
+            "mixed": [1, 1.0, "1", None],
+            "strings": ["a", "", "ü"],
+            "matrix": [[0.0, 1.5], [2.0, 3.0]],
+            "ragged": [[0.0], [1.0, 2.0]],
+            "table": [
+                {"atomicSymbol": "H", "massNo": 2.0, "abundance": 2.0},
+                {"atomicSymbol": "O", "massNo": 0.0, "abundance": 1.0},
+            ],
+            "nested": {"empty": [], "dict": {}},
+        }
+        self.assertEqual(binary.decode(binary.encode(tree)), tree)
+
+    def testDecodeNewerVersion(self):
+        binary = GudPyBinary()
+        data = bytearray(binary.encode({}))
+        data[len(MAGIC)] = VERSION + 1
+        with self.assertRaises(ParserException):
+            binary.decode(bytes(data))
+
+    def testDecodeCorrupt(self):
+        binary = GudPyBinary()
+        data = binary.encode({"a": [1.0, 2.0]})
+        with self.assertRaises(ParserException):
+            binary.decode(data[:-4])
+        with self.assertRaises(ParserException):
+            binary.decode(b"not binary")
@@ -1,6 +1,9 @@
 from unittest import TestCase
 
+from core import config
 from core.gudrun_file import GudrunFile
+from core.gudpy_yaml import YAML, FastYAML
+from core.enums import Format
 
 
 class TestYAML(TestCase):
@@ -130,3 +133,47 @@ class TestYAML(TestCase):
                     self.assertDictEqual(elementA.__dict__, elementB.__dict__)
 
                 self.assertDictEqual(containerA.__dict__, containerB.__dict__)
+
+    def testDetectFormat(self):
+
+        gf = GudrunFile("test/TestData/NIMROD-water/water.txt")
+        gf.write_yaml("test/TestData/NIMROD-water/water.yaml")
+
+        with open(
+            "test/TestData/NIMROD-water/water.txt", encoding="utf-8"
+        ) as fp:
+            self.assertEqual(gf.detectFormat(fp.read(512)), Format.TXT)
+        with open(
+            "test/TestData/NIMROD-water/water.yaml", encoding="utf-8"
+        ) as fp:
+            self.assertEqual(gf.detectFormat(fp.read(512)), Format.YAML)
+
+
+class TestFastYAML(TestYAML):
+
+    def setUp(self) -> None:
+        self.fastYAML = config.FAST_YAML
+        self.useProjectCache = config.USE_PROJECT_CACHE
+        config.FAST_YAML = True
+        config.USE_PROJECT_CACHE = False
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        config.FAST_YAML = self.fastYAML
+        config.USE_PROJECT_CACHE = self.useProjectCache
+        return super().tearDown()
+
+    def testReadableByRoundTripLoader(self):
+
+        gf = GudrunFile("test/TestData/NIMROD-water/water.txt")
+        path = "test/TestData/NIMROD-water/water.yaml"
+        FastYAML().writeYAML(gf, path)
+
+        yaml = YAML()
+        yaml.path = path
+        fast = FastYAML()
+        fast.path = path
+        for a, b in zip(
+            yaml.parseYaml(path)[:5], fast.parseYaml(path)[:5]
+        ):
+            self.assertEqual(fast.toYaml(a), fast.toYaml(b))
@@ -0,0 +1,65 @@
+import os
+import tempfile
+from copy import deepcopy
+from shutil import copyfile
+from unittest import TestCase
+
+from core.gudrun_file import GudrunFile
+from core.lazy_sample import LazySample
+from core.sample import Sample
+
+
+class TestLazyParsing(TestCase):
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "water.txt")
+        copyfile("test/TestData/NIMROD-water/water.txt", self.path)
+        self.eager = GudrunFile(self.path)
+        self.lazy = GudrunFile(self.path, lazy=True)
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+        return super().tearDown()
+
+    def testSamplesAreNotParsed(self):
+
+        samples = self.lazy.sampleBackgrounds[0].samples
+        self.assertEqual(len(samples), 4)
+        for sample in samples:
+            self.assertIsInstance(sample, LazySample)
+
+    def testSampleIsParsedOnAccess(self):
+
+        samples = self.lazy.sampleBackgrounds[0].samples
+        eager = self.eager.sampleBackgrounds[0].samples
+
+        self.assertEqual(samples[1].name, eager[1].name)
+        self.assertIs(type(samples[1]), Sample)
+        self.assertIsInstance(samples[0], LazySample)
+        self.assertEqual(str(samples[1]), str(eager[1]))
+        self.assertEqual(
+            len(samples[1].containers), len(eager[1].containers)
+        )
+
+    def testUntouchedSamplesAreWrittenVerbatim(self):
+
+        self.lazy.sampleBackgrounds[0].samples[0].sampleTweakFactor = 2.5
+        self.lazy.write_out(path=self.path, writeParameters=False)
+
+        g = GudrunFile(self.path)
+        samples = g.sampleBackgrounds[0].samples
+        eager = self.eager.sampleBackgrounds[0].samples
+        self.assertEqual(samples[0].sampleTweakFactor, 2.5)
+        self.assertEqual(len(samples), len(eager))
+        for sample, other in zip(samples[1:], eager[1:]):
+            self.assertEqual(str(sample), str(other))
+
+    def testDeepcopyIsLazy(self):
+
+        sample = self.lazy.sampleBackgrounds[0].samples[2]
+        copy = deepcopy(sample)
+        self.assertIsInstance(copy, LazySample)
+        self.assertEqual(copy.name, sample.name)
+        self.assertIsNot(copy, sample)
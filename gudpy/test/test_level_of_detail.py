@@ -0,0 +1,63 @@
+from unittest import TestCase
+
+import numpy as np
+
+from core import config
+from core.level_of_detail import LevelOfDetail, lttb
+
+
+class TestLevelOfDetail(TestCase):
+
+    def setUp(self) -> None:
+        self.x = np.linspace(0.0, 50.0, 20001)
+        self.y = np.sin(self.x) * np.exp(-self.x / 20)
+        # A single sharp peak, which must survive downsampling.
+        self.y[12345] = 10.0
+        return super().setUp()
+
+    def testLTTB(self):
+
+        kept = lttb(self.x, self.y, 500)
+        self.assertEqual(len(kept), 500)
+        self.assertEqual(kept[0], 0)
+        self.assertEqual(kept[-1], len(self.x) - 1)
+        self.assertTrue(np.all(np.diff(kept) > 0))
+        self.assertIn(12345, kept)
+
+    def testLTTBKeepsSmallSeries(self):
+
+        self.assertListEqual(
+            lttb(self.x[:10], self.y[:10], 20).tolist(), list(range(10))
+        )
+
+    def testPyramid(self):
+
+        lod = LevelOfDetail(self.x, self.y, factor=4, minPoints=256)
+        sizes = [len(lod.level(i)[0]) for i in range(4)]
+        self.assertEqual(sizes, [20001, 5000, 1250, 312])
+        for x, y in lod.levels:
+            self.assertIn(10.0, y)
+
+    def testWindowFullRange(self):
+
+        lod = LevelOfDetail(self.x, self.y)
+        level, lo, hi = lod.window(0.0, 50.0, 500)
+        self.assertGreater(level, 0)
+        self.assertGreaterEqual(hi - lo, 500 * config.LOD_POINTS_PER_PIXEL)
+        self.assertLess(hi - lo, 4 * 500 * config.LOD_POINTS_PER_PIXEL)
+
+    def testWindowZoomedIn(self):
+
+        lod = LevelOfDetail(self.x, self.y)
+        level, lo, hi = lod.window(10.0, 11.0, 500)
+        # Zoomed in far enough, every point is shown.
+        self.assertEqual(level, 0)
+        x, _ = lod.level(level)
+        self.assertLess(x[lo], 10.0)
+        self.assertGreater(x[hi - 1], 11.0)
+        self.assertEqual(hi - lo, np.sum((x >= 10.0) & (x <= 11.0)) + 2)
+
+    def testUnsortedIsNotDownsampled(self):
+
+        lod = LevelOfDetail(self.x[::-1], self.y)
+        self.assertEqual(lod.window(0.0, 50.0, 10), (0, 0, len(self.x)))
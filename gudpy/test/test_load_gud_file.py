@@ -0,0 +1,112 @@
+import os
+import tempfile
+from types import SimpleNamespace
+from unittest import TestCase
+
+from core.dataset_cache import datasetCache
+from core.exception import ParserException
+from core.gud_file import GudFile, loadGudFile
+from core.tweak_factor_iterator import TweakFactorIterator
+
+
+GUD_FILE = """ {name}
+
+ H2O in 1mm TiZr Can
+
+ T. G. A. Youngs, D.
+
+ 23-OCT-2012 17:45:25
+
+ Number density of this sample (atoms/A**3) =  0.1
+ Corresponding density in g/cm**3 =    0.99717
+ Average scattering length of the sample (10**-12cm) =   -0.05583
+ Average scattering length of squared (barns) =  0.311736E-02
+ Average square of the scattering length (barns) =  0.205450E+00
+ Ratio of (coherent) single to interference =  0.659052E+02
+
+ Expected level of DCS [b/sr/atom] =    {expected}
+
+ Group number,  first Q,   last Q,   level [b/sr/atom],   gradient in Q (%)
+
+    1            0.0173    4.0723        4.51058             -0.6170
+
+ No. of groups accepted for merge =   1
+
+ Average level of merged dcs is   {level} b/sr/atom;
+
+ Gradient of merged dcs: -0.5106 of average level.
+
+ {result}
+
+ Suggested tweak factor:   {tweak}
+"""
+
+
+class TestLoadGudFile(TestCase):
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.write("a.gud", 4.0, 4.0, 1.0)
+        self.write("b.gud", 4.0, 3.0, 1.33333)
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        datasetCache.clear()
+        self.tmp.cleanup()
+        return super().tearDown()
+
+    def write(self, name, expected, level, tweak):
+        path = os.path.join(self.tmp.name, name)
+        percentage = round(level / expected * 100, 1)
+        result = (
+            f"WARNING! This DCS level is   {100 - percentage}% "
+            "BELOW expected level."
+            if percentage < 100
+            else f"This DCS level is   {percentage}% of expected level."
+        )
+        with open(path, "w", encoding="utf-8") as fp:
+            fp.write(GUD_FILE.format(
+                name=name, expected=expected, level=level,
+                result=result, tweak=tweak
+            ))
+        return path
+
+    def testLoadGudFileIsMemoized(self):
+
+        path = os.path.join(self.tmp.name, "a.gud")
+        gudFile = loadGudFile(path)
+        self.assertIsInstance(gudFile, GudFile)
+        self.assertEqual(gudFile.averageLevelMergedDCS, 4.0)
+        self.assertIs(loadGudFile(path), gudFile)
+
+        self.write("a.gud", 4.0, 3.5, 1.14286)
+        os.utime(path, ns=(0, 0))
+        reloaded = loadGudFile(path)
+        self.assertIsNot(reloaded, gudFile)
+        self.assertEqual(reloaded.averageLevelMergedDCS, 3.5)
+
+    def testLoadGudFileRaisesParserException(self):
+
+        with self.assertRaises(ParserException):
+            loadGudFile(os.path.join(self.tmp.name, "missing.gud"))
+        with self.assertRaises(ParserException):
+            loadGudFile(os.path.join(self.tmp.name, "a.txt"))
+
+    def testTweakFactorIteratorReadsGudFiles(self):
+
+        samples = [
+            SimpleNamespace(
+                dataFiles=[f"{name}.raw"], runThisSample=True,
+                sampleTweakFactor=1.0
+            )
+            for name in ("a", "b")
+        ]
+        gudrunFile = SimpleNamespace(
+            instrument=SimpleNamespace(
+                GudrunInputFileDir=self.tmp.name, dataFileType="raw"
+            ),
+            sampleBackgrounds=[SimpleNamespace(samples=samples)]
+        )
+        TweakFactorIterator(gudrunFile).performIteration(0)
+        self.assertEqual(samples[0].sampleTweakFactor, 1.0)
+        self.assertAlmostEqual(samples[1].sampleTweakFactor, 1.33333)
@@ -0,0 +1,313 @@
+import os
+import subprocess
+import tempfile
+import threading
+import time
+from unittest import TestCase
+from unittest.mock import patch
+
+from core.exception import GudrunException
+from core.gudrun_file import GudrunFile
+from core.output_file_handler import (
+    OutputFileHandler, OutputOrganiser, organiser
+)
+
+
+class TestOutputFileHandler(TestCase):
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = self.tmp.name
+        self.g = GudrunFile(
+            os.path.abspath("test/TestData/NIMROD-water/water.txt")
+        )
+        self.g.instrument.GudrunInputFileDir = self.dir
+        self.handler = OutputFileHandler(self.g)
+        for run, runFile in self.handler.runFiles:
+            self.write(runFile, run)
+            for suffix in ("gud", "mint01", "dcs01", "gr1", "rawmon"):
+                self.write(f"{run}.{suffix}", f"{run}.{suffix}")
+        self.write("unrelated.gud", "unrelated")
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+        return super().tearDown()
+
+    def write(self, name, contents):
+        with open(
+            os.path.join(self.dir, name), "w", encoding="utf-8"
+        ) as fp:
+            fp.write(contents)
+
+    def read(self, *path):
+        with open(os.path.join(self.dir, *path), encoding="utf-8") as fp:
+            return fp.read()
+
+    def testIndexRunFiles(self):
+
+        index = self.handler.indexRunFiles()
+        self.assertEqual(
+            set(index), {run for run, _ in self.handler.runFiles}
+        )
+        run = self.handler.runFiles[0][0]
+        self.assertEqual(
+            index[run],
+            {
+                suffix: f"{run}.{suffix}"
+                for suffix in ("gud", "mint01", "dcs01", "gr1", "rawmon")
+            }
+        )
+
+    def testNaiveOrganiseListsDirectoryOnce(self):
+
+        with patch("os.listdir", wraps=os.listdir) as listdir:
+            self.handler.naiveOrganise()
+        self.assertEqual(listdir.call_count, 1)
+
+    def testNaiveOrganise(self):
+
+        self.handler.naiveOrganise()
+        for run, runFile in self.handler.runFiles:
+            outputs = os.path.join(run, "outputs")
+            diagnostics = os.path.join(run, "diagnostics")
+            for suffix in ("gud", "mint01", "dcs01"):
+                self.assertEqual(
+                    self.read(outputs, f"{run}.{suffix}"), f"{run}.{suffix}"
+                )
+            for suffix in ("gr1", "rawmon"):
+                self.assertEqual(
+                    self.read(diagnostics, f"{run}.{suffix}"),
+                    f"{run}.{suffix}"
+                )
+            self.assertEqual(self.read(outputs, runFile), run)
+
+            # Every output stays in the input file directory.
+            for suffix in ("gud", "mint01", "dcs01", "gr1", "rawmon"):
+                self.assertTrue(
+                    os.path.exists(os.path.join(self.dir, f"{run}.{suffix}"))
+                )
+            self.assertTrue(os.path.exists(os.path.join(self.dir, runFile)))
+        self.assertTrue(
+            os.path.exists(os.path.join(self.dir, "unrelated.gud"))
+        )
+
+    def testIterativeOrganise(self):
+
+        self.handler.iterativeOrganise("IterateByTweakFactor_1")
+        self.handler.detach()
+        run = self.handler.runFiles[0][0]
+        self.write(f"{run}.gud", "rewritten")
+        self.handler.iterativeOrganise("IterateByTweakFactor_2")
+
+        first = os.path.join("IterateByTweakFactor_1", run, "outputs")
+        second = os.path.join("IterateByTweakFactor_2", run, "outputs")
+        self.assertEqual(self.read(first, f"{run}.gud"), f"{run}.gud")
+        self.assertEqual(self.read(second, f"{run}.gud"), "rewritten")
+
+    def testNaiveThenIterativeOrganise(self):
+
+        self.write(f"{self.handler.runFiles[0][0]}.abs01", "abs01")
+        self.handler.naiveOrganise()
+        self.handler.iterativeOrganise("IterateByDensity_1")
+        for run, runFile in self.handler.runFiles:
+            for tree in (run, os.path.join("IterateByDensity_1", run)):
+                for suffix in ("gud", "mint01", "dcs01"):
+                    self.assertEqual(
+                        self.read(tree, "outputs", f"{run}.{suffix}"),
+                        f"{run}.{suffix}"
+                    )
+                for suffix in ("gr1", "rawmon"):
+                    self.assertEqual(
+                        self.read(tree, "diagnostics", f"{run}.{suffix}"),
+                        f"{run}.{suffix}"
+                    )
+        # Corrections are left for later runs to read back.
+        run = self.handler.runFiles[0][0]
+        self.handler.detach()
+        self.assertEqual(self.read(f"{run}.abs01"), "abs01")
+
+    def testDetach(self):
+
+        self.handler.naiveOrganise()
+        run = self.handler.runFiles[0][0]
+        path = os.path.join(self.dir, f"{run}.gud")
+        self.assertGreater(os.stat(path).st_nlink, 1)
+
+        self.handler.detach()
+        self.assertEqual(os.stat(path).st_nlink, 1)
+        # Outputs that aren't read back are written anew by the run.
+        self.assertFalse(os.path.exists(os.path.join(self.dir, f"{run}.gr1")))
+        self.assertEqual(
+            self.read(run, "diagnostics", f"{run}.gr1"), f"{run}.gr1"
+        )
+        # Rewriting the output in place leaves that organised intact.
+        with open(path, "r+", encoding="utf-8") as fp:
+            fp.write("rewritten")
+        self.assertEqual(
+            self.read(run, "outputs", f"{run}.gud"), f"{run}.gud"
+        )
+
+    def testOrganiseInBackground(self):
+
+        run = self.handler.runFiles[0][0]
+        self.handler.iterativeOrganise("IterateByTweakFactor_1", wait=False)
+        # The outputs are snapshotted before returning,
+        # so the next run may rewrite them straight away.
+        self.handler.detach()
+        self.write(f"{run}.gud", "rewritten")
+        self.write(f"{run}.dcs01", "rewritten")
+        self.handler.iterativeOrganise("IterateByTweakFactor_2", wait=False)
+        organiser.wait()
+
+        first = os.path.join("IterateByTweakFactor_1", run, "outputs")
+        second = os.path.join("IterateByTweakFactor_2", run, "outputs")
+        self.assertEqual(self.read(first, f"{run}.gud"), f"{run}.gud")
+        self.assertEqual(self.read(first, f"{run}.dcs01"), f"{run}.dcs01")
+        self.assertEqual(self.read(second, f"{run}.gud"), "rewritten")
+        self.assertEqual(self.read(second, f"{run}.dcs01"), "rewritten")
+        self.assertFalse(
+            [f for f in os.listdir(self.dir) if f.startswith(".gudpy")]
+        )
+
+    def testNaiveOrganiseReplacesPrevious(self):
+
+        run = self.handler.runFiles[0][0]
+        self.handler.naiveOrganise(wait=False)
+        self.write(f"{run}.dcs01", "rewritten")
+        self.handler.naiveOrganise(wait=False)
+        organiser.wait()
+        self.assertEqual(
+            self.read(run, "outputs", f"{run}.dcs01"), "rewritten"
+        )
+        self.assertFalse(
+            [f for f in os.listdir(self.dir) if f.startswith(".gudpy")]
+        )
+
+    def writeComplete(self, run):
+        self.write(f"{run}.gud", " Suggested tweak factor:   1.0\n")
+        self.write(f"{run}.mint01", "  0.1  1.0\n")
+
+    def testWaitForOutputs(self):
+
+        for run, _ in self.handler.runFiles:
+            self.writeComplete(run)
+        start = time.monotonic()
+        self.assertTrue(self.handler.waitForOutputs(timeout=5))
+        # Outputs that are already complete are not waited on.
+        self.assertLess(time.monotonic() - start, 1)
+
+    def testWaitForOutputsOfFailedRun(self):
+
+        for run, _ in self.handler.runFiles:
+            self.writeComplete(run)
+        with patch.object(OutputFileHandler, "waitForOutputs") as wait:
+            self.assertFalse(self.g.waitForOutputs(False))
+            self.assertFalse(
+                self.g.waitForOutputs(
+                    subprocess.CompletedProcess([], 1, "", "")
+                )
+            )
+            wait.assert_not_called()
+        self.assertTrue(
+            self.g.waitForOutputs(subprocess.CompletedProcess([], 0, "", ""))
+        )
+
+    def testProcessAndWaitRaises(self):
+
+        failed = subprocess.CompletedProcess([], 1, "", "error")
+        with patch.object(GudrunFile, "process", return_value=failed):
+            with self.assertRaises(GudrunException):
+                self.g.processAndWait()
+        with patch.object(GudrunFile, "process", return_value=False):
+            with self.assertRaises(GudrunException):
+                self.g.processAndWait()
+
+    def testPoll(self):
+
+        for run, _ in self.handler.runFiles:
+            self.writeComplete(run)
+        run = self.handler.runFiles[0][0]
+        self.write(f"{run}.gud", f"{run}.gud\n")
+        pending = self.handler.pendingOutputs()
+        self.assertEqual(
+            len(pending),
+            len(self.handler.runFiles) * len(self.handler.trailers)
+        )
+        time.sleep(0.1)
+        self.assertEqual(
+            self.handler.poll(pending, {}, 0.05),
+            {(os.path.join(self.dir, f"{run}.gud"), "gud")}
+        )
+
+    def testWaitForOutputsTimesOut(self):
+
+        for run, _ in self.handler.runFiles:
+            self.writeComplete(run)
+        run = self.handler.runFiles[0][0]
+        # Truncated before the trailer.
+        self.write(f"{run}.gud", f"{run}.gud\n")
+        self.assertFalse(self.handler.waitForOutputs(timeout=0.2))
+        self.write(f"{run}.mint01", "  0.1  1.0")
+        self.writeComplete(self.handler.runFiles[1][0])
+        self.assertFalse(self.handler.waitForOutputs(timeout=0.2))
+
+    def testWaitForOutputsWhilstWritten(self):
+
+        for run, _ in self.handler.runFiles:
+            self.writeComplete(run)
+        run = self.handler.runFiles[0][0]
+        self.write(f"{run}.gud", " Average level\n")
+
+        def finish():
+            time.sleep(0.3)
+            with open(
+                os.path.join(self.dir, f"{run}.gud"), "a", encoding="utf-8"
+            ) as fp:
+                fp.write(" Suggested tweak factor:   1.0\n")
+
+        writer = threading.Thread(target=finish)
+        writer.start()
+        self.assertTrue(self.handler.waitForOutputs(timeout=5))
+        writer.join()
+        self.assertIn("Suggested", self.read(f"{run}.gud"))
+
+
+class TestOutputOrganiser(TestCase):
+
+    def setUp(self) -> None:
+        self.organiser = OutputOrganiser(maxWorkers=2)
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        self.organiser.executor.shutdown()
+        return super().tearDown()
+
+    def testTasksToTheSameDestinationAreOrdered(self):
+
+        release = threading.Event()
+        order = []
+
+        def first():
+            release.wait(5)
+            order.append("first")
+
+        self.organiser.submit(["a"], first)
+        self.organiser.submit(["b"], order.append, "other")
+        self.organiser.submit(["a"], order.append, "second")
+        release.set()
+        self.organiser.wait()
+        self.assertEqual(
+            [o for o in order if o != "other"], ["first", "second"]
+        )
+        self.assertEqual(self.organiser.pending(), 0)
+
+    def testWaitRaisesErrors(self):
+
+        def fail():
+            raise OSError("Failed")
+
+        self.organiser.submit(["a"], fail)
+        with self.assertRaises(OSError):
+            self.organiser.wait()
+        self.organiser.wait()
@@ -0,0 +1,90 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from core.data_files import DataFiles
+from core.output_versions import OutputVersions, outputPath
+from core.sample import Sample
+
+
+class TestOutputVersions(TestCase):
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.inputDir = self.tmp.name
+        self.samples = []
+        for i in range(3):
+            sample = Sample()
+            sample.name = f"SAMPLE {i}"
+            sample.dataFiles = DataFiles([f"RUN{i}.raw"], "SAMPLE")
+            self.samples.append(sample)
+            for ext in (".gud", ".mint01"):
+                self.write(f"RUN{i}{ext}", "1")
+        self.versions = OutputVersions()
+        for sample in self.samples:
+            self.versions.record(sample, self.inputDir)
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+        return super().tearDown()
+
+    def write(self, name, contents):
+        path = os.path.join(self.inputDir, name)
+        with open(path, "w", encoding="utf-8") as fp:
+            fp.write(contents)
+        # Ensure the modification time moves on,
+        # however coarse the clock of the filesystem.
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    def changed(self):
+        return [
+            sample for sample in self.samples
+            if self.versions.changed(sample, self.inputDir)
+        ]
+
+    def testUnchanged(self):
+        self.assertEqual(self.changed(), [])
+
+    def testOnlyRewrittenSamplesChange(self):
+        self.write("RUN1.mint01", "12")
+        self.assertEqual(self.changed(), [self.samples[1]])
+
+        self.versions.record(self.samples[1], self.inputDir)
+        self.assertEqual(self.changed(), [])
+
+    def testNewOutputsChange(self):
+        self.write("RUN2.mdor01", "1")
+        self.assertEqual(self.changed(), [self.samples[2]])
+
+    def testRemovedOutputsChange(self):
+        os.remove(os.path.join(self.inputDir, "RUN0.gud"))
+        self.assertEqual(self.changed(), [self.samples[0]])
+
+    def testRenamedSampleChanges(self):
+        self.samples[0].name = "RENAMED"
+        self.assertEqual(self.changed(), [self.samples[0]])
+
+    def testUnrecordedSampleChanges(self):
+        self.versions.forget(self.samples[0])
+        self.assertEqual(self.changed(), [self.samples[0]])
+
+    def testPaths(self):
+        self.assertEqual(
+            sorted(self.versions.paths(self.samples, self.inputDir)),
+            sorted(
+                os.path.join(self.inputDir, f"RUN{i}{ext}")
+                for i in range(3) for ext in (".gud", ".mint01")
+            )
+        )
+
+    def testOutputPath(self):
+        self.assertEqual(
+            outputPath(self.samples[0], self.inputDir, ".mint01"),
+            (os.path.join(self.inputDir, "RUN0.mint01"), True)
+        )
+        self.assertEqual(
+            outputPath(self.samples[0], self.inputDir, ".mgor01"),
+            ("RUN0.mgor01", False)
+        )
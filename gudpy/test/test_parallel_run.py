@@ -0,0 +1,167 @@
+import os
+import sys
+import tempfile
+import time
+from unittest import TestCase, skipIf
+
+from core.gudrun_file import GudrunFile
+from core.parallel_run import ParallelRun
+
+
+# Stands in for gudrun_dcs: writes outputs for the first data file of
+# each sample in the input file, after a delay standing in for the work.
+STUB = """#!{python}
+import os
+import re
+import sys
+import time
+
+assert os.path.exists("spec.bad")
+runs = []
+inSample = False
+with open(sys.argv[1], encoding="utf-8") as fp:
+    for line in fp:
+        if line.startswith("SAMPLE ") and "BACKGROUND" not in line:
+            inSample = True
+        match = re.match(r"(\\S+)\\.raw\\s+.*data files", line)
+        if match and inSample:
+            runs.append(match.group(1))
+            inSample = False
+time.sleep({delay})
+for run in runs:
+    for ext in (".gud", ".mint01", ".dcs01"):
+        with open(run + ext, "w", encoding="utf-8") as fp:
+            fp.write(run + ext)
+# Appends, so that writing through a link to a previous log would show.
+with open("gudrun_dcs.log", "a", encoding="utf-8") as fp:
+    fp.write("done")
+print("ran " + " ".join(runs))
+"""
+
+
+@skipIf(os.name == "nt", "The stub gudrun_dcs is a POSIX script.")
+class TestParallelRun(TestCase):
+
+    DELAY = 0.3
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = self.tmp.name
+        self.g = GudrunFile(
+            os.path.abspath("test/TestData/NIMROD-water/water.txt")
+        )
+        self.g.instrument.GudrunInputFileDir = self.dir
+        self.g.write_out()
+        with open(
+            os.path.join(self.dir, "spec.bad"), "w", encoding="utf-8"
+        ) as fp:
+            fp.write("bad")
+        self.stub = os.path.join(self.dir, "gudrun_dcs")
+        with open(self.stub, "w", encoding="utf-8") as fp:
+            fp.write(STUB.format(python=sys.executable, delay=self.DELAY))
+        os.chmod(self.stub, 0o755)
+        self.runs = [
+            os.path.splitext(s.dataFiles[0])[0]
+            for sb in self.g.sampleBackgrounds
+            for s in sb.samples if s.runThisSample
+        ]
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+        return super().tearDown()
+
+    def testPartition(self):
+
+        partitions = ParallelRun(self.g).partitions
+        self.assertEqual(len(partitions), len(self.runs))
+        for partition, run in zip(partitions, self.runs):
+            self.assertEqual(len(partition.sampleBackgrounds), 1)
+            [sample] = partition.sampleBackgrounds[0].samples
+            self.assertEqual(os.path.splitext(sample.dataFiles[0])[0], run)
+        self.assertEqual(
+            len(ParallelRun(self.g, split="background").partitions),
+            len(self.g.sampleBackgrounds)
+        )
+        # Partitioning leaves the GudrunFile as it was.
+        self.assertEqual(
+            len(self.g.sampleBackgrounds[0].samples), len(self.runs)
+        )
+
+    def testRunMergesOutputs(self):
+
+        result = ParallelRun(self.g).run(gudrun_dcs=self.stub)
+        self.assertEqual(result.returncode, 0)
+        for run in self.runs:
+            self.assertIn(run, result.stdout)
+            for ext in (".gud", ".mint01"):
+                self.assertTrue(
+                    os.path.exists(os.path.join(self.dir, run + ext))
+                )
+            self.assertTrue(
+                os.path.exists(
+                    os.path.join(self.dir, run, "outputs", run + ".dcs01")
+                )
+            )
+        self.assertTrue(
+            os.path.exists(os.path.join(self.dir, "gudrun_dcs.log"))
+        )
+        self.assertFalse(
+            [f for f in os.listdir(self.dir) if f.startswith(".gudpy")]
+        )
+        self.assertFalse(os.path.islink(os.path.join(self.dir, "spec.bad")))
+
+    def testShared(self):
+
+        with open(
+            os.path.join(self.dir, "unrelated.dat"), "w", encoding="utf-8"
+        ) as fp:
+            fp.write("unrelated")
+        shared = ParallelRun(self.g).shared(self.dir)
+        self.assertIn("spec.bad", shared)
+        self.assertNotIn("unrelated.dat", shared)
+        self.assertNotIn(self.g.outpath, shared)
+
+    def testRunTwice(self):
+
+        for _ in range(2):
+            result = ParallelRun(self.g).run(gudrun_dcs=self.stub)
+            self.assertEqual(result.returncode, 0)
+            with open(
+                os.path.join(self.dir, "gudrun_dcs.log"), encoding="utf-8"
+            ) as fp:
+                self.assertEqual(fp.read(), "done")
+            for run in self.runs:
+                with open(
+                    os.path.join(self.dir, run + ".gud"), encoding="utf-8"
+                ) as fp:
+                    self.assertEqual(fp.read(), run + ".gud")
+        with open(
+            os.path.join(self.dir, "spec.bad"), encoding="utf-8"
+        ) as fp:
+            self.assertEqual(fp.read(), "bad")
+
+    def testRunsInParallel(self):
+
+        start = time.perf_counter()
+        ParallelRun(self.g).run(
+            workers=1, iterative=True, gudrun_dcs=self.stub
+        )
+        serial = time.perf_counter() - start
+
+        start = time.perf_counter()
+        ParallelRun(self.g).run(
+            workers=len(self.runs), iterative=True, gudrun_dcs=self.stub
+        )
+        parallel = time.perf_counter() - start
+
+        self.assertGreaterEqual(serial, self.DELAY * len(self.runs))
+        self.assertLess(parallel, serial * 0.6)
+
+    def testMissingBinary(self):
+
+        self.assertFalse(
+            ParallelRun(self.g).run(
+                gudrun_dcs=os.path.join(self.dir, "missing")
+            )
+        )
@@ -0,0 +1,68 @@
+import os
+import re
+import tempfile
+from copy import deepcopy
+from shutil import copyfile
+from unittest import TestCase
+
+from core.gudrun_file import GudrunFile
+
+
+class TestParameterFiles(TestCase):
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        path = os.path.join(self.tmp.name, "water.txt")
+        copyfile("test/TestData/NIMROD-water/water.txt", path)
+        self.g = GudrunFile(path)
+        self.g.instrument.GudrunInputFileDir = self.tmp.name
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+        return super().tearDown()
+
+    def expected(self, sb, s):
+        # The parameter file as written by copying the GudrunFile.
+        gf = deepcopy(self.g)
+        gf.sampleBackgrounds = [deepcopy(sb)]
+        gf.sampleBackgrounds[0].samples = [deepcopy(s)]
+        return str(gf)
+
+    def read(self, sample):
+        with open(
+            os.path.join(self.tmp.name, sample.pathName()),
+            encoding="utf-8"
+        ) as f:
+            return f.read()
+
+    def assertSameContents(self, a, b):
+        stamp = r"Date and time last written:  [0-9]{8} [0-9:]{8}"
+        self.assertEqual(re.sub(stamp, "", a), re.sub(stamp, "", b))
+
+    def testParameterFilesMatchCopies(self):
+
+        sb = self.g.sampleBackgrounds[0]
+        sb.samples[1].runThisSample = False
+        sb.samples[2].containers[0].runAsSample = True
+        self.g.write_out(writeParameters=True)
+
+        for s in sb.samples:
+            path = os.path.join(self.tmp.name, s.pathName())
+            if not s.runThisSample:
+                self.assertFalse(os.path.exists(path))
+                continue
+            self.assertSameContents(self.read(s), self.expected(sb, s))
+
+    def testModelIsNotModified(self):
+
+        before = str(self.g)
+        self.g.write_out(writeParameters=True)
+        self.assertSameContents(str(self.g), before)
+
+    def testStreamedOutputMatchesString(self):
+
+        path = os.path.join(self.tmp.name, "out.txt")
+        self.g.write_out(path=path, writeParameters=False)
+        with open(path, encoding="utf-8") as f:
+            self.assertSameContents(f.read(), str(self.g))
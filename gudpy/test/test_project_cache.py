@@ -0,0 +1,106 @@
+import os
+import tempfile
+from shutil import copyfile
+from unittest import TestCase, skipIf
+from unittest.mock import patch
+
+from core import config
+from core.gudrun_file import GudrunFile
+from core.project_cache import ProjectCache
+
+
+class TestProjectCache(TestCase):
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cacheDir = config.projectCacheDir
+        config.projectCacheDir = os.path.join(self.tmp.name, "cache")
+        self.useProjectCache = config.USE_PROJECT_CACHE
+        config.USE_PROJECT_CACHE = True
+        self.path = os.path.join(self.tmp.name, "water.txt")
+        copyfile("test/TestData/NIMROD-water/water.txt", self.path)
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        config.projectCacheDir = self.cacheDir
+        config.USE_PROJECT_CACHE = self.useProjectCache
+        self.tmp.cleanup()
+        return super().tearDown()
+
+    def testCacheIsPopulated(self):
+
+        GudrunFile(self.path)
+        self.assertEqual(len(ProjectCache().entries()), 1)
+
+    def testReloadFromCache(self):
+
+        g1 = GudrunFile(self.path)
+        g2 = GudrunFile(self.path)
+
+        self.assertIsNot(g1.instrument, g2.instrument)
+        self.assertIsNot(g1.sampleBackgrounds, g2.sampleBackgrounds)
+        self.assertEqual(str(g1)[:-5], str(g2)[:-5])
+
+    def testCacheInvalidatedByChange(self):
+
+        g1 = GudrunFile(self.path)
+        g1.sampleBackgrounds[0].samples[0].sampleTweakFactor = 2.5
+        g1.write_out(path=self.path, writeParameters=False)
+
+        g2 = GudrunFile(self.path)
+        self.assertEqual(
+            g2.sampleBackgrounds[0].samples[0].sampleTweakFactor, 2.5
+        )
+        self.assertEqual(len(ProjectCache().entries()), 2)
+
+    def testCacheInvalidatedBySchema(self):
+
+        g = GudrunFile(self.path)
+        cache = ProjectCache()
+        key = cache.key(g.path, "contents")
+        cache.save(key, g.getState())
+        self.assertIsNotNone(cache.load(key))
+
+        with patch("core.project_cache.schema", lambda: "changed"):
+            self.assertNotEqual(cache.key(g.path, "contents"), key)
+            self.assertIsNone(cache.load(key))
+        self.assertFalse(os.path.exists(cache.entryPath(key)))
+
+    @skipIf(os.name == "nt", "Permissions are POSIX.")
+    def testSharedDirectoryIsUntrusted(self):
+
+        GudrunFile(self.path)
+        cache = ProjectCache()
+        self.assertTrue(cache.trusted())
+        [entry] = cache.entries()
+        os.chmod(config.projectCacheDir, 0o777)
+        self.assertFalse(cache.trusted())
+        with patch("pickle.load") as load:
+            GudrunFile(self.path)
+        load.assert_not_called()
+        # Saving makes the directory private again.
+        cache.save(cache.key(self.path, "contents"), {})
+        self.assertTrue(cache.trusted())
+
+    def testOffByDefault(self):
+
+        config.USE_PROJECT_CACHE = self.useProjectCache
+        GudrunFile(self.path)
+        self.assertFalse(ProjectCache().entries())
+
+    def testCorruptEntryIsIgnored(self):
+
+        GudrunFile(self.path)
+        [entry] = ProjectCache().entries()
+        with open(entry, "wb") as fp:
+            fp.write(b"not a cache entry")
+
+        g = GudrunFile(self.path)
+        self.assertEqual(len(g.sampleBackgrounds[0].samples), 4)
+
+    def testPrune(self):
+
+        cache = ProjectCache(maxEntries=2)
+        for i in range(4):
+            cache.save(cache.key(self.path, str(i)), {})
+        self.assertEqual(len(cache.entries()), 2)
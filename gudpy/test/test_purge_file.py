@@ -107,5 +107,10 @@ class TestPurgeFile(TestCase):
 
         purge = PurgeFile(self.g)
         purge.write_out()
-        outlines = open("purge_det.dat", encoding="utf-8").read()
+        path = os.path.join(
+            self.g.instrument.GudrunInputFileDir, "purge_det.dat"
+        )
+        self.addCleanup(os.remove, path)
+        outlines = open(path, encoding="utf-8").read()
         self.assertEqual(outlines, str(purge))
+        self.assertNotIn("purge_det.dat", os.listdir())
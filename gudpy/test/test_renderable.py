@@ -0,0 +1,121 @@
+from copy import deepcopy
+from unittest import TestCase
+from unittest.mock import patch
+
+from core import config
+from core.enums import Geometry
+from core.element import Element
+from core.gudrun_file import GudrunFile
+from core.container import Container
+from core.sample import Sample
+from core.sample_background import SampleBackground
+
+
+class TestRenderable(TestCase):
+
+    def setUp(self) -> None:
+        self.g = GudrunFile("test/TestData/NIMROD-water/water.txt")
+        self.sample = self.g.sampleBackgrounds[0].samples[0]
+        self.geometry = config.geometry
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        config.geometry = self.geometry
+        return super().tearDown()
+
+    def assertRerendered(self, obj):
+        # Compare against a copy, which has never been rendered.
+        fresh = deepcopy(obj)
+        fresh.__dict__.pop("_rendered", None)
+        for container in getattr(fresh, "containers", []):
+            container.__dict__.pop("_rendered", None)
+        self.assertEqual(str(obj), fresh.render())
+
+    def testUnchangedObjectIsNotRerendered(self):
+
+        self.assertIs(str(self.sample), str(self.sample))
+        self.assertIs(str(self.g.instrument), str(self.g.instrument))
+
+    def testAssignmentRerenders(self):
+
+        before = str(self.sample)
+        self.sample.sampleTweakFactor = 2.5
+        self.assertNotEqual(str(self.sample), before)
+        self.assertIn("2.5", str(self.sample))
+        self.assertRerendered(self.sample)
+
+    def testInPlaceChangesRerender(self):
+
+        before = str(self.sample)
+        self.sample.dataFiles.dataFiles.append("NIMROD00000001.raw")
+        self.assertNotEqual(str(self.sample), before)
+        self.assertRerendered(self.sample)
+
+        before = str(self.sample)
+        self.sample.composition.elements.append(Element("C", 0, 1.0))
+        self.assertNotEqual(str(self.sample), before)
+
+        before = str(self.sample)
+        self.sample.composition.elements[-1].__dict__["abundance"] = 2.0
+        self.assertNotEqual(str(self.sample), before)
+        self.assertRerendered(self.sample)
+
+    def testContainerChangeRerendersSample(self):
+
+        before = str(self.sample)
+        self.sample.containers[0].tweakFactor = 3.5
+        self.assertNotEqual(str(self.sample), before)
+        self.assertIn("3.5", str(self.g))
+        self.assertRerendered(self.sample)
+
+    def testGeometryChangeRerenders(self):
+
+        config.geometry = Geometry.FLATPLATE
+        flat = str(self.sample)
+        config.geometry = Geometry.CYLINDRICAL
+        self.assertNotEqual(str(self.sample), flat)
+        self.assertRerendered(self.sample)
+
+    def testUnchangedChildrenAreNotRendered(self):
+
+        text = str(self.g)
+        with patch.object(Sample, "__str__", side_effect=AssertionError), \
+                patch.object(
+                    Container, "__str__", side_effect=AssertionError
+                ), \
+                patch.object(
+                    SampleBackground, "renderBlocks",
+                    side_effect=AssertionError
+                ):
+            self.g.sampleBackgrounds[0].renderKey()
+            self.assertEqual(str(self.g)[:-50], text[:-50])
+
+    def testChildChangeRerendersParents(self):
+
+        sampleBackground = self.g.sampleBackgrounds[0]
+        before = str(sampleBackground)
+        self.sample.containers[0].tweakFactor = 3.5
+        self.assertNotEqual(str(sampleBackground), before)
+        self.assertIn("3.5", str(sampleBackground))
+
+        before = str(sampleBackground)
+        self.sample.name = "Renamed"
+        self.assertIn("Renamed", str(sampleBackground))
+        self.assertIn("Renamed", str(self.g))
+
+    def testOnlySamplesRunAreWrittenOnce(self):
+
+        sampleBackground = self.g.sampleBackgrounds[0]
+        self.sample.runThisSample = False
+        everything = str(sampleBackground)
+        sampleBackground.writeAllSamples = False
+        self.assertNotEqual(str(sampleBackground), everything)
+        self.assertTrue(sampleBackground.writeAllSamples)
+        self.assertEqual(str(sampleBackground), everything)
+
+    def testCopiesAreStampedAfresh(self):
+
+        copy = deepcopy(self.sample)
+        self.assertNotEqual(copy.stateKey(), self.sample.stateKey())
+        copy.sampleTweakFactor = 4.5
+        self.assertNotIn("4.5", str(self.sample))
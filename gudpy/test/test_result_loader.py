@@ -0,0 +1,91 @@
+import os
+import tempfile
+import threading
+from unittest import TestCase
+
+from core.result_loader import ResultLoader
+from core.dataset_cache import datasetCache
+
+
+class TestResultLoader(TestCase):
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.paths = []
+        for i in range(3):
+            path = os.path.join(self.tmp.name, f"{i}.txt")
+            with open(path, "w", encoding="utf-8") as fp:
+                fp.write(f"{i}\n")
+            self.paths.append(path)
+        self.loader = ResultLoader(maxWorkers=2)
+        self.results = []
+        self.done = threading.Event()
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        self.loader.shutdown()
+        datasetCache.clear()
+        self.tmp.cleanup()
+        return super().tearDown()
+
+    def read(self, path):
+        with open(path, encoding="utf-8") as fp:
+            return fp.read().strip()
+
+    def callback(self, key, datasets, generation):
+        self.results.append((key, datasets, generation))
+        self.done.set()
+
+    def testLoadsInBackground(self):
+
+        generation = self.loader.submit(
+            "sample", [(p, self.read) for p in self.paths], self.callback
+        )
+        self.assertTrue(self.done.wait(5))
+        key, datasets, loadedGeneration = self.results[0]
+        self.assertEqual(key, "sample")
+        self.assertEqual(loadedGeneration, generation)
+        self.assertEqual(
+            [datasets[p] for p in self.paths], ["0", "1", "2"]
+        )
+
+    def testLoadErrorsAreReturned(self):
+
+        missing = os.path.join(self.tmp.name, "missing.txt")
+        self.loader.submit(
+            "sample",
+            [(self.paths[0], self.read), (missing, self.read)],
+            self.callback
+        )
+        self.assertTrue(self.done.wait(5))
+        _, datasets, _ = self.results[0]
+        self.assertEqual(datasets[self.paths[0]], "0")
+        self.assertIsInstance(datasets[missing], OSError)
+
+    def testCancelledLoadsAreNotCalledBack(self):
+
+        started = threading.Event()
+        release = threading.Event()
+
+        def blockingRead(path):
+            started.set()
+            release.wait(5)
+            return self.read(path)
+
+        generation = self.loader.submit(
+            "first", [(p, blockingRead) for p in self.paths], self.callback
+        )
+        self.assertTrue(started.wait(5))
+        self.assertEqual(self.loader.cancel(), generation + 1)
+        release.set()
+
+        self.loader.submit(
+            "second", [(self.paths[0], self.read)], self.callback
+        )
+        self.assertTrue(self.done.wait(5))
+        self.loader.executor.shutdown(wait=True)
+        self.assertEqual(
+            [(key, g) for key, _, g in self.results],
+            [("second", generation + 1)]
+        )
+        self.assertEqual(self.loader.pending(), 0)
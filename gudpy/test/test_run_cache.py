@@ -0,0 +1,324 @@
+import json
+import os
+import sys
+import tempfile
+from unittest import TestCase, skipIf
+from unittest.mock import patch
+
+from core.file_library import GudPyFileLibrary
+from core.gudrun_file import GudrunFile
+from core.output_file_handler import organiser
+from core.run_cache import RunCache
+from core import config
+
+
+# Stands in for gudrun_dcs: counts how many times it is called,
+# and writes an output for the first data file of each sample.
+STUB = """#!{python}
+import os
+import re
+import sys
+
+with open({count!r}, "a", encoding="utf-8") as fp:
+    fp.write("x")
+runs = []
+with open(sys.argv[1], encoding="utf-8") as fp:
+    for line in fp:
+        match = re.match(r"(\\S+)\\.raw\\s+.*data files", line)
+        if match:
+            runs.append(match.group(1))
+for run in runs:
+    with open(run + ".mint01", "w", encoding="utf-8") as fp:
+        fp.write(run)
+    # Corrections that aren't forced are reused, if they exist.
+    if not os.path.exists(run + ".abs01"):
+        with open(run + ".abs01", "w", encoding="utf-8") as fp:
+            fp.write(run)
+with open("gudrun_dcs.log", "w", encoding="utf-8") as fp:
+    fp.write("done")
+print("ran")
+sys.exit({code})
+"""
+
+
+@skipIf(os.name == "nt", "The stub gudrun_dcs is a POSIX script.")
+class TestRunCache(TestCase):
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = os.path.join(self.tmp.name, "input")
+        self.cacheDir = os.path.join(self.tmp.name, "cache")
+        os.makedirs(os.path.join(self.dir, "raw"))
+        self.g = GudrunFile(
+            os.path.abspath("test/TestData/NIMROD-water/water.txt")
+        )
+        self.g.instrument.GudrunInputFileDir = self.dir
+        self.g.instrument.dataFileDir = "raw/"
+        self.dataFiles = GudPyFileLibrary(self.g).dataFiles
+        for f in self.dataFiles:
+            self.write(os.path.join("raw", f), f)
+        self.count = os.path.join(self.tmp.name, "count")
+        self.stub = os.path.join(self.tmp.name, "gudrun_dcs")
+        self.writeStub(0)
+        self.patches = [
+            patch.object(config, "USE_RUN_CACHE", True),
+            patch.object(config, "runCacheDir", self.cacheDir),
+            patch("core.gudrun_file.resolve", lambda *_: self.stub)
+        ]
+        for p in self.patches:
+            p.start()
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        for p in self.patches:
+            p.stop()
+        self.tmp.cleanup()
+        return super().tearDown()
+
+    def write(self, name, contents):
+        with open(
+            os.path.join(self.dir, name), "w", encoding="utf-8"
+        ) as fp:
+            fp.write(contents)
+
+    def writeStub(self, code):
+        with open(self.stub, "w", encoding="utf-8") as fp:
+            fp.write(
+                STUB.format(python=sys.executable, count=self.count, code=code)
+            )
+        os.chmod(self.stub, 0o755)
+
+    def calls(self):
+        if not os.path.exists(self.count):
+            return 0
+        with open(self.count, encoding="utf-8") as fp:
+            return len(fp.read())
+
+    def outputs(self):
+        return sorted(
+            f for f in os.listdir(self.dir)
+            if f.endswith(".mint01") or f == "gudrun_dcs.log"
+        )
+
+    def removeOutputs(self):
+        for f in self.outputs():
+            os.remove(os.path.join(self.dir, f))
+
+    def testHitRestoresOutputs(self):
+
+        first = self.g.process()
+        outputs = self.outputs()
+        self.assertTrue(outputs)
+        self.removeOutputs()
+
+        second = self.g.process()
+        self.assertEqual(self.calls(), 1)
+        self.assertEqual(second.returncode, 0)
+        self.assertEqual(second.stdout, first.stdout)
+        self.assertEqual(self.outputs(), outputs)
+        # Restored outputs are organised, as they would have been.
+        sample = self.g.sampleBackgrounds[0].samples[0]
+        run = os.path.splitext(sample.dataFiles[0])[0]
+        self.assertTrue(
+            os.path.exists(
+                os.path.join(self.dir, run, "outputs", f"{run}.mint01")
+            )
+        )
+
+    def testHitDoesNotWriteThroughLinks(self):
+
+        self.g.process()
+        outputs = self.outputs()
+        organised = os.path.join(self.tmp.name, "organised")
+        os.makedirs(organised)
+        for f in outputs:
+            os.remove(os.path.join(self.dir, f))
+            self.write(f, "organised")
+            os.link(os.path.join(self.dir, f), os.path.join(organised, f))
+
+        self.g.process()
+        self.assertEqual(self.calls(), 1)
+        for f in outputs:
+            with open(os.path.join(organised, f), encoding="utf-8") as fp:
+                self.assertEqual(fp.read(), "organised")
+            with open(os.path.join(self.dir, f), encoding="utf-8") as fp:
+                self.assertNotEqual(fp.read(), "organised")
+
+    def testRepeatedRunsReusingCorrections(self):
+
+        for sample in self.g.sampleBackgrounds[0].samples:
+            sample.forceCalculationOfCorrections = False
+        for _ in range(4):
+            self.g.process()
+            # Organising links the corrections into the organised
+            # outputs, so the next run detaches them.
+            organiser.wait()
+        # The first run writes the corrections, which the second reads,
+        # after which the runs are identical.
+        self.assertEqual(self.calls(), 2)
+
+    def testManifestIsJSON(self):
+
+        self.g.process()
+        [entry] = RunCache().entries()
+        with open(
+            os.path.join(entry, RunCache.MANIFEST), encoding="utf-8"
+        ) as fp:
+            version, manifest = json.load(fp)
+        self.assertEqual(version, config.__version__)
+        self.assertIn("gudrun_dcs.log", manifest["files"])
+        self.assertEqual(manifest["result"][0], 0)
+        self.assertFalse(
+            [f for f in os.listdir(entry) if f.endswith(".pickle")]
+        )
+
+    def testCorruptManifestMisses(self):
+
+        self.g.process()
+        [entry] = RunCache().entries()
+        with open(
+            os.path.join(entry, RunCache.MANIFEST), "w", encoding="utf-8"
+        ) as fp:
+            fp.write("not a manifest")
+        self.g.process()
+        self.assertEqual(self.calls(), 2)
+
+    def testBypass(self):
+
+        self.g.process()
+        self.g.process(useCache=False)
+        self.assertEqual(self.calls(), 2)
+        with patch.object(config, "USE_RUN_CACHE", False):
+            self.g.process()
+        self.assertEqual(self.calls(), 3)
+
+    def testOffByDefault(self):
+
+        self.patches[0].stop()
+        self.g.process()
+        self.g.process()
+        self.assertEqual(self.calls(), 2)
+        self.assertFalse(RunCache().entries())
+        self.patches[0].start()
+
+    def testIterativeRunsAreNotCached(self):
+
+        self.g.process(iterative=True)
+        self.g.process(iterative=True)
+        self.assertEqual(self.calls(), 2)
+        self.assertFalse(RunCache().entries())
+
+    def testInputChangeMisses(self):
+
+        self.g.process()
+        self.g.instrument.wavelengthMax += 1
+        self.g.process()
+        self.assertEqual(self.calls(), 2)
+
+    def testDataFileChangeMisses(self):
+
+        self.g.process()
+        path = os.path.join(self.dir, "raw", self.dataFiles[0])
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        self.g.process()
+        self.assertEqual(self.calls(), 2)
+        self.g.process()
+        self.assertEqual(self.calls(), 2)
+
+    def testReferencedFileChangeMisses(self):
+
+        sample = self.g.sampleBackgrounds[0].samples[0]
+        self.g.instrument.detectorCalibrationFileName = "calibration.dat"
+        sample.fileSelfScattering = "self.msubw01"
+        self.write("calibration.dat", "calibration")
+        self.write("self.msubw01", "self scattering")
+        for f in ("calibration.dat", "self.msubw01"):
+            self.assertIn(
+                os.path.join(self.dir, f),
+                GudPyFileLibrary(self.g).references()
+            )
+        self.g.process()
+        for i, f in enumerate(("calibration.dat", "self.msubw01")):
+            path = os.path.join(self.dir, f)
+            stat = os.stat(path)
+            os.utime(
+                path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9)
+            )
+            self.g.process()
+            self.assertEqual(self.calls(), i + 2)
+
+    def testCorrectionsAreReferenced(self):
+
+        sample = self.g.sampleBackgrounds[0].samples[0]
+        run = os.path.splitext(sample.dataFiles[0])[0]
+        path = os.path.join(self.dir, f"{run}.abs01")
+        sample.forceCalculationOfCorrections = False
+        self.assertIn(path, GudPyFileLibrary(self.g).references())
+        sample.forceCalculationOfCorrections = True
+        self.assertNotIn(path, GudPyFileLibrary(self.g).references())
+
+    def testTimestampIsIgnored(self):
+
+        cache = RunCache()
+        path = os.path.join(self.dir, "input.txt")
+        keys = []
+        for time in ("20260101 00:00:00", "20260101 00:00:01"):
+            self.write(
+                "input.txt",
+                f"header\n\nDate and time last written:  {time}\nbody"
+            )
+            keys.append(cache.key(self.g, path, self.stub))
+        self.assertEqual(keys[0], keys[1])
+        self.write("input.txt", "header\nbody changed")
+        self.assertNotEqual(cache.key(self.g, path, self.stub), keys[0])
+
+    def testBinaryChangeMisses(self):
+
+        self.g.process()
+        self.writeStub(0)
+        stat = os.stat(self.stub)
+        os.utime(self.stub, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        self.g.process()
+        self.assertEqual(self.calls(), 2)
+
+    def testContentHash(self):
+
+        cache = RunCache(hashContents=True)
+        path = os.path.join(self.dir, "raw", self.dataFiles[0])
+        before = cache.fingerprint(path, True)
+        stat = os.stat(path)
+        with open(path, "w", encoding="utf-8") as fp:
+            fp.write("x" * stat.st_size)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        self.assertNotEqual(cache.fingerprint(path, True), before)
+        self.assertEqual(
+            cache.fingerprint(path).split(":"), before.split(":")[:2]
+        )
+
+    def testFailedRunsAreNotCached(self):
+
+        self.writeStub(1)
+        self.g.process()
+        self.assertFalse(RunCache().entries())
+
+    def testPrune(self):
+
+        cache = RunCache(maxEntries=2)
+        for i in range(3):
+            self.g.instrument.wavelengthMax += 1
+            self.g.process()
+        self.assertEqual(len(cache.entries()), 3)
+        cache.prune()
+        self.assertEqual(len(cache.entries()), 2)
+
+        RunCache(maxSize=0).prune()
+        self.assertFalse(cache.entries())
+
+    def testClear(self):
+
+        self.g.process()
+        RunCache().clear()
+        self.assertFalse(RunCache().entries())
+        self.g.process()
+        self.assertEqual(self.calls(), 2)
@@ -0,0 +1,71 @@
+from unittest import TestCase
+
+from core.token_stream import TokenStream
+
+
+class TestTokenStream(TestCase):
+
+    def setUp(self) -> None:
+        self.lines = [
+            "INSTRUMENT          {\n",
+            "\n",
+            "  \n",
+            "NIMROD          Instrument name\n",
+            "}\n",
+            "BEAM          {\n"
+        ]
+        self.stream = TokenStream(self.lines)
+        return super().setUp()
+
+    def testGetNextToken(self):
+
+        self.assertEqual(self.stream.getNextToken(), self.lines[0])
+        self.assertEqual(self.stream.getNextToken(), self.lines[1])
+        self.assertEqual(len(self.stream), 4)
+
+    def testPeekNextToken(self):
+
+        self.assertEqual(self.stream.peekNextToken(), self.lines[0])
+        self.assertEqual(self.stream.peekNextToken(), self.lines[0])
+        self.assertEqual(len(self.stream), 6)
+
+    def testConsumeTokens(self):
+
+        self.stream.consumeTokens(3)
+        self.assertEqual(self.stream.peekNextToken(), self.lines[3])
+
+    def testConsumeTokensPastEnd(self):
+
+        self.stream.consumeTokens(10)
+        self.assertFalse(self.stream)
+        self.assertIsNone(self.stream.getNextToken())
+        self.assertIsNone(self.stream.peekNextToken())
+
+    def testConsumeWhitespace(self):
+
+        self.stream.consumeTokens(1)
+        self.stream.consumeWhitespace()
+        self.assertEqual(self.stream.getNextToken(), self.lines[3])
+
+    def testConsumeUpToDelim(self):
+
+        self.stream.consumeUpToDelim("}")
+        self.assertEqual(self.stream.getNextToken(), self.lines[5])
+        self.assertFalse(self.stream)
+
+    def testLinesAreNotModified(self):
+
+        lines = list(self.lines)
+        while self.stream:
+            self.stream.getNextToken()
+        self.assertIs(self.stream.lines, self.lines)
+        self.assertEqual(self.lines, lines)
+
+    def testBoundedStream(self):
+
+        stream = TokenStream(self.lines, 1, 4)
+        self.assertEqual(len(stream), 3)
+        stream.consumeWhitespace()
+        self.assertEqual(stream.getNextToken(), self.lines[3])
+        self.assertFalse(stream)
+        self.assertIsNone(stream.peekNextToken())
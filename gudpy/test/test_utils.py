@@ -1,4 +1,7 @@
-from unittest import TestCase
+import os
+import stat
+import tempfile
+from unittest import TestCase, skipIf
 
 
 from core.utils import (
@@ -7,7 +10,11 @@ from core.utils import (
         numifyBool, spacify,
         extract_ints_from_string,
         extract_floats_from_string,
-        count_occurrences)
+        count_occurrences,
+        detectEncoding,
+        readText,
+        atomicOpen,
+        umask)
 
 
 class TestUtils(TestCase):
@@ -136,3 +143,76 @@ class TestUtils(TestCase):
 
         self.assertFalse(iteristype([None, 1, TestCase()], TestCase))
         self.assertFalse(iteristype([None, 1, TestCase()], int))
+
+    def testDetectEncodingUTF8(self):
+
+        path = "test/TestData/NIMROD-water/water.txt"
+        with open(path, "rb") as fp:
+            data = fp.read()
+        self.assertEqual(detectEncoding(path, data), "utf-8")
+
+    def testReadTextLatin1(self):
+
+        path = "test/TestData/latin1.txt"
+        with open(path, "wb") as fp:
+            fp.write("Density atoms/Å^3\r\nÅngström\n".encode(
+                "utf-8"
+            ).replace("Å".encode("utf-8"), b"\xc5"))
+        try:
+            text = readText(path)
+            self.assertEqual(text.count("\n"), 2)
+            self.assertNotIn("\r", text)
+            self.assertTrue(text.startswith("Density atoms/"))
+        finally:
+            os.remove(path)
+
+    def testAtomicOpen(self):
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "gudpy.txt")
+            with atomicOpen(path) as fp:
+                fp.write("new")
+            with open(path, encoding="utf-8") as fp:
+                self.assertEqual(fp.read(), "new")
+            self.assertEqual(os.listdir(tmp), ["gudpy.txt"])
+
+    def testAtomicOpenFailure(self):
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "gudpy.txt")
+            with open(path, "w", encoding="utf-8") as fp:
+                fp.write("old")
+            with self.assertRaises(RuntimeError):
+                with atomicOpen(path) as fp:
+                    fp.write("partial")
+                    raise RuntimeError
+            with open(path, encoding="utf-8") as fp:
+                self.assertEqual(fp.read(), "old")
+            self.assertEqual(os.listdir(tmp), ["gudpy.txt"])
+
+    @skipIf(os.name == "nt", "Permissions are POSIX.")
+    def testAtomicOpenPermissions(self):
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "new.txt")
+            with atomicOpen(path) as fp:
+                fp.write("new")
+            self.assertEqual(
+                stat.S_IMODE(os.stat(path).st_mode), 0o666 & ~umask()
+            )
+            path = os.path.join(tmp, "existing.txt")
+            with open(path, "w", encoding="utf-8"):
+                pass
+            os.chmod(path, 0o640)
+            with atomicOpen(path) as fp:
+                fp.write("new")
+            self.assertEqual(stat.S_IMODE(os.stat(path).st_mode), 0o640)
+
+    @skipIf(os.name == "nt", "Permissions are POSIX.")
+    def testUmask(self):
+
+        current = os.umask(0o027)
+        os.umask(current)
+        self.assertEqual(umask(), current)
+        # Reading it doesn't change it.
+        self.assertEqual(os.umask(current), current)
@@ -0,0 +1,79 @@
+import os
+import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+from unittest.mock import patch
+
+from core.gudrun_file import GudrunFile
+from core.purge_file import PurgeFile
+
+
+class TestWorkingDirectory(TestCase):
+
+    def setUp(self) -> None:
+        self.tmps = [tempfile.TemporaryDirectory() for _ in range(2)]
+        self.gudrunFiles = []
+        for tmp in self.tmps:
+            g = GudrunFile(
+                os.path.abspath("test/TestData/NIMROD-water/water.txt")
+            )
+            g.instrument.GudrunInputFileDir = tmp.name
+            self.gudrunFiles.append(g)
+        self.cwd = os.getcwd()
+        return super().setUp()
+
+    def tearDown(self) -> None:
+        os.chdir(self.cwd)
+        for tmp in self.tmps:
+            tmp.cleanup()
+        return super().tearDown()
+
+    def subprocessRun(self, args, **kwargs):
+        # Stands in for subprocess.run, recording the directory
+        # each tool is run from.
+        self.calls.append((args, kwargs.get("cwd")))
+        return subprocess.CompletedProcess(args, 0, "", "")
+
+    def testProcessRunsInInputFileDir(self):
+
+        self.calls = []
+        g = self.gudrunFiles[0]
+        with patch("subprocess.run", self.subprocessRun):
+            g.process()
+        self.assertEqual(os.getcwd(), self.cwd)
+        self.assertEqual(self.calls[0][1], g.instrument.GudrunInputFileDir)
+        self.assertTrue(
+            os.path.exists(
+                os.path.join(g.instrument.GudrunInputFileDir, g.outpath)
+            )
+        )
+        self.assertFalse(os.path.exists(os.path.join(self.cwd, g.outpath)))
+
+    def testPurgeRunsInInputFileDir(self):
+
+        self.calls = []
+        g = self.gudrunFiles[0]
+        with patch("subprocess.run", self.subprocessRun):
+            PurgeFile(g).purge()
+        self.assertEqual(os.getcwd(), self.cwd)
+        self.assertEqual(self.calls[0][1], g.instrument.GudrunInputFileDir)
+        self.assertTrue(
+            os.path.exists(
+                os.path.join(
+                    g.instrument.GudrunInputFileDir, "purge_det.dat"
+                )
+            )
+        )
+
+    def testConcurrentRuns(self):
+
+        self.calls = []
+        with patch("subprocess.run", self.subprocessRun):
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                list(executor.map(lambda g: g.process(), self.gudrunFiles))
+        self.assertEqual(os.getcwd(), self.cwd)
+        self.assertEqual(
+            sorted(cwd for _, cwd in self.calls),
+            sorted(g.instrument.GudrunInputFileDir for g in self.gudrunFiles)
+        )